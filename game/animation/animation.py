@@ -50,17 +50,17 @@ class Animation:
             pygame.draw.rect(s, color_with_alpha, (0, 0, tile['size'], tile['size']))
             self.screen.blit(s, (tile['x'], tile['y']))
     
-    def update_start_screen_animation(self):
-        """Update the animations on the start screen"""
+    def update_start_screen_animation(self, dt=1.0):
+        """Update the animations on the start screen, dt in 60 Hz frames so the speed doesn't follow the frame rate"""
         # Update title floating animation
-        self.title_y_offset += self.title_direction * 0.2
+        self.title_y_offset += self.title_direction * 0.2 * dt
         if self.title_y_offset > 10 or self.title_y_offset < -10:
             self.title_direction *= -1
             
         # Update background tiles movement
         for tile in self.bg_tiles:
             # Move tiles downward
-            tile['y'] += tile['speed']
+            tile['y'] += tile['speed'] * dt
             # If a tile goes off screen, reset it to the top
             if tile['y'] > SCREEN_HEIGHT:
                 tile['y'] = -tile['size']
@@ -0,0 +1,132 @@
+import os
+
+# Benchmarks never open a window, but pygame may still touch the display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from benchmarks import BENCHMARKS, FIELD_SIZES, get_field_benchmarks
+from constants.constants import FPS, MIN_FIELD_SIZE, MAX_FIELD_SIZE
+from data.benchmark_data import BASELINE_FILE, LATEST_FILE, load_benchmark_results, save_benchmark_results
+
+
+def run_benchmarks(benchmarks, repeat):
+    """Run each benchmark with the game's console output silenced, and collect the timings by name"""
+    results = {}
+    for name, bench in benchmarks:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results[name] = bench(repeat)
+        print(f"  {name:<36} {format_seconds(results[name]['seconds']):>10}")
+    return results
+
+
+def format_seconds(seconds):
+    """Time per call in the most readable unit"""
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def compare_results(results, baseline, threshold):
+    """Print each timing against the baseline, and return the names that got slower than threshold allows"""
+    slower = []
+    print(f"\n{'Benchmark':<36} {'Best':>10} {'Baseline':>10} {'Change':>8}")
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<36} {format_seconds(result['seconds']):>10} {'-':>10} {'new':>8}")
+            continue
+
+        change = result["seconds"] / base["seconds"] - 1
+        status = ""
+        if change > threshold:
+            status = "  SLOWER"
+            slower.append(name)
+        elif change < -threshold:
+            status = "  faster"
+        print(f"{name:<36} {format_seconds(result['seconds']):>10} {format_seconds(base['seconds']):>10} "
+              f"{change * 100:>+7.1f}%{status}")
+    return slower
+
+
+def print_field_scaling(results, field_sizes, engine):
+    """Ticks per second and cost per car at each field size - the cost per car stays flat while scaling is linear"""
+    print(f"\n{'Cars':>6} {'Ticks/s':>10} {'x Real time':>12} {'us/car/tick':>12} {'vs linear':>10}   ({engine} engine)")
+    base_cost = None
+    for field_size in field_sizes:
+        seconds = results[f"race.tick.{engine}.{field_size}_cars"]["seconds"]
+        cost = seconds / field_size * 1e6
+        base_cost = base_cost or cost
+        print(f"{field_size:>6} {1 / seconds:>10.1f} {1 / seconds / FPS:>12.2f} {cost:>12.1f} {cost / base_cost:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the track, car and race hot paths and compare with a baseline")
+    parser.add_argument("--only", nargs="+", default=None, help="run the benchmarks whose names start with these")
+    parser.add_argument("--cars", type=int, nargs="+", default=FIELD_SIZES,
+                        help=f"field sizes to time a race tick at, {MIN_FIELD_SIZE} to {MAX_FIELD_SIZE}")
+    parser.add_argument("--vector", action="store_true", help="time the race ticks on the vectorized NumPy engine")
+    parser.add_argument("--repeat", type=int, default=5, help="timed rounds of each benchmark, the best one counts")
+    parser.add_argument("--output", type=Path, default=LATEST_FILE, help="where to write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="make these results the new baseline")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent slower than the baseline that counts as a regression")
+    args = parser.parse_args()
+    for field_size in args.cars:
+        if not MIN_FIELD_SIZE <= field_size <= MAX_FIELD_SIZE:
+            parser.error(f"--cars must be between {MIN_FIELD_SIZE} and {MAX_FIELD_SIZE}")
+
+    benchmarks = BENCHMARKS + get_field_benchmarks(args.cars, args.vector)
+    if args.only:
+        benchmarks = [(name, bench) for name, bench in benchmarks if name.startswith(tuple(args.only))]
+
+    print(f"Running {len(benchmarks)} benchmarks, best of {args.repeat} rounds")
+    start_time = time.perf_counter()
+    results = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat
+        },
+        "results": run_benchmarks(benchmarks, args.repeat)
+    }
+    print(f"Finished in {time.perf_counter() - start_time:.0f}s, results saved to "
+          f"{save_benchmark_results(results, args.output)}")
+
+    engine = "vector" if args.vector else "scalar"
+    if all(f"race.tick.{engine}.{field_size}_cars" in results["results"] for field_size in args.cars):
+        print_field_scaling(results["results"], args.cars, engine)
+
+    # Compare before a new baseline replaces the old one
+    slower = []
+    baseline = load_benchmark_results(args.baseline)
+    if baseline is not None:
+        slower = compare_results(results["results"], baseline, args.threshold / 100)
+    elif not args.save_baseline:
+        print(f"\nNo baseline at {args.baseline} - save one with --save-baseline")
+
+    if args.save_baseline:
+        print(f"Saved the baseline to {save_benchmark_results(results, args.baseline)}")
+    if slower:
+        print(f"\n{len(slower)} benchmarks are more than {args.threshold:.0f}% slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from benchmarks.track_benchmarks import TRACK_BENCHMARKS
+from benchmarks.car_benchmarks import CAR_BENCHMARKS
+from benchmarks.race_benchmarks import RACE_BENCHMARKS, FIELD_SIZES, get_field_benchmarks
+from benchmarks.ui_benchmarks import UI_BENCHMARKS
+
+# Every benchmark as (name, function taking the number of timed rounds and returning the timing)
+BENCHMARKS = TRACK_BENCHMARKS + CAR_BENCHMARKS + RACE_BENCHMARKS + UI_BENCHMARKS
@@ -0,0 +1,61 @@
+import time
+
+import pygame
+
+from constants.constants import FIELD_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH, STATE_RACING
+from tracks import Track
+
+# Ticks a benchmark race runs before anything is timed, so the field is spread out and up to speed
+RACE_WARMUP = 300
+RACE_SEED = 0
+
+_track = None
+_screen = None
+
+
+def get_track():
+    """Headless track shared by every benchmark, loaded once"""
+    global _track
+    if _track is None:
+        _track = Track(headless=True)
+    return _track
+
+
+def get_screen():
+    """Full size display surface for the drawing benchmarks, on the dummy video driver"""
+    global _screen
+    if _screen is None:
+        # Fonts too, the overlays render text
+        pygame.init()
+        _screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return _screen
+
+
+def get_racing_game(field_size=FIELD_SIZE, warmup=RACE_WARMUP):
+    """Headless game on the shared track, warmup ticks into a race"""
+    # Imported here so the gameplay package is only loaded by the benchmarks that race
+    from gameplay import Game
+
+    game = Game(None, headless=True, seed=RACE_SEED, record_replay=False, track=get_track(), field_size=field_size)
+    game.prepare_race(debug_mode=False)
+    game.state = STATE_RACING
+    for _ in range(warmup):
+        game.update()
+    return game
+
+
+def make_result(rounds, calls):
+    """Best and median seconds per call of the timed rounds"""
+    rounds = sorted(rounds)
+    return {"seconds": rounds[0], "median": rounds[len(rounds) // 2], "calls": calls}
+
+
+def time_calls(func, number, repeat, batch=1):
+    """Time repeat rounds of number calls of func, each call doing batch operations"""
+    rounds = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start_time) / (number * batch))
+    return make_result(rounds, number * batch * repeat)
@@ -0,0 +1,74 @@
+import time
+
+from benchmarks.base_benchmark import get_racing_game, get_screen, make_result, time_calls
+from cars.sprite_cache import sprite_cache
+
+# Race ticks timed in each round
+ROUND_TICKS = 60
+
+
+def bench_position_update(repeat):
+    """PositionCar.update of every car in a race, timed per car update"""
+    game = get_racing_game()
+    rounds = []
+    for _ in range(repeat):
+        elapsed = 0.0
+        for _ in range(ROUND_TICKS):
+            # The rest of the tick is left out of the timing
+            game.clock_game.tick()
+            game.race_time = game.clock_game.ticks
+            game.spatial_hash.rebuild(game.cars)
+            start_time = time.perf_counter()
+            for car in game.cars:
+                car.position_car.update(1)
+            elapsed += time.perf_counter() - start_time
+            game.update_race_positions()
+        rounds.append(elapsed / (ROUND_TICKS * len(game.cars)))
+    return make_result(rounds, ROUND_TICKS * len(game.cars) * repeat)
+
+
+def bench_check_collision(repeat):
+    """CollisionCar.check_collision on the moves cars made in a race, timed per check"""
+    game = get_racing_game()
+
+    # Record a round of real moves - where each car was, and where it ended up facing which way
+    moves = []
+    for _ in range(ROUND_TICKS):
+        before = [(car.x, car.y) for car in game.cars]
+        game.update()
+        moves += [(prev, car.x, car.y, car.angle) for prev, car in zip(before, game.cars)]
+
+    # Replay the moves on one car, clearing its crash state so every check runs in full
+    car = game.cars[0]
+    rounds = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for prev, x, y, angle in moves:
+            car.x, car.y, car.angle = x, y, angle
+            car.recovery_grace_period = 0
+            car.collision_car.check_collision(prev)
+        rounds.append((time.perf_counter() - start_time) / len(moves))
+    return make_result(rounds, len(moves) * repeat)
+
+
+def bench_draw(repeat):
+    """BaseCar.draw of every car in a race, timed per car drawn"""
+    game = get_racing_game()
+    screen = get_screen()
+    # Benchmark games are headless, so give the cars the sprites a drawn race would have
+    for car in game.cars:
+        car.sprite = sprite_cache.get_sprite(car.manufacturer)
+    camera_x = sum(car.x for car in game.cars) / len(game.cars) - screen.get_width() / 2
+    camera_y = sum(car.y for car in game.cars) / len(game.cars) - screen.get_height() / 2
+
+    def run():
+        for car in game.cars:
+            car.draw(screen, camera_x, camera_y, 0.5)
+    return time_calls(run, 100, repeat, batch=len(game.cars))
+
+
+CAR_BENCHMARKS = [
+    ("car.position_update", bench_position_update),
+    ("car.check_collision", bench_check_collision),
+    ("car.draw", bench_draw),
+]
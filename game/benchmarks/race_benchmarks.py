@@ -0,0 +1,40 @@
+from benchmarks.base_benchmark import RACE_SEED, get_racing_game, time_calls
+from gameplay.simulation_game import run_headless_race
+
+# Field sizes the race tick is timed at, to show where the engine stops scaling
+FIELD_SIZES = (10, 50, 100, 250, 500)
+# Car updates timed per round of a field's race ticks
+FIELD_CAR_UPDATES = 2000
+
+
+def bench_update_race_positions(repeat):
+    """RaceGame.update_race_positions in a race"""
+    game = get_racing_game()
+    return time_calls(game.update_race_positions, 200, repeat)
+
+
+def bench_full_race(repeat):
+    """A full headless race from the grid to the flag"""
+    return time_calls(lambda: run_headless_race(seed=RACE_SEED), 1, repeat)
+
+
+def make_field_benchmark(field_size, vector_engine=False):
+    """Benchmark of a whole race tick with field_size cars"""
+    def bench_field(repeat):
+        game = get_racing_game(field_size)
+        game.use_vector_engine = vector_engine
+        return time_calls(game.update, max(FIELD_CAR_UPDATES // field_size, 1), repeat)
+    return bench_field
+
+
+def get_field_benchmarks(field_sizes=FIELD_SIZES, vector_engine=False):
+    """Race tick benchmarks of each field size"""
+    engine = "vector" if vector_engine else "scalar"
+    return [(f"race.tick.{engine}.{field_size}_cars", make_field_benchmark(field_size, vector_engine))
+            for field_size in field_sizes]
+
+
+RACE_BENCHMARKS = [
+    ("race.update_race_positions", bench_update_race_positions),
+    ("race.full_race", bench_full_race),
+]
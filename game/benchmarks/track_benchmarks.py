@@ -0,0 +1,98 @@
+import random
+
+from benchmarks.base_benchmark import get_screen, get_track, time_calls
+
+# Queries are timed at the same spread of points over the whole grid every run
+SAMPLE_POINTS = 1000
+SAMPLE_SEED = 0
+# Camera positions a frame of the track is drawn at
+DRAW_CAMERAS = ((0, 0), (1000, 1200), (2600, 2800), (1800, 400))
+
+
+def get_sample_points(track):
+    """Pixel coordinates spread over the track grid, walls and grass included"""
+    rng = random.Random(SAMPLE_SEED)
+    width = track.grid_width * track.tile_size
+    height = track.grid_height * track.tile_size
+    return [(rng.uniform(0, width), rng.uniform(0, height)) for _ in range(SAMPLE_POINTS)]
+
+
+def bench_load_from_csv(repeat):
+    """DrawTrack.load_from_csv - parse the track file into the grid"""
+    track = get_track()
+    return time_calls(lambda: track.draw_track.load_from_csv(track.csv_path), 5, repeat)
+
+
+def bench_get_start_position(repeat):
+    """BaseTrack.get_start_position - scan the grid for the start"""
+    return time_calls(get_track().get_start_position, 20, repeat)
+
+
+def bench_get_all_spawn_positions(repeat):
+    """BaseTrack.get_all_spawn_positions - scan the grid for every spawn tile"""
+    return time_calls(get_track().get_all_spawn_positions, 20, repeat)
+
+
+def make_query_benchmark(query_name):
+    """Benchmark of a tile query of the track at the sample points, timed per query"""
+    def bench_query(repeat):
+        track = get_track()
+        query = getattr(track, query_name)
+        points = get_sample_points(track)
+
+        def run():
+            for x, y in points:
+                query(x, y)
+        return time_calls(run, 10, repeat, batch=len(points))
+    return bench_query
+
+
+def bench_get_closest_waypoint(repeat):
+    """BaseTrack.get_closest_waypoint at the sample points, timed per query"""
+    track = get_track()
+    points = get_sample_points(track)
+
+    def run():
+        for point in points:
+            track.get_closest_waypoint(point)
+    return time_calls(run, 2, repeat, batch=len(points))
+
+
+def bench_draw(repeat):
+    """DrawTrack.draw - one full screen frame of the track, timed per frame"""
+    track = get_track()
+    screen = get_screen()
+
+    def run():
+        for camera_x, camera_y in DRAW_CAMERAS:
+            track.draw(screen, camera_x, camera_y)
+    run()
+    return time_calls(run, 20, repeat, batch=len(DRAW_CAMERAS))
+
+
+def bench_draw_waypoints(repeat):
+    """DrawTrack.draw_waypoints - one full screen frame of the waypoint overlay, timed per frame"""
+    track = get_track()
+    screen = get_screen()
+
+    def run():
+        for camera_x, camera_y in DRAW_CAMERAS:
+            track.draw_waypoints(screen, camera_x, camera_y)
+    run()
+    return time_calls(run, 20, repeat, batch=len(DRAW_CAMERAS))
+
+
+TRACK_BENCHMARKS = [
+    ("track.load_from_csv", bench_load_from_csv),
+    ("track.get_start_position", bench_get_start_position),
+    ("track.get_all_spawn_positions", bench_get_all_spawn_positions),
+    ("track.is_wall", make_query_benchmark("is_wall")),
+    ("track.is_actual_wall", make_query_benchmark("is_actual_wall")),
+    ("track.is_strict_wall", make_query_benchmark("is_strict_wall")),
+    ("track.is_track", make_query_benchmark("is_track")),
+    ("track.get_tile_at", make_query_benchmark("get_tile_at")),
+    ("track.get_tile_type_at", make_query_benchmark("get_tile_type_at")),
+    ("track.get_closest_waypoint", bench_get_closest_waypoint),
+    ("track.draw", bench_draw),
+    ("track.draw_waypoints", bench_draw_waypoints),
+]
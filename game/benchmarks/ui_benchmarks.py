@@ -0,0 +1,20 @@
+from benchmarks.base_benchmark import get_racing_game, get_screen, time_calls
+
+
+def bench_race_hud(repeat):
+    """RaceUI.draw_ui and draw_position_overlay - the text drawn over a race frame, timed per frame"""
+    # Imported here so only the drawing benchmarks load the screens
+    from ui import UI
+
+    game = get_racing_game()
+    ui = UI(get_screen())
+
+    def run():
+        ui.draw_ui(game)
+        ui.draw_position_overlay(game)
+    return time_calls(run, 200, repeat)
+
+
+UI_BENCHMARKS = [
+    ("ui.race_hud", bench_race_hud),
+]
@@ -0,0 +1,120 @@
+import argparse
+import itertools
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from cars import Car
+from cars.setup_car import SETUP_KEYS, enumerate_setups, get_performance_factors
+from constants.constants import FPS
+from data.lap_table_data import LAP_TABLE_UPGRADE_LEVELS, get_lap_table_path, save_lap_table
+from gameplay.predict_game import TRACK_PATH, get_worker_track, init_worker
+
+# A solo car runs a standing lap and a flying lap, the flying one is the lap time
+SOLO_LAPS = 2
+SOLO_MAX_TICKS = 5 * 60 * FPS
+UPGRADE_KEYS = ("engine", "tires", "aero")
+
+
+def run_solo_laps(job):
+    """Worker side of a job - time the flying lap of a lone neutral driver at the given performance factors"""
+    # Imported here so the worker loads the gameplay package itself
+    from gameplay import Game
+
+    factors, seed, track_path = job
+    game = Game(None, headless=True, seed=seed, record_replay=False, track=get_worker_track(track_path))
+    # An AI car, so preparing the race doesn't recompute its performance from a setup
+    car = game.cars[-1]
+    game.cars = [car]
+    game.engineer_car_indices = []
+    game.selected_car_index = 0
+    game.MAX_LAPS = SOLO_LAPS
+    game.prepare_race(debug_mode=False)
+    game.reset_race()
+
+    car.skill_level = 1.0
+    car.aggression = 1.0
+    speed_factor, acceleration_factor, turn_factor, braking_factor = factors
+    car.max_speed = car.base_max_speed * speed_factor
+    car.acceleration = car.base_acceleration * acceleration_factor
+    car.turn_speed = car.base_turn_speed * turn_factor
+    car.braking = car.base_braking * braking_factor
+
+    game.simulate_race(SOLO_MAX_TICKS)
+    return car.lap_times[-1] if len(car.lap_times) >= SOLO_LAPS else None
+
+
+def get_table_factors(setups, manufacturers):
+    """Performance factors of every table cell - shape (setups, manufacturers, levels, levels, levels, 4)"""
+    levels = LAP_TABLE_UPGRADE_LEVELS
+    factors = np.empty((len(setups), len(manufacturers)) + (len(levels),) * len(UPGRADE_KEYS) + (4,))
+    for setup_idx, setup in enumerate(setups):
+        setup = dict(zip(SETUP_KEYS, setup))
+        for manufacturer_idx, manufacturer in enumerate(manufacturers):
+            for level_idx in itertools.product(range(len(levels)), repeat=len(UPGRADE_KEYS)):
+                upgrades = {key: levels[idx] for key, idx in zip(UPGRADE_KEYS, level_idx)}
+                factors[(setup_idx, manufacturer_idx) + level_idx] = get_performance_factors(setup, manufacturer, upgrades)
+    return factors
+
+
+def interpolate_grid(axes, values, points):
+    """Multilinear interpolation of values on a regular grid (one axis per factor) at an array of points"""
+    result = np.zeros(points.shape[:-1] + values.shape[len(axes):])
+    lower = []
+    weights = []
+    for dim, axis in enumerate(axes):
+        idx = np.clip(np.searchsorted(axis, points[..., dim], side='right') - 1, 0, len(axis) - 2)
+        lower.append(idx)
+        weights.append((points[..., dim] - axis[idx]) / (axis[idx + 1] - axis[idx]))
+
+    # Blend the 2^dims grid points around each point
+    for corner in itertools.product((0, 1), repeat=len(axes)):
+        weight = np.ones(points.shape[:-1])
+        for dim, step in enumerate(corner):
+            weight = weight * (weights[dim] if step else 1 - weights[dim])
+        index = tuple(lower[dim] + step for dim, step in enumerate(corner))
+        result += weight.reshape(weight.shape + (1,) * (result.ndim - weight.ndim)) * values[index]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the lap time table of every setup, manufacturer and upgrade level")
+    parser.add_argument("--track", default=TRACK_PATH, help="track CSV to time laps on")
+    parser.add_argument("--grid", type=int, default=5, help="simulated points along each performance factor")
+    parser.add_argument("--seeds", type=int, default=3, help="laps timed at each simulated point")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, by default one per CPU")
+    parser.add_argument("--output", default=None, help="table file, by default the track's table in the save folder")
+    args = parser.parse_args()
+
+    setups = enumerate_setups()
+    manufacturers = Car.AVAILABLE_MANUFACTURERS
+    factors = get_table_factors(setups, manufacturers)
+
+    # Lap time only depends on the four performance factors, so time laps on a grid over their range and
+    # interpolate - the table has far more cells than distinct laps worth simulating
+    flat_factors = factors.reshape(-1, 4)
+    axes = [np.linspace(flat_factors[:, dim].min(), flat_factors[:, dim].max(), args.grid) for dim in range(4)]
+    grid_points = list(itertools.product(*axes))
+    jobs = [(point, seed, args.track) for point in grid_points for seed in range(args.seeds)]
+    print(f"Timing {len(jobs)} laps for {len(setups)} setups x {len(manufacturers)} manufacturers x "
+          f"{len(LAP_TABLE_UPGRADE_LEVELS) ** len(UPGRADE_KEYS)} upgrade levels")
+
+    start_time = time.perf_counter()
+    with Pool(args.workers, initializer=init_worker) as pool:
+        lap_times = np.array([np.nan if lap_time is None else lap_time
+                              for lap_time in pool.map(run_solo_laps, jobs)], dtype=float)
+    lap_times = lap_times.reshape((args.grid,) * 4 + (args.seeds,))
+    print(f"Timed the laps in {time.perf_counter() - start_time:.0f}s, "
+          f"{int(np.isnan(lap_times).sum())} never finished")
+
+    # Mean and variance at every grid point, then at every table cell
+    grid_values = np.stack([np.nanmean(lap_times, axis=-1), np.nanvar(lap_times, axis=-1)], axis=-1)
+    table = interpolate_grid(axes, grid_values, factors)
+
+    path = save_lap_table(table, args.output or get_lap_table_path(args.track))
+    print(f"Saved {table.shape} lap time table ({path.stat().st_size / 1024 / 1024:.1f} MB) to {path}")
+
+
+if __name__ == "__main__":
+    main()
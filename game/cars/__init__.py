@@ -1,5 +1,4 @@
 import random
-import pygame
 
 from cars.base_car import BaseCar
 from cars.collision_car import CollisionCar
@@ -17,14 +16,16 @@ class Car:
     # Define manufacturer-specific bonuses (values are in base_car.py and setup_car.py)
     MANUFACTURER_BONUSES = BaseCar.MANUFACTURER_BONUSES
 
-    def __init__(self, track, position=None, color=(0, 0, 255), name="Player", manufacturer="Ferrari"):
+    def __init__(self, track, position=None, color=(0, 0, 255), name="Player", manufacturer="Ferrari", rng=None):
         self.track = track
         self.name = name
         self.color = color
+        # The car's own random stream - pass a seeded one to make the car reproducible
+        self.rng = rng if rng is not None else random.Random()
         
         # Select random manufacturer for AI cars (not player or engineer cars)
         if "AI Car" in name and manufacturer == "Ferrari":
-            self.manufacturer = random.choice(Car.AVAILABLE_MANUFACTURERS)
+            self.manufacturer = self.rng.choice(Car.AVAILABLE_MANUFACTURERS)
         else:
             self.manufacturer = manufacturer
         
@@ -35,8 +36,8 @@ class Car:
             self.x, self.y = track.get_start_position()
             
         # Set safer starting position offsets that avoid walls
-        self.x += random.randint(-5, 5)
-        self.y += random.randint(-5, 5)
+        self.x += self.rng.randint(-5, 5)
+        self.y += self.rng.randint(-5, 5)
         
         # Set initial angle to face the right direction towards first waypoint
         self.angle = 0  # Will be updated in initialize_car_direction()
@@ -71,6 +72,11 @@ class Car:
         # Initialize speed
         self.speed = 0
         
+        # Pose before the last simulation tick, rendering interpolates from it
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_angle = self.angle
+        
         # Car dimensions - explicitly defined early
         self.width = 14  # Reduced from 20
         self.height = 7  # Reduced from 10
@@ -81,7 +87,13 @@ class Car:
         self.lap_times = []
         self.best_lap = None
         self.last_lap_time = 0
-        self.lap_start_time = pygame.time.get_ticks()
+        self.lap_start_time = 0  # Race time in ms, from the game's simulation clock
+        
+        # Distance covered along the track center line since the start, and the time gaps it gives
+        self.progress = 0.0
+        self.gap_to_leader = 0.0  # Seconds behind the leader
+        self.interval = 0.0  # Seconds behind the car ahead
+        self.laps_down = 0
         
         # Add pit road flag - cars will take the pit road on lap 3
         self.take_pit_road = False
@@ -107,14 +119,14 @@ class Car:
         self.recovery_grace_period = 0
         
         # Driver characteristics
-        self.skill_level = random.uniform(0.8, 1.2)  # Affects driving precision
-        self.aggression = random.uniform(0.7, 1.3)   # Affects speed in corners
+        self.skill_level = self.rng.uniform(0.8, 1.2)  # Affects driving precision
+        self.aggression = self.rng.uniform(0.7, 1.3)   # Affects speed in corners
         
         # Add path planning variables
         self.avoidance_angle = 0
         self.avoidance_counter = 0
-        self.last_obstacle_check = pygame.time.get_ticks()
-        self.obstacle_check_interval = 50  # Reduced from 100 - check more frequently
+        self.last_obstacle_check = 0
+        self.obstacle_check_interval = 50  # Race time in ms - reduced from 100 to check more frequently
         
         # Add logging and debug properties
         self.debug_mode = False
@@ -136,8 +148,11 @@ class Car:
     def toggle_push_mode(self):
         return self.base_car.toggle_push_mode()
             
-    def draw(self, surface, camera_x=0, camera_y=0):
-        self.base_car.draw(surface, camera_x, camera_y)
+    def draw(self, surface, camera_x=0, camera_y=0, alpha=1.0):
+        self.base_car.draw(surface, camera_x, camera_y, alpha)
+    
+    def get_render_pose(self, alpha=1.0):
+        return self.base_car.get_render_pose(alpha)
       
     def get_status(self):
         return self.base_car.get_status()
@@ -153,8 +168,8 @@ class Car:
         self.position_car.update(dt)
     
     # Collision car methods
-    def check_collision(self):
-        return self.collision_car.check_collision()
+    def check_collision(self, prev_position=None, dt=1):
+        return self.collision_car.check_collision(prev_position, dt)
         
     def get_corners(self):
         return self.collision_car.get_corners()
@@ -180,8 +195,11 @@ class Car:
             return True
         return False
         
-    def try_avoid_car(self, nearby_cars):
+    def try_avoid_car(self, nearby_cars=None):
         """Try to switch lanes to avoid nearby cars"""
+        if nearby_cars is None:
+            nearby_cars = self.position_car.check_nearby_cars()
+            
         if self.lane_switch_cooldown <= 0:
             # Get current position of next waypoint based on current lane
             next_wp_idx = (self.current_waypoint + 1) % len(self.track.waypoints)
@@ -1,6 +1,8 @@
 import math
 import pygame
 
+from cars.sprite_cache import sprite_cache
+
 
 class BaseCar:
     # Define available manufacturers at the class level for better maintainability
@@ -52,37 +54,28 @@ class BaseCar:
         else:
             return f"{self.car.name} is already in push mode!"
     
-    def draw(self, surface, camera_x=0, camera_y=0):
-        """Draw car with camera offset applied"""
-        # Calculate screen position with camera offset
-        screen_x = self.car.x - camera_x
-        screen_y = self.car.y - camera_y
-        
-        # Get corners with camera offset applied
-        corners = []
-        cos_a = math.cos(math.radians(self.car.angle))
-        sin_a = math.sin(math.radians(self.car.angle))
-        
-        half_width = self.car.width / 2
-        half_height = self.car.height / 2
-        
-        # Make engineer cars slightly larger for better visibility
-        if self.car.is_engineer_car:
-            half_width *= 1.2
-            half_height *= 1.2
+    def get_render_pose(self, alpha=1.0):
+        """Position and angle of the car between the previous tick (alpha 0) and the latest one (alpha 1)"""
+        if alpha >= 1.0:
+            return self.car.x, self.car.y, self.car.angle
+        x = self.car.prev_x + (self.car.x - self.car.prev_x) * alpha
+        y = self.car.prev_y + (self.car.y - self.car.prev_y) * alpha
+        # Turn the short way round when the angle wraps past 0/360
+        turn = (self.car.angle - self.car.prev_angle + 180) % 360 - 180
+        angle = (self.car.prev_angle + turn * alpha) % 360
+        return x, y, angle
+    
+    def draw(self, surface, camera_x=0, camera_y=0, alpha=1.0):
+        """Draw car with camera offset applied, interpolated between the last two ticks"""
+        x, y, angle = self.get_render_pose(alpha)
         
-        # Calculate rotated corners with camera offset
-        for xm, ym in [(-half_width, -half_height), 
-                       (half_width, -half_height), 
-                       (half_width, half_height), 
-                       (-half_width, half_height)]:
-            x = screen_x + xm * cos_a - ym * sin_a
-            y = screen_y + xm * sin_a + ym * cos_a
-            corners.append((x, y))
+        # Calculate screen position with camera offset
+        screen_x = x - camera_x
+        screen_y = y - camera_y
         
         if self.car.sprite:
-            scaled_sprite = pygame.transform.scale(self.car.sprite, (40, 55))
-            rotated_sprite = pygame.transform.rotate(scaled_sprite, -self.car.angle + 90)
+            # Scaled and rotated once per manufacturer and angle step, shared by every car
+            rotated_sprite = sprite_cache.get_rotated(self.car.manufacturer, angle)
             rect = rotated_sprite.get_rect(center=(screen_x, screen_y))
             surface.blit(rotated_sprite, rect)
 
@@ -123,7 +116,7 @@ class BaseCar:
         elif self.car.push_mode:
             status += "PUSHING! "
             
-        status += f"Lap {self.car.laps + 1}"
+        status += f"Lap {max(self.car.laps, 0) + 1}"
         
         if self.car.last_lap_time > 0:
             status += f" | Last: {self.car.last_lap_time:.2f}s"
@@ -140,21 +133,11 @@ class BaseCar:
     def update_manufacturer(self, manufacturer):
         """Update the car's manufacturer and sprite"""
         self.car.manufacturer = manufacturer
-        try:
-            # Map manufacturer names to filenames
-            sprite_map = {
-                "Ferrari": "ferrari.png",
-                "Bentley": "bentley.png",
-                "BMW": "bmw.png",
-                "McLaren": "mclearn.png",
-                "Mercedes": "mercedes.png",
-                "Nissan": "nissan.png",
-                "Porsche": "porsche.png",
-                "Renault": "renault.png"
-            }
-            filename = sprite_map.get(manufacturer, "ferrari.png")
-            self.car.sprite = pygame.image.load(f"game/assets/{filename}").convert_alpha()
-        except Exception as e:
-            print(f"Error loading car sprite for {manufacturer}: {e}")
-            # Fallback to default
-            self.car.sprite = pygame.image.load("game/assets/ferrari.png").convert_alpha()
\ No newline at end of file
+        
+        # Headless cars are never drawn, so don't load (or convert) a sprite for them
+        if getattr(self.car.track, 'headless', False):
+            self.car.sprite = None
+            return
+            
+        # Loaded once per manufacturer and shared by every car
+        self.car.sprite = sprite_cache.get_sprite(manufacturer)
@@ -1,5 +1,7 @@
 import math
 
+from tracks.constants import WALL_FIELD_CELL
+
 
 class CollisionCar:
 
@@ -9,68 +11,96 @@ class CollisionCar:
         self.car.recovery_timer = 0
         self.car.recovery_grace_period = 0
 
-    def check_collision(self):
-        """Check for collisions with walls and handle recovery"""
+    def check_collision(self, prev_position=None, dt=1):
+        """Check for collisions with walls along the move of this tick and handle recovery"""
         # Skip collision detection if recently recovered (add a grace period)
         if hasattr(self.car, 'recovery_grace_period') and self.car.recovery_grace_period > 0:
-            self.car.recovery_grace_period -= 1
+            self.car.recovery_grace_period -= dt
+            return False
+        
+        start_x, start_y = prev_position if prev_position else (self.car.x, self.car.y)
+        end_x, end_y = self.car.x, self.car.y
+        move_distance = math.hypot(end_x - start_x, end_y - start_y)
+        
+        # Nothing can be hit further from a wall than the move and the collision box reach
+        # (one wall field cell covers the sampling error of the field)
+        clearance = self.car.track.get_wall_field(start_x, start_y)[0]
+        if clearance > move_distance + self.get_collision_reach() + WALL_FIELD_CELL:
             return False
-            
-        # Get the corners of the car
-        corners = self.get_corners()
         
         # Forward prediction distance - make it very short
+        forward_distance = self.car.width * 0.3  # Reduced from 0.7 to 0.3
         radians = math.radians(self.car.angle)
-        forward_x = self.car.x + math.cos(radians) * (self.car.width * 0.3)  # Reduced from 0.7 to 0.3
-        forward_y = self.car.y + math.sin(radians) * (self.car.width * 0.3)  # Reduced from 0.7 to 0.3
+        forward_x = end_x + math.cos(radians) * forward_distance
+        forward_y = end_y + math.sin(radians) * forward_distance
         
-        # Get tile type at forward position for debugging
-        tile_at_forward = self.car.track.get_tile_type_at(forward_x, forward_y)
-        
-        # Only crash if hitting a real wall (tile type 0)
-        if self.car.track.is_actual_wall(forward_x, forward_y):
-            self.car.crashed = True
-            self.car.recovery_timer = 20  # Shorter recovery time
-            self.car.speed *= 0.5  # Less penalty
-            self.car.avoidance_counter = 0
-            # Add grace period to prevent immediate re-collision
-            self.car.recovery_grace_period = 10
-            
+        # Sweep from where the car was to just ahead of where it is now, so fast cars can't skip thin walls
+        hit = self.car.track.trace_segment(start_x, start_y, forward_x, forward_y)
+        if hit is not None:
+            # Only crash on ACTUAL walls (tile type 0) - stop with the nose of the car at the contact point
+            hit_x, hit_y, grid_x, grid_y = hit
+            travelled = math.hypot(hit_x - start_x, hit_y - start_y)
+            if travelled > forward_distance:
+                backoff = forward_distance / travelled
+                self.car.x = hit_x - (hit_x - start_x) * backoff
+                self.car.y = hit_y - (hit_y - start_y) * backoff
+            else:
+                self.car.x, self.car.y = start_x, start_y
+            self.record_contact(hit_x, hit_y)
+            self.crash()
             return True
         
-        # Use a much smaller collision box when checking for obstacles
-        center_x, center_y = self.car.x, self.car.y
-        collision_detected = False
-        collision_point = None
-        
-        # Check for collision at a minimum of corners to reduce false positives
-        for i, corner in enumerate(corners):
-            cx, cy = corner
-            
+        # Sweep the corners along the move too, so the sides and the rear can't slip into a wall
+        # when cutting a corner or after being pushed sideways
+        first_share = None
+        for corner_x, corner_y in self.get_corners():
             # Move each corner 50% closer to the center (extremely reduced)
-            new_cx = cx * 0.5 + center_x * 0.5
-            new_cy = cy * 0.5 + center_y * 0.5
+            offset_x = (corner_x - end_x) * 0.5
+            offset_y = (corner_y - end_y) * 0.5
+            hit = self.car.track.trace_segment(start_x + offset_x, start_y + offset_y,
+                                               end_x + offset_x, end_y + offset_y)
+            if hit is None:
+                continue
             
-            # Get tile type for debugging
-            tile_type = self.car.track.get_tile_type_at(new_cx, new_cy)
-            
-            # Only crash on ACTUAL walls (tile type 0), not track boundaries or empty
-            if self.car.track.is_strict_wall(int(new_cx), int(new_cy)):
-                collision_detected = True
-                collision_point = (new_cx, new_cy, tile_type)
-                break
+            # How much of the move the corner made before touching the wall
+            hit_x, hit_y, grid_x, grid_y = hit
+            travelled = math.hypot(hit_x - start_x - offset_x, hit_y - start_y - offset_y)
+            share = travelled / move_distance if move_distance else 0
+            if first_share is None or share < first_share:
+                first_share, first_hit = share, (hit_x, hit_y)
         
-        if collision_detected and collision_point:
-            self.car.crashed = True
-            self.car.recovery_timer = 20  # Faster recovery
-            self.car.speed *= 0.5  # Less penalty
-            self.car.avoidance_counter = 0
-            # Add grace period to prevent immediate re-collision
-            self.car.recovery_grace_period = 10
-            
-            return True
-            
-        return False
+        if first_share is None:
+            return False
+        
+        # Stop the car where the first corner touched the wall
+        self.car.x = start_x + (end_x - start_x) * first_share
+        self.car.y = start_y + (end_y - start_y) * first_share
+        self.record_contact(*first_hit)
+        self.crash()
+        return True
+    
+    def record_contact(self, hit_x, hit_y):
+        """Record a wall contact for the collision debug view"""
+        debug_collisions = getattr(self.car.track, 'debug_collisions', None)
+        if debug_collisions is not None:
+            debug_collisions.append((hit_x, hit_y, self.car.track.get_tile_type_at(hit_x, hit_y)))
+            del debug_collisions[:-100]  # Only keep the latest contacts
+    
+    def crash(self):
+        """Stop the car against a wall and start the recovery timer"""
+        self.car.crashed = True
+        self.car.recovery_timer = 20  # Faster recovery
+        self.car.speed *= 0.5  # Less penalty
+        self.car.avoidance_counter = 0
+        # Add grace period to prevent immediate re-collision
+        self.car.recovery_grace_period = 10
+    
+    def get_collision_reach(self):
+        """How far from the center of the car the collision checks look, past the move itself"""
+        # The forward probe, or a corner of the collision box pulled halfway to the center
+        half_width = self.car.width / 2 * 0.7
+        half_height = self.car.height / 2 * 0.7
+        return max(self.car.width * 0.3, math.hypot(half_width, half_height) * 0.5)
     
     def get_corners(self):
         """Get the four corners of the car for collision detection"""
@@ -1,7 +1,10 @@
 import math
-import random
 
-import pygame
+from tracks.base_track import get_turn_factor
+from tracks.constants import CURRENT_TURN_FACTORS, NEXT_TURN_FACTORS
+
+# Other cars within this many pixels are considered for lane changes
+NEARBY_DISTANCE = 50
 
 
 class PositionCar:
@@ -27,6 +30,12 @@ class PositionCar:
         dy = waypoint_y - self.car.y
         self.car.angle = math.degrees(math.atan2(dy, dx))
     
+    def get_race_time(self):
+        """Return the race time in milliseconds from the game's simulation clock"""
+        if not self.car.game:
+            return 0
+        return self.car.game.clock_game.get_time()
+    
     def check_nearby_cars(self):
         """Check for cars nearby in the direction we're heading"""
         # We need access to all cars from the game
@@ -35,8 +44,11 @@ class PositionCar:
             
         nearby_cars = []
         
+        # If cars are within NEARBY_DISTANCE pixels, they're considered nearby - the game's spatial hash finds them
+        close_cars = self.car.game.spatial_hash.query(self.car.x, self.car.y, NEARBY_DISTANCE)
+        
         # Look for cars that are close to the same waypoint
-        for other_car in self.car.game.cars:
+        for other_car in close_cars:
             if other_car == self.car:
                 continue
                 
@@ -45,14 +57,7 @@ class PositionCar:
             
             # Consider cars 1 waypoint ahead or at the same waypoint
             if waypoint_diff <= 1 or (waypoint_diff > len(self.car.track.waypoints) - 2):
-                # Calculate distance
-                dx = other_car.x - self.car.x
-                dy = other_car.y - self.car.y
-                distance = (dx**2 + dy**2)**0.5
-                
-                # If cars are within 50 pixels, they're considered nearby
-                if distance < 50:
-                    nearby_cars.append(other_car)
+                nearby_cars.append(other_car)
         
         return nearby_cars
         
@@ -83,89 +88,20 @@ class PositionCar:
     
     def update(self, dt):
         """Update car position and handle AI driving"""
-        # Initialize recovery grace period if not present
-        if not hasattr(self.car, 'recovery_grace_period'):
-            self.car.recovery_grace_period = 0
-            
-        # Update lane switch cooldown
-        if self.car.lane_switch_cooldown > 0:
-            self.car.lane_switch_cooldown -= 1
-            
-        if self.car.crashed:
-            self.car.recovery_timer -= 1
-            if self.car.recovery_timer <= 0:
-                self.car.crashed = False
-                # Move slightly backward to recover
-                radians = math.radians(self.car.angle)
-                self.car.x -= math.cos(radians) * 8  # Increased from 5 for better recovery
-                self.car.y -= math.sin(radians) * 8
-                
-            return
-        
-        # Check if we should enable pit road on lap 3
-        if self.car.laps == self.car.pit_road_lap - 1 and self.car.current_waypoint >= 29:
-            # Enable pit road when approaching the pit entrance on lap 3
-            self.car.take_pit_road = True
-            self.car.track.use_pit_road = True
-            if not self.car.pit_road_debug_printed:
-                print(f"{self.car.name} is taking the pit road on lap {self.car.laps + 1}")
-                self.car.pit_road_debug_printed = True
-        elif self.car.laps >= self.car.pit_road_lap and self.car.current_waypoint > 5:
-            # Disable pit road after exiting it on lap 3
-            self.car.take_pit_road = False
-            self.car.track.use_pit_road = False
-        
-        # Update push mode counter
-        if self.car.push_mode:
-            self.car.push_remaining -= 1
-            if self.car.push_remaining <= 0:
-                self.car.push_mode = False
-        
-        # Decrease waypoint cooldown if it's active
-        if self.car.waypoint_cooldown > 0:
-            self.car.waypoint_cooldown -= 1
-        
-        # Check if car is stuck
-        self.car.stuck_detection_timer += 1
-        if self.car.stuck_detection_timer >= 30:  # Check every half second
-            self.car.stuck_detection_timer = 0
-            current_pos = (self.car.x, self.car.y)
-            # Calculate distance moved since last check
-            distance_moved = math.sqrt((current_pos[0] - self.car.last_position[0])**2 + 
-                                     (current_pos[1] - self.car.last_position[1])**2)
-            
-            if distance_moved < 3.0 and self.car.speed > 0.5:  # If barely moving but trying to move
-                self.car.stuck_counter += 1
-                if self.car.debug_mode:
-                    pass
-                if self.car.stuck_counter >= 3:  # Stuck for 3 consecutive checks
-                    self.car.is_stuck = True
-            else:
-                self.car.stuck_counter = 0
-                self.car.is_stuck = False
-                
-            self.car.last_position = current_pos
-            
-        # Handle stuck state
-        if self.car.is_stuck:
-            # Try to get unstuck by making more aggressive random adjustments
-            self.car.x += random.randint(-15, 15)  # Increased from -10, 10
-            self.car.y += random.randint(-15, 15)
-            self.car.stuck_counter = 0
-            self.car.is_stuck = False
-            
-        # Check for nearby cars and consider lane changes
-        nearby_cars = self.check_nearby_cars()
-        if nearby_cars and self.car.lane_switch_cooldown <= 0:
-            best_lane = self.decide_best_lane(nearby_cars)
-            if best_lane != self.car.current_lane:
-                self.car.switch_to_lane(best_lane)
+        # Timers, crash recovery, pit road, stuck handling and lane choice
+        if self.update_state(dt):
+            self.drive(dt)
+    
+    def drive(self, dt, route=None):
+        """Steer towards the target waypoint, adjust the speed and move - the part the vector engine batches"""
+        # The route of the lane, on the pit road if active - the vector engine passes the one it took when the
+        # state was updated, as the pit road flag is shared by the whole field
+        if route is None:
+            route = self.car.track.get_route(self.car.take_pit_road, self.car.current_lane)
         
-        # AI driving logic - Get current target waypoint coordinates using pit road if active and the current lane
-        target_waypoint_pos = self.car.track.get_waypoint_position(self.car.current_waypoint, 
-                                                                 self.car.take_pit_road,
-                                                                 self.car.current_lane)
-        waypoint_x, waypoint_y = target_waypoint_pos
+        # AI driving logic - Get current target waypoint coordinates
+        waypoint_x, waypoint_y = self.car.track.waypoint_routes[route][self.car.current_waypoint]
+        target_waypoint = self.car.current_waypoint
         
         # Calculate angle to target waypoint
         dx = waypoint_x - self.car.x
@@ -173,49 +109,12 @@ class PositionCar:
         target_angle = math.degrees(math.atan2(dy, dx))
         
         # Improved obstacle detection and avoidance
-        current_time = pygame.time.get_ticks()
-        if current_time - self.car.last_obstacle_check > self.car.obstacle_check_interval:
-            self.car.last_obstacle_check = current_time
-            # Check for obstacles ahead in driving direction
-            look_ahead_distance = 20 + self.car.speed * 5  # Look further when moving faster
-            radians = math.radians(self.car.angle)
-            look_x = self.car.x + math.cos(radians) * look_ahead_distance
-            look_y = self.car.y + math.sin(radians) * look_ahead_distance
-            
-            # Check if there's a wall ahead
-            if self.car.track.is_wall(look_x, look_y):
-                # Start avoiding the obstacle with a random direction bias
-                # This helps cars find a way around obstacles
-                if self.car.avoidance_counter == 0:
-                    self.car.avoidance_angle = random.choice([-1, 1]) * random.randint(30, 90)
-                self.car.avoidance_counter = 20  # Avoid for 20 frames
-            
-            # Also check for obstacles to the sides
-            side_angle = 45
-            side_distance = 15
-            
-            # Check left side
-            left_x = self.car.x + math.cos(math.radians(self.car.angle + side_angle)) * side_distance
-            left_y = self.car.y + math.sin(math.radians(self.car.angle + side_angle)) * side_distance
-            left_clear = not self.car.track.is_wall(left_x, left_y)
-            
-            # Check right side
-            right_x = self.car.x + math.cos(math.radians(self.car.angle - side_angle)) * side_distance
-            right_y = self.car.y + math.sin(math.radians(self.car.angle - side_angle)) * side_distance
-            right_clear = not self.car.track.is_wall(right_x, right_y)
-            
-            # If one side is clear and the other isn't, steer toward the clear side
-            if left_clear and not right_clear and self.car.avoidance_counter == 0:
-                self.car.avoidance_angle = 30
-                self.car.avoidance_counter = 10
-            elif right_clear and not left_clear and self.car.avoidance_counter == 0:
-                self.car.avoidance_angle = -30
-                self.car.avoidance_counter = 10
+        self.check_obstacles()
         
         # Apply the avoidance angle if active
         if self.car.avoidance_counter > 0:
             target_angle = (self.car.angle + self.car.avoidance_angle) % 360
-            self.car.avoidance_counter -= 1
+            self.car.avoidance_counter -= dt
         
         # Determine shortest angle to turn
         angle_diff = (target_angle - self.car.angle) % 360
@@ -233,7 +132,7 @@ class PositionCar:
         if self.car.is_engineer_car:
             steering_factor *= 1.1  # Engineer cars are slightly more precise
             
-        turn_amount = min(abs(angle_diff), self.car.turn_speed * steering_factor) * (1 if angle_diff > 0 else -1)
+        turn_amount = min(abs(angle_diff), self.car.turn_speed * steering_factor * dt) * (1 if angle_diff > 0 else -1)
         self.car.angle = (self.car.angle + turn_amount) % 360
         
         # Determine distance to current waypoint
@@ -246,76 +145,32 @@ class PositionCar:
             waypoint_threshold *= 0.9  # Engineer cars follow more precise line
         
         # Only transition to next waypoint if cooldown is zero
-        if distance_to_waypoint < waypoint_threshold and self.car.waypoint_cooldown == 0:
-            # Set a cooldown before allowing next waypoint transition
-            self.car.waypoint_cooldown = 10  # Adjust this value as needed
-            
-            # Get previous waypoint for reference
-            prev_waypoint = self.car.current_waypoint
-            
-            # Move to next waypoint
-            self.car.current_waypoint = (self.car.current_waypoint + 1) % len(self.car.track.waypoints)
-            
-            # Check if we've completed a lap when returning to waypoint 0
-            if self.car.current_waypoint == 0 and prev_waypoint != 0:
-                current_time = pygame.time.get_ticks()
-                lap_time = (current_time - self.car.lap_start_time) / 1000  # Convert to seconds
-                self.car.lap_times.append(lap_time)
-                self.car.last_lap_time = lap_time
-                if self.car.best_lap is None or lap_time < self.car.best_lap:
-                    self.car.best_lap = lap_time
-                self.car.lap_start_time = current_time
-                self.car.laps += 1
+        if distance_to_waypoint < waypoint_threshold and self.car.waypoint_cooldown <= 0:
+            self.advance_waypoint()
         
         # Advanced racing line calculation - look ahead by 2 waypoints for better anticipation
-        next_wp_idx = (self.car.current_waypoint + 1) % len(self.car.track.waypoints)
-        next_wp_pos = self.car.track.get_waypoint_position(next_wp_idx, self.car.take_pit_road, self.car.current_lane)
-        next_wp_x, next_wp_y = next_wp_pos
-        
-        # Also look at waypoint after next for better planning
-        next2_wp_idx = (self.car.current_waypoint + 2) % len(self.car.track.waypoints)
-        next2_wp_pos = self.car.track.get_waypoint_position(next2_wp_idx, self.car.take_pit_road, self.car.current_lane)
-        next2_wp_x, next2_wp_y = next2_wp_pos
-        
-        # Calculate angle between current waypoint and next waypoint
-        next_dx = next_wp_x - waypoint_x
-        next_dy = next_wp_y - waypoint_y
-        next_angle = math.degrees(math.atan2(next_dy, next_dx))
-        
-        # Calculate angle for the turn after that
-        next2_dx = next2_wp_x - next_wp_x
-        next2_dy = next2_wp_y - next_wp_y
-        next2_angle = math.degrees(math.atan2(next2_dy, next2_dx))
-        
-        # Calculate how sharp the upcoming turns are
+        # The headings of the coming legs and the turn between them are precomputed per route
+        corner_profile = self.car.track.corner_profile[route]
+        next_angle, next_turn_angle, next_turn_factor = corner_profile[self.car.current_waypoint]
+        
+        if self.car.current_waypoint != target_waypoint:
+            # Just moved on to the next waypoint - the coming leg starts from the waypoint we were targeting
+            total_waypoints = len(corner_profile)
+            next_wp_x, next_wp_y = self.car.track.waypoint_routes[route][(self.car.current_waypoint + 1) % total_waypoints]
+            next_angle = math.degrees(math.atan2(next_wp_y - waypoint_y, next_wp_x - waypoint_x))
+            next2_angle = corner_profile[(self.car.current_waypoint + 1) % total_waypoints][0]
+            next_turn_angle = abs((next2_angle - next_angle + 180) % 360 - 180)
+            next_turn_factor = get_turn_factor(next_turn_angle, NEXT_TURN_FACTORS)
+        
+        # Calculate how sharp the upcoming turn is from our current heading to the target
         turn_angle = abs((next_angle - target_angle + 180) % 360 - 180)
-        next_turn_angle = abs((next2_angle - next_angle + 180) % 360 - 180)
         
         # Determine maximum safe speed based on course conditions
         target_speed = self.car.max_speed
         
         # More sophisticated speed adjustment for turns
         # Look at both current turn and next turn to plan ahead
-        current_turn_factor = 1.0
-        next_turn_factor = 1.0
-        
-        # Factor for current turn
-        if turn_angle > 70:
-            current_turn_factor = 0.35
-        elif turn_angle > 50:
-            current_turn_factor = 0.5
-        elif turn_angle > 30:
-            current_turn_factor = 0.7
-        elif turn_angle > 15:
-            current_turn_factor = 0.85
-        
-        # Factor for next turn - less impact than current turn
-        if next_turn_angle > 70:
-            next_turn_factor = 0.6
-        elif next_turn_angle > 50:
-            next_turn_factor = 0.75
-        elif next_turn_angle > 30:
-            next_turn_factor = 0.85
+        current_turn_factor = get_turn_factor(turn_angle, CURRENT_TURN_FACTORS)
         
         # Apply car setup factors to turn behavior:
         # - Better tires and handling allow maintaining more speed in corners
@@ -374,7 +229,7 @@ class PositionCar:
             if self.car.is_engineer_car:
                 accel_factor *= 1.1  # Engineer cars have better acceleration
                 
-            self.car.speed = min(self.car.speed + self.car.acceleration * accel_factor, target_speed)
+            self.car.speed = min(self.car.speed + self.car.acceleration * accel_factor * dt, target_speed)
         else:
             # Braking - affected by brakes setup
             brake_factor = 2.0  # Base braking
@@ -386,16 +241,177 @@ class PositionCar:
             if self.car.is_engineer_car:
                 brake_factor *= 1.1  # Engineer cars have slightly better braking
                 
-            self.car.speed = max(self.car.speed - self.car.acceleration * brake_factor, target_speed)
+            self.car.speed = max(self.car.speed - self.car.acceleration * brake_factor * dt, target_speed)
         
         # Smoother speed adjustment in obstacles
         if self.car.avoidance_counter > 0:
             target_speed *= 0.7  # Slow down while avoiding obstacles
         
-        # Convert angle to radians and update position
+        # Convert angle to radians and update position - speeds are in pixels per 60 Hz frame, dt in frames
+        prev_position = (self.car.x, self.car.y)
+        radians = math.radians(self.car.angle)
+        self.car.x += math.cos(radians) * self.car.speed * dt
+        self.car.y += math.sin(radians) * self.car.speed * dt
+        
+        # Check for collision with walls along the way
+        self.car.check_collision(prev_position, dt)
+    
+    def update_state(self, dt, choose_lane=True):
+        """Advance timers, crash recovery, pit road, stuck handling and lane choice - False while crashed"""
+        # Timers count 60 Hz frames like the speeds, so they run down by dt as well
+        # Initialize recovery grace period if not present
+        if not hasattr(self.car, 'recovery_grace_period'):
+            self.car.recovery_grace_period = 0
+            
+        # Update lane switch cooldown
+        if self.car.lane_switch_cooldown > 0:
+            self.car.lane_switch_cooldown -= dt
+            
+        if self.car.crashed:
+            self.car.recovery_timer -= dt
+            if self.car.recovery_timer <= 0:
+                self.car.crashed = False
+                # Push the car away from the wall to recover
+                self.escape_wall(8)  # Increased from 5 for better recovery
+                
+            return False
+        
+        # Check if we should enable pit road on lap 3
+        if self.car.laps == self.car.pit_road_lap - 1 and self.car.current_waypoint >= 29:
+            # Enable pit road when approaching the pit entrance on lap 3
+            self.car.take_pit_road = True
+            self.car.track.use_pit_road = True
+            if not self.car.pit_road_debug_printed:
+                print(f"{self.car.name} is taking the pit road on lap {self.car.laps + 1}")
+                self.car.pit_road_debug_printed = True
+        elif self.car.laps >= self.car.pit_road_lap and self.car.current_waypoint > 5:
+            # Disable pit road after exiting it on lap 3
+            self.car.take_pit_road = False
+            self.car.track.use_pit_road = False
+        
+        # Update push mode counter
+        if self.car.push_mode:
+            self.car.push_remaining -= dt
+            if self.car.push_remaining <= 0:
+                self.car.push_mode = False
+        
+        # Decrease waypoint cooldown if it's active
+        if self.car.waypoint_cooldown > 0:
+            self.car.waypoint_cooldown -= dt
+        
+        # Check if car is stuck
+        self.car.stuck_detection_timer += dt
+        if self.car.stuck_detection_timer >= 30:  # Check every half second
+            self.car.stuck_detection_timer = 0
+            current_pos = (self.car.x, self.car.y)
+            # Calculate distance moved since last check
+            distance_moved = math.sqrt((current_pos[0] - self.car.last_position[0])**2 + 
+                                     (current_pos[1] - self.car.last_position[1])**2)
+            
+            if distance_moved < 3.0 and self.car.speed > 0.5:  # If barely moving but trying to move
+                self.car.stuck_counter += 1
+                if self.car.debug_mode:
+                    pass
+                if self.car.stuck_counter >= 3:  # Stuck for 3 consecutive checks
+                    self.car.is_stuck = True
+            else:
+                self.car.stuck_counter = 0
+                self.car.is_stuck = False
+                
+            self.car.last_position = current_pos
+            
+        # Handle stuck state
+        if self.car.is_stuck:
+            # Try to get unstuck with a bigger push away from the nearest wall
+            self.escape_wall(15)
+            self.car.stuck_counter = 0
+            self.car.is_stuck = False
+            
+        # Check for nearby cars and consider lane changes (the vector engine does it itself, once the cars
+        # ahead of this one in the field have moved)
+        if choose_lane:
+            self.choose_lane()
+        
+        return True
+    
+    def choose_lane(self):
+        """Switch to the lane with the fewest nearby cars, once the lane switch cooldown is over"""
+        if self.car.lane_switch_cooldown > 0:
+            return
+        nearby_cars = self.check_nearby_cars()
+        if nearby_cars:
+            best_lane = self.decide_best_lane(nearby_cars)
+            if best_lane != self.car.current_lane:
+                self.car.switch_to_lane(best_lane)
+    
+    def check_obstacles(self):
+        """Periodically look for walls ahead and start avoiding them"""
+        current_time = self.get_race_time()
+        if current_time - self.car.last_obstacle_check > self.car.obstacle_check_interval:
+            self.car.last_obstacle_check = current_time
+            # Check the wall clearance ahead in driving direction
+            look_x, look_y = self.get_look_ahead_point()
+            self.avoid_walls(*self.car.track.get_wall_field(look_x, look_y))
+    
+    def get_look_ahead_point(self):
+        """Return the point ahead of the car that is checked for walls"""
+        look_ahead_distance = 20 + self.car.speed * 5  # Look further when moving faster
         radians = math.radians(self.car.angle)
-        self.car.x += math.cos(radians) * self.car.speed
-        self.car.y += math.sin(radians) * self.car.speed
+        return (self.car.x + math.cos(radians) * look_ahead_distance,
+                self.car.y + math.sin(radians) * look_ahead_distance)
+    
+    def avoid_walls(self, clearance, escape_x, escape_y):
+        """Start avoiding a wall ahead, steering towards the escape direction of the wall field"""
+        # No escape direction means there is no wall nearby to steer away from
+        if escape_x == 0 and escape_y == 0:
+            return
+        
+        # Angle between our heading and the direction away from the wall
+        escape_angle = (math.degrees(math.atan2(escape_y, escape_x)) - self.car.angle + 180) % 360 - 180
+        
+        if clearance < 0:
+            # The look ahead point is inside a wall - turn firmly towards the clear side
+            if self.car.avoidance_counter <= 0:
+                self.car.avoidance_angle = math.copysign(min(max(abs(escape_angle), 30), 90), escape_angle)
+            self.car.avoidance_counter = 20  # Avoid for 20 frames
+        elif clearance < 15 and self.car.avoidance_counter <= 0:
+            # Passing close to a wall - small correction towards the clear side
+            self.car.avoidance_angle = 30 if escape_angle > 0 else -30
+            self.car.avoidance_counter = 10
+    
+    def escape_wall(self, distance):
+        """Move the car away from the nearest wall, along the wall field gradient"""
+        clearance, escape_x, escape_y = self.car.track.get_wall_field(self.car.x, self.car.y)
+        if escape_x == 0 and escape_y == 0:
+            # No wall nearby to push away from - back up instead
+            radians = math.radians(self.car.angle)
+            escape_x, escape_y = -math.cos(radians), -math.sin(radians)
+        self.car.x += escape_x * distance
+        self.car.y += escape_y * distance
+    
+    def advance_waypoint(self):
+        """Move on to the next waypoint and record the lap time when crossing the line"""
+        # Set a cooldown before allowing next waypoint transition
+        self.car.waypoint_cooldown = 10  # Adjust this value as needed
+
+        # Get previous waypoint for reference
+        prev_waypoint = self.car.current_waypoint
+
+        # Move to next waypoint
+        self.car.current_waypoint = (self.car.current_waypoint + 1) % len(self.car.track.waypoints)
+
+        # Cars starting on the grid far behind the line only reach it, their first lap is timed from the start
+        if self.car.current_waypoint == 0 and self.car.laps < 0:
+            self.car.laps += 1
+            return
         
-        # Check for collision with walls
-        self.car.check_collision()
+        # Check if we've completed a lap when returning to waypoint 0
+        if self.car.current_waypoint == 0 and prev_waypoint != 0:
+            current_time = self.get_race_time()
+            lap_time = (current_time - self.car.lap_start_time) / 1000  # Convert to seconds
+            self.car.lap_times.append(lap_time)
+            self.car.last_lap_time = lap_time
+            if self.car.best_lap is None or lap_time < self.car.best_lap:
+                self.car.best_lap = lap_time
+            self.car.lap_start_time = current_time
+            self.car.laps += 1
@@ -1,4 +1,51 @@
-import random
+import itertools
+
+# Setup values in the order of Car.setup, each from 1 to 10 and 25 in total
+SETUP_KEYS = ("Engine", "Tires", "Aerodynamics", "Handling", "Brakes")
+SETUP_MIN = 1
+SETUP_MAX = 10
+SETUP_TOTAL = 25
+
+
+def enumerate_setups():
+    """Every balanced setup, as tuples of values in SETUP_KEYS order"""
+    return [setup for setup in itertools.product(range(SETUP_MIN, SETUP_MAX + 1), repeat=len(SETUP_KEYS))
+            if sum(setup) == SETUP_TOTAL]
+
+
+def get_performance_factors(setup, manufacturer, upgrades=None):
+    """Multipliers of the base max speed, acceleration, turn speed and braking for a setup, manufacturer and upgrades"""
+    # Engine affects top speed and acceleration
+    engine_factor = 0.8 + (setup["Engine"] / 10) * 0.4  # 0.8-1.2 range
+    
+    # Tires affect cornering grip
+    tires_factor = 0.8 + (setup["Tires"] / 10) * 0.4  # 0.8-1.2 range
+    
+    # Aerodynamics affect top speed and high-speed cornering
+    aero_factor = 0.8 + (setup["Aerodynamics"] / 10) * 0.4  # 0.8-1.2 range
+    
+    # Handling affects turn responsiveness
+    handling_factor = 0.8 + (setup["Handling"] / 10) * 0.4  # 0.8-1.2 range
+    
+    # Brakes affect braking efficiency
+    brakes_factor = 0.8 + (setup["Brakes"] / 10) * 0.4  # 0.8-1.2 range
+    
+    # Permanent upgrades - each level adds 0.03 to the factor (30% boost at max level 10)
+    if upgrades is not None:
+        engine_factor += upgrades.get('engine', 0) * 0.03
+        tires_factor += upgrades.get('tires', 0) * 0.03
+        aero_factor += upgrades.get('aero', 0) * 0.03
+    
+    # Apply manufacturer-specific bonuses
+    manufacturer_bonus = SetupCar.MANUFACTURER_BONUSES.get(manufacturer, {})
+    engine_factor += manufacturer_bonus.get("Engine", 0)
+    tires_factor += manufacturer_bonus.get("Tires", 0)
+    aero_factor += manufacturer_bonus.get("Aerodynamics", 0)
+    handling_factor += manufacturer_bonus.get("Handling", 0)
+    brakes_factor += manufacturer_bonus.get("Brakes", 0)
+    
+    return ((engine_factor * 0.7) + (aero_factor * 0.3), engine_factor,
+            (handling_factor * 0.6) + (tires_factor * 0.4), brakes_factor)
 
 
 class SetupCar:
@@ -34,22 +81,8 @@ class SetupCar:
 
     def update_performance_from_setup(self):
         """Calculate car performance values based on setup"""
-        # Engine affects top speed and acceleration
-        engine_factor = 0.8 + (self.car.setup["Engine"] / 10) * 0.4  # 0.8-1.2 range
-        
-        # Tires affect cornering grip
-        tires_factor = 0.8 + (self.car.setup["Tires"] / 10) * 0.4  # 0.8-1.2 range
-        
-        # Aerodynamics affect top speed and high-speed cornering
-        aero_factor = 0.8 + (self.car.setup["Aerodynamics"] / 10) * 0.4  # 0.8-1.2 range
-        
-        # Handling affects turn responsiveness
-        handling_factor = 0.8 + (self.car.setup["Handling"] / 10) * 0.4  # 0.8-1.2 range
-        
-        # Brakes affect braking efficiency
-        brakes_factor = 0.8 + (self.car.setup["Brakes"] / 10) * 0.4  # 0.8-1.2 range
-        
         # Apply permanent upgrades if this is an engineer car and we're attached to a game
+        upgrades = None
         try:
             if getattr(self.car, 'is_engineer_car', False) and hasattr(self.car, 'game') and self.car.game is not None:
                 # Get car-specific upgrades - use the car's name (garage name) as the key
@@ -58,42 +91,23 @@ class SetupCar:
                 # Check if car_upgrades exists and has data for this garage
                 if hasattr(self.car.game, 'car_upgrades') and garage_name in self.car.game.car_upgrades:
                     # Use the specific car's upgrades
-                    car_upgrades = self.car.game.car_upgrades[garage_name]
-                    
-                    # Apply upgrade bonuses - each upgrade level adds 0.03 to the factor (30% boost at max level 10)
-                    engine_upgrade_level = car_upgrades.get('engine', 0)
-                    engine_upgrade_bonus = engine_upgrade_level * 0.03
-                    engine_factor += engine_upgrade_bonus
-                    
-                    tires_upgrade_level = car_upgrades.get('tires', 0)
-                    tires_upgrade_bonus = tires_upgrade_level * 0.03
-                    tires_factor += tires_upgrade_bonus
-                    
-                    aero_upgrade_level = car_upgrades.get('aero', 0)
-                    aero_upgrade_bonus = aero_upgrade_level * 0.03
-                    aero_factor += aero_upgrade_bonus
+                    upgrades = self.car.game.car_upgrades[garage_name]
         except AttributeError:
             # If any attribute error occurs, just continue with base values
             pass
         
-        # Apply manufacturer-specific bonuses
-        manufacturer_bonus = SetupCar.MANUFACTURER_BONUSES.get(self.car.manufacturer, {})
-        engine_factor += manufacturer_bonus.get("Engine", 0)
-        tires_factor += manufacturer_bonus.get("Tires", 0)
-        aero_factor += manufacturer_bonus.get("Aerodynamics", 0)
-        handling_factor += manufacturer_bonus.get("Handling", 0)
-        brakes_factor += manufacturer_bonus.get("Brakes", 0)
-        
         # Calculate performance values
-        self.car.max_speed = self.car.base_max_speed * ((engine_factor * 0.7) + (aero_factor * 0.3))
-        self.car.acceleration = self.car.base_acceleration * engine_factor
-        self.car.turn_speed = self.car.base_turn_speed * ((handling_factor * 0.6) + (tires_factor * 0.4))
-        self.car.braking = self.car.base_braking * brakes_factor
+        speed_factor, acceleration_factor, turn_factor, braking_factor = get_performance_factors(
+            self.car.setup, self.car.manufacturer, upgrades)
+        self.car.max_speed = self.car.base_max_speed * speed_factor
+        self.car.acceleration = self.car.base_acceleration * acceleration_factor
+        self.car.turn_speed = self.car.base_turn_speed * turn_factor
+        self.car.braking = self.car.base_braking * braking_factor
         
     def set_random_setup(self):
         """Generate random setup values for AI cars"""
         for key in self.car.setup:
-            self.car.setup[key] = random.randint(3, 8)  # Random values between 3-8
+            self.car.setup[key] = self.car.rng.randint(3, 8)  # Random values between 3-8
         self.update_performance_from_setup()
         
     def adjust_setup_balanced(self, key, new_value):
@@ -0,0 +1,59 @@
+class SpatialHash:
+    """Uniform grid of cars for fast 'cars within a radius' queries"""
+
+    def __init__(self, cell_size=64, margin=32):
+        self.cell_size = cell_size
+        # Cars keep moving after the grid is built (up to ~30px per tick with the stuck jitter),
+        # so queries look this much further and then check the live positions
+        self.margin = margin
+        self.cells = {}
+        # The last lookup - the vector engine looks around a car just before its lane choice does
+        self.last_lookup = None
+        self.last_buckets = None
+
+    def rebuild(self, cars):
+        """Bucket every car by the grid cell it is in"""
+        self.cells = {}
+        self.last_lookup = None
+        for index, car in enumerate(cars):
+            cell = (int(car.x // self.cell_size), int(car.y // self.cell_size))
+            if cell in self.cells:
+                self.cells[cell].append((index, car))
+            else:
+                self.cells[cell] = [(index, car)]
+
+    def buckets(self, x, y, radius):
+        """Return the buckets of (index, car) that could hold cars within radius of a point"""
+        if self.last_lookup == (x, y, radius):
+            return self.last_buckets
+        reach = radius + self.margin
+        min_cell_x = int((x - reach) // self.cell_size)
+        max_cell_x = int((x + reach) // self.cell_size)
+        min_cell_y = int((y - reach) // self.cell_size)
+        max_cell_y = int((y + reach) // self.cell_size)
+
+        buckets = []
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    buckets.append(bucket)
+        self.last_lookup = (x, y, radius)
+        self.last_buckets = buckets
+        return buckets
+
+    def query(self, x, y, radius):
+        """Return the cars within radius of a point, in the order of the car list"""
+        candidates = []
+        for bucket in self.buckets(x, y, radius):
+            candidates.extend(bucket)
+        candidates.sort(key=lambda item: item[0])
+
+        # Exact distance check on where the cars are now
+        nearby = []
+        for index, car in candidates:
+            dx = car.x - x
+            dy = car.y - y
+            if (dx**2 + dy**2)**0.5 < radius:
+                nearby.append(car)
+        return nearby
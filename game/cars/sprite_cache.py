@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+import pygame
+
+from data.asset_data import get_scaled_image, load_image
+
+# Sprite file of each manufacturer, unknown ones are drawn as a Ferrari
+SPRITE_FILES = {
+    "Ferrari": "ferrari.png",
+    "Bentley": "bentley.png",
+    "BMW": "bmw.png",
+    "McLaren": "mclearn.png",
+    "Mercedes": "mercedes.png",
+    "Nissan": "nissan.png",
+    "Porsche": "porsche.png",
+    "Renault": "renault.png"
+}
+DEFAULT_SPRITE = "ferrari.png"
+
+# Size cars are drawn at on the track
+CAR_SPRITE_SIZE = (40, 55)
+# Rotations are rounded to this many degrees, and the least recently drawn ones dropped past the cache size
+ROTATION_STEP = 2
+ROTATION_CACHE_SIZE = 1024
+
+
+class SpriteCache:
+    """Car sprites shared by every car of a manufacturer, rotated once per angle step"""
+
+    def __init__(self, rotation_step=ROTATION_STEP, max_rotations=ROTATION_CACHE_SIZE):
+        self.rotation_step = rotation_step
+        self.max_rotations = max_rotations
+        # Rotated sprites by (manufacturer, angle step), least recently used first
+        self.rotations = OrderedDict()
+
+    def get_sprite_file(self, manufacturer):
+        """Sprite file of a manufacturer, a Ferrari when it has none or it can't be loaded"""
+        filename = SPRITE_FILES.get(manufacturer, DEFAULT_SPRITE)
+        try:
+            load_image(filename)
+        except Exception as e:
+            print(f"Error loading car sprite for {manufacturer}: {e}")
+            # Fallback to default
+            filename = DEFAULT_SPRITE
+        return filename
+
+    def get_sprite(self, manufacturer):
+        """Sprite of a manufacturer at its original size, loaded once for the whole game"""
+        return load_image(self.get_sprite_file(manufacturer))
+
+    def get_rotated(self, manufacturer, angle):
+        """Sprite of a manufacturer scaled to CAR_SPRITE_SIZE and turned to face angle, to the nearest step"""
+        step = round(angle / self.rotation_step) % (360 // self.rotation_step)
+        key = (manufacturer, step)
+        rotated = self.rotations.get(key)
+        if rotated is not None:
+            self.rotations.move_to_end(key)
+            return rotated
+
+        scaled = get_scaled_image(self.get_sprite_file(manufacturer), CAR_SPRITE_SIZE)
+        # The sprites point up, car angles are measured from the x axis
+        rotated = pygame.transform.rotate(scaled, -step * self.rotation_step + 90)
+        self.rotations[key] = rotated
+        if len(self.rotations) > self.max_rotations:
+            self.rotations.popitem(last=False)
+        return rotated
+
+
+# One cache for all cars, the race and the replay share the same sprites
+sprite_cache = SpriteCache()
@@ -4,7 +4,21 @@ import pygame
 # Screen dimensions
 SCREEN_WIDTH = 1920  # 1080p resolution width
 SCREEN_HEIGHT = 1080  # 1080p resolution height
-FPS = 60
+FPS = 60  # Simulation ticks per second - the car physics advance one 60 Hz frame (dt = 1) per tick
+RENDER_FPS = 144  # Display frame rate cap, the race runs at FPS ticks per second regardless
+MAX_TICKS_PER_FRAME = 8  # Ticks a slow frame may catch up on before the backlog is dropped (per unit of time scale)
+TIME_SCALES = (1, 2, 4, 16)  # Race speeds on the 1-4 keys
+FLAG_FRAME_BUDGET_MS = 50  # Simulation time per frame when simulating to the flag, keeps the window responsive
+
+# Cars in a race - the two engineer cars and the AI field
+FIELD_SIZE = 10
+MIN_FIELD_SIZE = 10
+MAX_FIELD_SIZE = 500
+OVERLAY_ROWS = 10  # Rows of the position overlay, a bigger field shows the leaders and the cars around the selected one
+
+# Frame time overlay (F3) - the parts of a frame it times, and how many frames its averages and graph cover
+PROFILE_SECTIONS = ("events", "update", "track", "waypoints", "cars", "ui", "overlay", "flip")
+PROFILE_FRAMES = 240
 
 # Camera constants
 CAMERA_SMOOTHNESS = 0.1  # Lower = smoother but slower camera (between 0.01 and 1.0)
@@ -16,6 +30,7 @@ STATE_RACING = 2
 STATE_PAUSE = 3
 STATE_RACE_END = 4  # New state for race end screen
 STATE_MANUFACTURER_SELECTION = 5  # New state for manufacturer selection screen
+STATE_REPLAY = 6  # Playback of a recorded race
 
 # Colors
 BLACK = (0, 0, 0)
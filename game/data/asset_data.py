@@ -0,0 +1,42 @@
+from collections import OrderedDict
+
+import pygame
+
+# Images are loaded from here, relative to where the game is run from like every other game path
+ASSET_DIR = "game/assets"
+# Derived images (scaled, tinted, ...) kept for reuse, the least recently used ones are dropped past this
+VARIANT_CACHE_SIZE = 256
+
+# Loaded images by (filename, alpha) and derived images by key, shared by everything that draws them
+_images = {}
+_variants = OrderedDict()
+
+def load_image(filename, alpha=True):
+    """Image from the assets folder, loaded once - converted for fast blits when a display mode is set"""
+    key = (filename, alpha)
+    image = _images.get(key)
+    if image is None:
+        image = pygame.image.load(f"{ASSET_DIR}/{filename}")
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        _images[key] = image
+    return image
+
+def get_variant(key, make):
+    """Derived image made once by make() and shared by key - callers must not change it"""
+    image = _variants.get(key)
+    if image is not None:
+        _variants.move_to_end(key)
+        return image
+
+    image = make()
+    _variants[key] = image
+    if len(_variants) > VARIANT_CACHE_SIZE:
+        _variants.popitem(last=False)
+    return image
+
+def get_scaled_image(filename, size, alpha=True):
+    """Image from the assets folder scaled to size, shared like load_image"""
+    size = tuple(size)
+    return get_variant(("scaled", filename, size, alpha),
+                       lambda: pygame.transform.scale(load_image(filename, alpha), size))
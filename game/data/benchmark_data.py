@@ -0,0 +1,30 @@
+import json
+from pathlib import Path
+
+from data.player_data import SAVE_DIR
+
+# Benchmark results of the last run and the baseline later runs are compared against
+BENCHMARK_DIR = SAVE_DIR / "benchmarks"
+LATEST_FILE = BENCHMARK_DIR / "latest.json"
+BASELINE_FILE = BENCHMARK_DIR / "baseline.json"
+
+def save_benchmark_results(results, path):
+    """Save a benchmark run as JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+def load_benchmark_results(path):
+    """Load a saved benchmark run, or None when there is none"""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error loading benchmark results: {e}")
+        return None
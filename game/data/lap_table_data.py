@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import numpy as np
+
+from data.player_data import SAVE_DIR
+
+# Lap time tables are built per track by build_lap_table.py and kept next to the player data
+LAP_TABLE_DIR = SAVE_DIR / "lap_tables"
+
+# Upgrade levels the table is built at, the ones in between are interpolated
+LAP_TABLE_UPGRADE_LEVELS = (0, 5, 10)
+
+def get_lap_table_path(track_path):
+    """Lap time table file of a track"""
+    return LAP_TABLE_DIR / f"{Path(track_path).stem}.npy"
+
+def save_lap_table(table, path):
+    """Save a lap time table as a plain .npy file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, np.asarray(table, dtype=np.float32))
+    return path
+
+def load_lap_table(path):
+    """Memory map a lap time table, or None when it hasn't been built"""
+    if not Path(path).exists():
+        return None
+
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError) as e:
+        print(f"Error loading lap time table: {e}")
+        return None
@@ -0,0 +1,64 @@
+import json
+import struct
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from data.player_data import SAVE_DIR
+
+# Replays are saved next to the player data
+REPLAY_DIR = SAVE_DIR / "replays"
+REPLAY_EXTENSION = ".trr"
+
+# File layout: magic, header size, JSON header, zlib keyframes (int32), zlib deltas (int16) - all little endian
+REPLAY_MAGIC = b"TRREPLAY"
+REPLAY_VERSION = 1
+
+def save_replay(replay, path=None):
+    """Save a replay to a compact binary file and return its path"""
+    if path is None:
+        REPLAY_DIR.mkdir(parents=True, exist_ok=True)
+        path = REPLAY_DIR / f"race_{time.strftime('%Y%m%d_%H%M%S')}{REPLAY_EXTENSION}"
+
+    keyframes = zlib.compress(np.ascontiguousarray(replay["keyframes"], dtype='<i4').tobytes(), 9)
+    deltas = zlib.compress(np.ascontiguousarray(replay["deltas"], dtype='<i2').tobytes(), 9)
+    header = dict(replay["header"], version=REPLAY_VERSION,
+                  keyframes_size=len(keyframes), deltas_size=len(deltas))
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    with open(path, 'wb') as f:
+        f.write(REPLAY_MAGIC)
+        f.write(struct.pack('<I', len(header_bytes)))
+        f.write(header_bytes)
+        f.write(keyframes)
+        f.write(deltas)
+    return Path(path)
+
+def load_replay(path):
+    """Load a replay saved with save_replay"""
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if not data.startswith(REPLAY_MAGIC):
+        raise ValueError(f"{path} is not a TopRacer replay")
+    offset = len(REPLAY_MAGIC)
+    (header_size,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    header = json.loads(data[offset:offset + header_size].decode("utf-8"))
+    offset += header_size
+    if header.get("version") != REPLAY_VERSION:
+        raise ValueError(f"{path} is a version {header.get('version')} replay, expected version {REPLAY_VERSION}")
+
+    # Every frame holds one row of fields per car
+    frame_shape = (len(header["cars"]), len(header["fields"]))
+    keyframes = zlib.decompress(data[offset:offset + header["keyframes_size"]])
+    offset += header["keyframes_size"]
+    deltas = zlib.decompress(data[offset:offset + header["deltas_size"]])
+
+    return {
+        "header": header,
+        "keyframes": np.frombuffer(keyframes, dtype='<i4').reshape((-1,) + frame_shape),
+        "deltas": np.frombuffer(deltas, dtype='<i2').reshape((-1,) + frame_shape)
+    }
@@ -0,0 +1,31 @@
+import hashlib
+import json
+
+from data.player_data import SAVE_DIR
+
+# Results of simulated races, kept so no race is ever simulated twice
+SIMULATION_FILE = SAVE_DIR / "simulations.json"
+
+def get_simulation_key(track_path, field, car_upgrades, seed):
+    """Stable key of a simulated race - the track, the whole field, the upgrades and the seed"""
+    return hashlib.sha1(repr((str(track_path), field, car_upgrades, seed)).encode("utf-8")).hexdigest()
+
+def load_simulations():
+    """Load the saved race results by simulation key"""
+    if not SIMULATION_FILE.exists():
+        return {}
+
+    try:
+        with open(SIMULATION_FILE, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error loading simulation data: {e}")
+        return {}
+
+def save_simulations(simulations):
+    """Save race results by simulation key"""
+    # Write next to the file first, so an interrupted save never loses the results already there
+    temp_file = SIMULATION_FILE.with_suffix(".tmp")
+    with open(temp_file, 'w') as f:
+        json.dump(simulations, f)
+    temp_file.replace(SIMULATION_FILE)
@@ -2,6 +2,7 @@ import pygame
 
 from tracks import Track
 from cars import Car
+from cars.spatial_hash import SpatialHash
 from constants.constants import *
 from data.player_data import load_players
 
@@ -9,12 +10,33 @@ from gameplay.base_game import BaseGame
 from gameplay.player_game import PlayerGame
 from gameplay.event_game import EventGame
 from gameplay.race_game import RaceGame
+from gameplay.simulation_game import SimulationGame
+from gameplay.clock_game import ClockGame
+from gameplay.vector_game import VectorGame
+from gameplay.timestep_game import TimestepGame
+from gameplay.random_game import RandomGame
+from gameplay.replay_game import ReplayGame
+from gameplay.predict_game import PredictGame
+from gameplay.lap_time_game import LapTimeGame
+from gameplay.profile_game import ProfileGame
 
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, headless=False, vector_engine=False, seed=None, record_replay=None, track=None,
+                 field_size=FIELD_SIZE):
+        if not MIN_FIELD_SIZE <= field_size <= MAX_FIELD_SIZE:
+            raise ValueError(f"field_size must be between {MIN_FIELD_SIZE} and {MAX_FIELD_SIZE}, got {field_size}")
         self.screen = screen
-        self.track = Track()
+        # Headless games run the race simulation only: no display, sprites or textures
+        self.headless = headless
+        # Record every race for playback - by default only when playing with a display
+        self.record_replay = not headless if record_replay is None else record_replay
+        # Step all cars at once with the NumPy engine instead of one car at a time
+        self.use_vector_engine = vector_engine
+        # A loaded track can be shared by games run one after another, e.g. in prediction workers
+        self.track = track if track is not None else Track(headless=headless)
+        # Seeded random streams - needed before the cars are created
+        self.random_game = RandomGame(self, seed)
         
         # Create cars with different colors
         self.colors = [BLUE, RED, GREEN, YELLOW, PURPLE, CYAN, ORANGE, PINK , GRAY, BROWN]
@@ -33,24 +55,24 @@ class Game:
         
         # Set up two special racing engineer cars
         # First engineer car - blue with special name
-        engineer_car1 = Car(self.track, color=BLUE, name="Team Alpha")
+        engineer_car1 = Car(self.track, color=BLUE, name="Team Alpha", rng=self.random_game.car_stream(0))
         engineer_car1.can_push = True
         engineer_car1.is_engineer_car = True  # Add a flag to identify engineer cars
         self.cars.append(engineer_car1)
         self.engineer_car_indices.append(0)
         
         # Second engineer car - red with special name
-        engineer_car2 = Car(self.track, color=RED, name="Team Omega")
+        engineer_car2 = Car(self.track, color=RED, name="Team Omega", rng=self.random_game.car_stream(1))
         engineer_car2.can_push = True
         engineer_car2.is_engineer_car = True
         self.cars.append(engineer_car2)
         self.engineer_car_indices.append(1)
         
-        # Set up three regular AI cars (no push capability)
-        for i in range(8):
-            color = self.colors[i+2]  # Start from 3rd color (green, yellow, purple)
+        # Set up the regular AI cars (no push capability)
+        for i in range(field_size - 2):
+            color = self.colors[2 + i % (len(self.colors) - 2)]  # Cycle from the 3rd color (green, yellow, purple)
             name = f"AI Car {i+1}"
-            car = Car(self.track, color=color, name=name)
+            car = Car(self.track, color=color, name=name, rng=self.random_game.car_stream(i + 2))
             car.can_push = False
             car.is_engineer_car = False
             # Set random setup for AI cars
@@ -66,14 +88,22 @@ class Game:
         # Race settings
         self.MAX_LAPS = 5  # Race ends after 5 laps
         
+        # Grid of car positions for nearby car queries, rebuilt every tick
+        self.spatial_hash = SpatialHash()
+        
         # Race positions
         self.race_positions = []  # Will store current race positions
         self.final_positions = []  # Will store final race positions when race ends
         self.race_finished = False  # Flag to indicate if race has finished
+        # Distance reached by the front of the race and the race time it got there, for the time gaps
+        self.front_progress = []
+        self.front_times = []
 
-        # Camera position
+        # Camera position, and where it was before the last tick for interpolated drawing
         self.camera_x = 0
         self.camera_y = 0
+        self.prev_camera_x = 0
+        self.prev_camera_y = 0
 
         # Game state
         self.state = STATE_START_SCREEN
@@ -147,6 +177,14 @@ class Game:
         self.player_game = PlayerGame(self)
         self.event_game = EventGame(self)
         self.race_game = RaceGame(self)
+        self.simulation_game = SimulationGame(self)
+        self.clock_game = ClockGame(self)
+        self.vector_game = VectorGame(self)
+        self.timestep_game = TimestepGame(self)
+        self.replay_game = ReplayGame(self)
+        self.predict_game = PredictGame(self)
+        self.lap_time_game = LapTimeGame(self)
+        self.profile_game = ProfileGame(self)
         
     def save_current_player_stats(self):
         """Save the current player's stats to file"""
@@ -168,6 +206,38 @@ class Game:
     def update(self):
         """Update game state"""
         return self.race_game.update()
+    
+    def advance(self, frame_ms):
+        """Run the simulation ticks covered by a rendered frame of frame_ms milliseconds"""
+        return self.timestep_game.advance(frame_ms)
+    
+    def set_time_scale(self, time_scale):
+        """Run the race at a multiple of real time"""
+        return self.timestep_game.set_time_scale(time_scale)
+    
+    def toggle_to_flag(self):
+        """Start or stop simulating the rest of the race as fast as possible"""
+        return self.timestep_game.toggle_to_flag()
+
+    def start_prediction(self):
+        """Predict the race outcome of the current setups from simulated races in the background"""
+        return self.predict_game.start()
+    
+    def update_prediction(self):
+        """Collect the prediction races that have finished"""
+        return self.predict_game.update()
+    
+    def stop_prediction(self):
+        """Stop the prediction races still running"""
+        return self.predict_game.cancel()
+
+    def toggle_profiler(self):
+        """Show or hide the frame time overlay"""
+        return self.profile_game.toggle()
+
+    def get_lap_time(self, car, setup=None, manufacturer=None):
+        """Expected lap time and its spread of a car, optionally on another setup or manufacturer"""
+        return self.lap_time_game.get_lap_time(car, setup, manufacturer)
 
     def update_race_positions(self):
         """Calculate current race positions based on laps completed and distance to next waypoint"""
@@ -179,4 +249,20 @@ class Game:
         
     def reset_race(self):
         """Reset race state to prepare for a new race"""
-        return self.race_game.reset_race()
\ No newline at end of file
+        return self.race_game.reset_race()
+    
+    def prepare_race(self, debug_mode=True):
+        """Configure all cars and place them on the starting grid"""
+        return self.race_game.prepare_race(debug_mode)
+    
+    def start_replay(self, replay=None):
+        """Play back a recorded race, by default the last one"""
+        return self.replay_game.start_playback(replay)
+    
+    def stop_replay(self):
+        """Leave replay mode"""
+        return self.replay_game.stop_playback()
+    
+    def simulate_race(self, max_ticks=None):
+        """Run a full race without rendering and return its results"""
+        return self.simulation_game.run_race(max_ticks)
\ No newline at end of file
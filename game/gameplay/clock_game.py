@@ -0,0 +1,21 @@
+from constants.constants import FPS
+
+
+class ClockGame:
+    """Simulation clock component - counts race ticks instead of reading the wall clock"""
+
+    def __init__(self, game):
+        self.game = game
+        self.ticks = 0
+
+    def reset(self):
+        """Restart the clock at the beginning of a race"""
+        self.ticks = 0
+
+    def tick(self):
+        """Advance the clock by one simulation tick"""
+        self.ticks += 1
+
+    def get_time(self):
+        """Return the simulated race time in milliseconds (one tick is one frame at FPS)"""
+        return self.ticks * 1000 / FPS
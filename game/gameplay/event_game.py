@@ -1,5 +1,6 @@
 import pygame
 from constants.constants import *
+from gameplay.replay_game import REPLAY_SEEK_TICKS
 from data.player_data import add_player, delete_player, load_players, get_player_garage, update_player_garage, get_car_upgrades
 
 
@@ -79,6 +80,8 @@ class EventGame:
                         unbalanced_cars.append(car.name)
                 
                 if all_balanced and hasattr(self.game, 'race_button_enabled') and self.game.race_button_enabled:
+                    # The race needs the CPU more than the prediction
+                    self.game.stop_prediction()
                     self.game.state = STATE_RACING
                     self.game.message = "Race started!"
                     self.game.message_timer = 180
@@ -96,6 +99,13 @@ class EventGame:
                     self.game.message = "Returned to main menu"
                     self.game.message_timer = 180
             
+            # Check if the predict button was clicked
+            if hasattr(self.game, 'predict_button_rect') and self.game.predict_button_rect.collidepoint(event.pos):
+                if getattr(self.game, 'predict_button_enabled', False):
+                    self.game.start_prediction()
+                    self.game.message = "Predicting the race..."
+                    self.game.message_timer = 120
+            
             # Check if the manufacturer selection button was clicked
             if self.game.manufacturer_button_rect.collidepoint(event.pos):
                 self.game.state = STATE_MANUFACTURER_SELECTION
@@ -178,6 +188,16 @@ class EventGame:
     
     def _handle_key_press(self, event):
         """Handle keyboard events"""
+        # The replay has its own controls
+        if self.game.state == STATE_REPLAY:
+            self._handle_replay_key(event)
+            return
+        
+        # Watch the replay of the race that just ended
+        if event.key == pygame.K_r and self.game.state == STATE_RACE_END:
+            self.game.start_replay()
+            return
+        
         if event.key == pygame.K_SPACE:
             if self.game.state == STATE_RACING:
                 self.game.state = STATE_PAUSE
@@ -229,6 +249,25 @@ class EventGame:
         if event.key == pygame.K_RETURN and self.game.state == STATE_MANUFACTURER_SELECTION:
             self._handle_manufacturer_selection()
             
+        # Time acceleration - 1 to 4 pick the race speed, F runs the race to the flag
+        if pygame.K_1 <= event.key < pygame.K_1 + len(TIME_SCALES) and self.game.state == STATE_RACING:
+            time_scale = TIME_SCALES[event.key - pygame.K_1]
+            self.game.set_time_scale(time_scale)
+            self.game.message = f"Race speed {time_scale}x"
+            self.game.message_timer = 120
+            
+        if event.key == pygame.K_f and self.game.state == STATE_RACING:
+            if self.game.toggle_to_flag():
+                self.game.message = "Simulating to the flag..."
+            else:
+                self.game.message = f"Race speed {self.game.timestep_game.time_scale}x"
+            self.game.message_timer = 120
+            
+        # Frame time overlay
+        if event.key == pygame.K_F3 and self.game.state in (STATE_RACING, STATE_PAUSE):
+            self.game.message = "Frame times shown" if self.game.toggle_profiler() else "Frame times hidden"
+            self.game.message_timer = 120
+            
         # Engineer commands
         if event.key == pygame.K_p and self.game.state == STATE_RACING:
             selected_car = self.game.cars[self.game.selected_car_index]
@@ -236,6 +275,36 @@ class EventGame:
             self.game.message = response
             self.game.message_timer = 180
     
+    def _handle_replay_key(self, event):
+        """Handle keyboard events during replay playback"""
+        replay_game = self.game.replay_game
+        if event.key == pygame.K_ESCAPE:
+            self.game.stop_replay()
+        elif event.key == pygame.K_SPACE:
+            replay_game.toggle_playing()
+        elif event.key == pygame.K_LEFT:
+            # Seek back or forward a few seconds
+            replay_game.seek(replay_game.tick - REPLAY_SEEK_TICKS)
+        elif event.key == pygame.K_RIGHT:
+            replay_game.seek(replay_game.tick + REPLAY_SEEK_TICKS)
+        elif event.key == pygame.K_UP:
+            # Jump to the start of the previous or next lap
+            replay_game.seek_lap(replay_game.get_lap() + 1)
+        elif event.key == pygame.K_DOWN:
+            lap = replay_game.get_lap()
+            at_lap_start = replay_game.tick == replay_game.replay["header"]["lap_ticks"][lap - 1]
+            replay_game.seek_lap(lap - 1 if at_lap_start else lap)
+        elif pygame.K_1 <= event.key <= pygame.K_9:
+            # Number keys jump straight to a lap
+            replay_game.seek_lap(event.key - pygame.K_0)
+        elif event.key == pygame.K_HOME:
+            replay_game.seek(0)
+        elif event.key == pygame.K_TAB:
+            # Follow the next car
+            replay_game.follow_index = (replay_game.follow_index + 1) % len(replay_game.cars)
+        elif event.key == pygame.K_w:
+            self.game.show_waypoints = not self.game.show_waypoints
+    
     def _handle_left_arrow(self):
         """Handle left arrow key based on game state"""
         if self.game.state == STATE_MANUFACTURER_SELECTION:
@@ -0,0 +1,73 @@
+import itertools
+import math
+
+from cars import Car
+from cars.setup_car import SETUP_KEYS, enumerate_setups
+from data.lap_table_data import LAP_TABLE_UPGRADE_LEVELS, get_lap_table_path, load_lap_table
+
+UPGRADE_KEYS = ("engine", "tires", "aero")
+
+
+class LapTimeGame:
+    """Lap time component - instant lap time predictions from the table built by build_lap_table.py"""
+
+    def __init__(self, game):
+        self.game = game
+        # The table is memory mapped on first use, only the cells looked up are ever read
+        self.table = None
+        self.loaded = False
+        self.setup_index = {setup: idx for idx, setup in enumerate(enumerate_setups())}
+
+    def load(self):
+        """Map the lap time table of the track, once"""
+        if self.loaded:
+            return self.table
+        self.loaded = True
+
+        path = get_lap_table_path(self.game.track.csv_path)
+        self.table = load_lap_table(path)
+        if self.table is None:
+            print(f"No lap time table at {path} - build it with game/build_lap_table.py")
+        elif self.table.shape[:2] != (len(self.setup_index), len(Car.AVAILABLE_MANUFACTURERS)):
+            print(f"Lap time table at {path} doesn't match the setups and manufacturers, rebuild it")
+            self.table = None
+        return self.table
+
+    def get_lap_time(self, car, setup=None, manufacturer=None):
+        """Expected lap time and its standard deviation in seconds of a car, or None without a table"""
+        if self.load() is None:
+            return None
+
+        setup = car.setup if setup is None else setup
+        manufacturer = car.manufacturer if manufacturer is None else manufacturer
+        setup_idx = self.setup_index.get(tuple(int(round(setup[key])) for key in SETUP_KEYS))
+        if setup_idx is None or manufacturer not in Car.AVAILABLE_MANUFACTURERS:
+            return None
+        cells = self.table[setup_idx, Car.AVAILABLE_MANUFACTURERS.index(manufacturer)]
+
+        # Only engineer cars get their upgrades, levels between the tabled ones are interpolated
+        upgrades = self.game.car_upgrades.get(car.name, {}) if car.is_engineer_car else {}
+        lower = []
+        weights = []
+        for key in UPGRADE_KEYS:
+            level = min(max(upgrades.get(key, 0), LAP_TABLE_UPGRADE_LEVELS[0]), LAP_TABLE_UPGRADE_LEVELS[-1])
+            idx = 0
+            while idx < len(LAP_TABLE_UPGRADE_LEVELS) - 2 and level > LAP_TABLE_UPGRADE_LEVELS[idx + 1]:
+                idx += 1
+            lower.append(idx)
+            weights.append((level - LAP_TABLE_UPGRADE_LEVELS[idx]) /
+                           (LAP_TABLE_UPGRADE_LEVELS[idx + 1] - LAP_TABLE_UPGRADE_LEVELS[idx]))
+
+        mean = variance = 0.0
+        for corner in itertools.product((0, 1), repeat=len(UPGRADE_KEYS)):
+            weight = 1.0
+            for dim, step in enumerate(corner):
+                weight *= weights[dim] if step else 1 - weights[dim]
+            if weight:
+                cell = cells[tuple(lower[dim] + step for dim, step in enumerate(corner))]
+                mean += weight * float(cell[0])
+                variance += weight * float(cell[1])
+        # Parts of the table where no lap was ever finished
+        if math.isnan(mean):
+            return None
+        return mean, variance ** 0.5
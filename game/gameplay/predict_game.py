@@ -0,0 +1,144 @@
+import os
+import signal
+import sys
+from multiprocessing import Pool
+
+from constants.constants import *
+from tracks import Track
+
+# Races simulated per setup, and the longest race a prediction waits for
+PREDICT_RACES = 200
+PREDICT_MAX_TICKS = 10 * 60 * FPS
+# Worker processes racing predictions - one core is left for the game to keep drawing frames
+PREDICT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# Track the game races on, and the tracks of this worker process loaded by their first race
+TRACK_PATH = 'game/tracks/csv/track1_2.csv'
+_worker_tracks = {}
+
+
+def init_worker():
+    """Silence the race logging of a worker process, results come back through the pool"""
+    # A worker forked from the game inherits the SDL signal handlers, which would keep it alive when terminated
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    sys.stdout = open(os.devnull, 'w')
+
+
+def get_worker_track(track_path):
+    """Headless track of this worker process, loaded once"""
+    if track_path not in _worker_tracks:
+        _worker_tracks[track_path] = Track(track_path, headless=True)
+    return _worker_tracks[track_path]
+
+
+def run_prediction_race(field, car_upgrades, seed, track_path=TRACK_PATH):
+    """Run one headless race of a field and return the finishing order and the points it earned, or None"""
+    # Imported here to avoid a circular import with the gameplay package
+    from gameplay import Game
+
+    game = Game(None, headless=True, seed=seed, record_replay=False, track=get_worker_track(track_path),
+                field_size=len(field))
+    game.car_upgrades = {name: dict(upgrades) for name, upgrades in car_upgrades}
+    for car, (manufacturer, setup, skill_level, aggression) in zip(game.cars, field):
+        car.game = game
+        car.update_manufacturer(manufacturer)
+        car.setup = dict(setup)
+        car.skill_level = skill_level
+        car.aggression = aggression
+        car.update_performance_from_setup()
+
+    # Line up the way every race after the first one does, on the spawn slots with the seed's jitter
+    game.prepare_race(debug_mode=False)
+    game.reset_race()
+    results = game.simulate_race(PREDICT_MAX_TICKS)
+    # A race stopped at the tick limit has no result to count
+    if not results["finished"]:
+        return None
+    return {"positions": results["positions"], "points": game.last_race_points_earned}
+
+
+class PredictGame:
+    """Race prediction component - simulates the current field in background processes to rate a setup"""
+
+    def __init__(self, game):
+        self.game = game
+        self.pool = None
+        # Prediction of every setup tried, by fingerprint, and the races still running with their seeds
+        self.predictions = {}
+        self.pending = {}
+
+    def get_fingerprint(self):
+        """Everything a race outcome depends on - the whole field and the upgrades of the engineer cars"""
+        field = tuple((car.manufacturer, tuple(car.setup.items()), car.skill_level, car.aggression)
+                      for car in self.game.cars)
+        car_upgrades = tuple((car.name, tuple(sorted(self.game.car_upgrades.get(car.name, {}).items())))
+                             for car in self.game.cars if car.is_engineer_car)
+        return field, car_upgrades
+
+    def start(self):
+        """Queue the missing races of the current setup, cached ones are shown straight away"""
+        fingerprint = self.get_fingerprint()
+        prediction = self.predictions.setdefault(fingerprint, {
+            "races": 0, "points": 0, "wins": {}, "positions": {}, "seeds": set()
+        })
+
+        running = {seed for key, seed in self.pending.values() if key == fingerprint}
+        seeds = [seed for seed in range(PREDICT_RACES) if seed not in prediction["seeds"] and seed not in running]
+        if not seeds:
+            return prediction
+
+        if self.pool is None:
+            self.pool = Pool(PREDICT_WORKERS, initializer=init_worker)
+        # Every setup races the same seeds, so two predictions differ by the setup and not by luck
+        field, car_upgrades = fingerprint
+        for seed in seeds:
+            race = self.pool.apply_async(run_prediction_race, (field, car_upgrades, seed))
+            self.pending[race] = (fingerprint, seed)
+        return prediction
+
+    def update(self):
+        """Add the races that have finished since the last frame to their predictions"""
+        for race in [race for race in self.pending if race.ready()]:
+            fingerprint, seed = self.pending.pop(race)
+            try:
+                result = race.get()
+            except Exception as e:
+                print(f"Error predicting race: {e}")
+                continue
+
+            prediction = self.predictions[fingerprint]
+            prediction["seeds"].add(seed)
+            if result is None:
+                continue
+            prediction["races"] += 1
+            prediction["points"] += result["points"]
+            for position, name in enumerate(result["positions"], start=1):
+                prediction["positions"][name] = prediction["positions"].get(name, 0) + position
+            winner = result["positions"][0]
+            prediction["wins"][winner] = prediction["wins"].get(winner, 0) + 1
+
+    def get_prediction(self, car):
+        """Win probability, expected finishing position and expected team points of a car's current setup"""
+        fingerprint = self.get_fingerprint()
+        prediction = self.predictions.get(fingerprint)
+        if prediction is None:
+            return None
+
+        running = sum(1 for key, _ in self.pending.values() if key == fingerprint)
+        races = prediction["races"]
+        return {
+            "races": races,
+            "running": running,
+            "win_probability": prediction["wins"].get(car.name, 0) / races if races else 0.0,
+            "expected_position": prediction["positions"].get(car.name, 0) / races if races else 0.0,
+            "expected_points": prediction["points"] / races if races else 0.0
+        }
+
+    def cancel(self):
+        """Stop the worker processes without waiting for their races, e.g. to give the CPU back to a race"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+        # Unfinished races are queued again by the next start
+        self.pending = {}
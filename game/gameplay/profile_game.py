@@ -0,0 +1,55 @@
+import time
+from collections import deque
+
+from constants.constants import PROFILE_FRAMES, PROFILE_SECTIONS
+
+
+class ProfileGame:
+    """Frame time component - rolling timings of each part of a frame for the F3 overlay"""
+
+    def __init__(self, game):
+        self.game = game
+        self.show = False
+        # Milliseconds each section took in the last PROFILE_FRAMES frames, and the frame times themselves
+        self.sections = {name: deque(maxlen=PROFILE_FRAMES) for name in PROFILE_SECTIONS}
+        self.frame_times = deque(maxlen=PROFILE_FRAMES)
+        # Time spent in each section so far this frame
+        self.current = dict.fromkeys(PROFILE_SECTIONS, 0.0)
+
+    def toggle(self):
+        """Show or hide the frame time overlay"""
+        self.show = not self.show
+        return self.show
+
+    def record(self, section, start):
+        """Add the time since start (from time.perf_counter) to a section of this frame, returned in milliseconds"""
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.current[section] += elapsed_ms
+        return elapsed_ms
+
+    def end_frame(self, frame_ms):
+        """Close the frame - keep its section timings and how long the whole frame took"""
+        for name, elapsed_ms in self.current.items():
+            self.sections[name].append(elapsed_ms)
+            self.current[name] = 0.0
+        if frame_ms > 0:
+            self.frame_times.append(frame_ms)
+
+    def get_section_stats(self):
+        """Average and worst milliseconds of each section over the window, in frame order"""
+        stats = []
+        for name, samples in self.sections.items():
+            if samples:
+                stats.append((name, sum(samples) / len(samples), max(samples)))
+            else:
+                stats.append((name, 0.0, 0.0))
+        return stats
+
+    def get_frame_stats(self):
+        """Frames per second and the 1% low frame time (the slowest 1% of frames start there) over the window"""
+        if not self.frame_times:
+            return 0.0, 0.0
+        frame_times = sorted(self.frame_times)
+        fps = 1000 * len(frame_times) / sum(frame_times)
+        low_ms = frame_times[min(int(len(frame_times) * 0.99), len(frame_times) - 1)]
+        return fps, low_ms
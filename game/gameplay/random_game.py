@@ -0,0 +1,21 @@
+import random
+
+
+class RandomGame:
+    """Random number component - a seeded stream per car and per race, so a seed reproduces a race on either engine"""
+
+    def __init__(self, game, seed=None):
+        self.game = game
+        # Without a seed pick one, so any race can still be reproduced from game.random_game.seed
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.races = 0
+
+    def car_stream(self, index):
+        """Independent stream for everything decided about a car when it is created"""
+        return random.Random(f"{self.seed}-car-{index}")
+
+    def start_race(self):
+        """Give every car a fresh stream for the next race of this game"""
+        self.races += 1
+        for index, car in enumerate(self.game.cars):
+            car.rng = random.Random(f"{self.seed}-race-{self.races}-car-{index}")
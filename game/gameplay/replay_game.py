@@ -0,0 +1,238 @@
+import random
+
+import numpy as np
+
+from cars import Car
+from constants.constants import *
+from data.replay_data import save_replay
+from tracks.constants import LANES, LANE_INDEX
+
+# Recorded car fields and the fixed point scale they are stored at (x and y in 1/8 px, angle in 1/100 degree)
+REPLAY_FIELDS = ("x", "y", "angle", "speed", "lane", "waypoint", "laps")
+REPLAY_SCALES = (8, 8, 100, 100, 1, 1, 1)
+ANGLE_FIELD = REPLAY_FIELDS.index("angle")
+FULL_TURN = 360 * REPLAY_SCALES[ANGLE_FIELD]
+
+# A full keyframe every second, the ticks in between are stored as int16 deltas from the tick before
+KEYFRAME_INTERVAL = FPS
+
+# Seek step of the arrow keys during playback
+REPLAY_SEEK_TICKS = 5 * FPS
+
+
+class ReplayGame:
+    """Replay component - records races tick by tick and plays them back with seeking"""
+
+    def __init__(self, game):
+        self.game = game
+
+        # Recording of the current race
+        self.recording = False
+        self.scales = np.array(REPLAY_SCALES, dtype=float)
+        self.keyframes = []
+        self.deltas = None
+        self.frame = None
+        self.ticks = 0
+        self.lap_ticks = []
+        self.last_replay = None
+
+        # Playback
+        self.replay = None
+        self.cars = []
+        self.tick = 0
+        self.playing = False
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.follow_index = 0
+        self.return_state = STATE_START_SCREEN
+
+    ## Recording
+
+    def start_recording(self):
+        """Start an empty recording for the race about to begin"""
+        self.recording = self.game.record_replay
+        self.keyframes = []
+        self.deltas = np.zeros((KEYFRAME_INTERVAL * 60, len(self.game.cars), len(REPLAY_FIELDS)), dtype=np.int16)
+        self.frame = None
+        self.ticks = 0
+        # Tick at which the leader started each lap, to seek to a lap
+        self.lap_ticks = [0]
+
+    def record(self):
+        """Append the state of every car after this tick to the recording"""
+        if not self.recording:
+            return
+
+        values = np.array([(car.x, car.y, car.angle, car.speed, LANE_INDEX.get(car.current_lane, 0),
+                            car.current_waypoint, car.laps) for car in self.game.cars], dtype=float)
+        frame = np.rint(values * self.scales).astype(np.int64)
+        frame[:, ANGLE_FIELD] %= FULL_TURN
+
+        tick = self.ticks
+        if tick == len(self.deltas):
+            self.deltas = np.concatenate([self.deltas, np.zeros_like(self.deltas)])
+
+        if tick % KEYFRAME_INTERVAL == 0:
+            self.keyframes.append(frame.astype(np.int32))
+            self.frame = frame
+        else:
+            delta = frame - self.frame
+            # Angles take the short way round
+            delta[:, ANGLE_FIELD] = (delta[:, ANGLE_FIELD] + FULL_TURN // 2) % FULL_TURN - FULL_TURN // 2
+            # A jump too big for int16 is clipped, the error only lasts until the next keyframe
+            delta = np.clip(delta, -32768, 32767)
+            self.deltas[tick] = delta
+            # Track what playback will rebuild, so clipping never drifts
+            self.frame = self.frame + delta
+            self.frame[:, ANGLE_FIELD] %= FULL_TURN
+
+        leader_laps = int(frame[:, REPLAY_FIELDS.index("laps")].max())
+        while len(self.lap_ticks) <= leader_laps:
+            self.lap_ticks.append(tick)
+        self.ticks += 1
+
+    def finish_recording(self):
+        """Close the recording of the race, keep it for playback and save it unless headless"""
+        if not self.recording:
+            return self.last_replay
+        self.recording = False
+
+        self.last_replay = {
+            "header": {
+                "fps": FPS,
+                "ticks": self.ticks,
+                "keyframe_interval": KEYFRAME_INTERVAL,
+                "fields": REPLAY_FIELDS,
+                "scales": REPLAY_SCALES,
+                "lanes": LANES,
+                "cars": [{"name": car.name, "color": list(car.color), "manufacturer": car.manufacturer}
+                         for car in self.game.cars],
+                "lap_ticks": self.lap_ticks,
+                "max_laps": self.game.MAX_LAPS,
+                "seed": self.game.random_game.seed
+            },
+            "keyframes": np.array(self.keyframes, dtype=np.int32),
+            "deltas": self.deltas[:self.ticks].copy()
+        }
+
+        if not self.game.headless:
+            try:
+                path = save_replay(self.last_replay)
+                print(f"Replay saved to {path}")
+            except OSError as e:
+                print(f"Error saving replay: {e}")
+        return self.last_replay
+
+    ## Playback
+
+    def start_playback(self, replay=None):
+        """Switch to replay mode, by default for the last recorded race"""
+        replay = replay if replay is not None else self.last_replay
+        if replay is None or replay["header"]["ticks"] == 0:
+            self.game.message = "No replay recorded yet"
+            self.game.message_timer = 120
+            return False
+
+        self.replay = replay
+        header = replay["header"]
+
+        # Cars of their own, so a replay never touches the cars of the current race
+        self.cars = []
+        for car_data in header["cars"]:
+            car = Car(self.game.track, color=tuple(car_data["color"]), name=car_data["name"],
+                      manufacturer=car_data["manufacturer"], rng=random.Random(0))
+            if car.manufacturer != car_data["manufacturer"]:
+                car.update_manufacturer(car_data["manufacturer"])
+            self.cars.append(car)
+
+        self.follow_index = 0
+        self.accumulator = 0.0
+        self.playing = True
+        if self.game.state != STATE_REPLAY:
+            self.return_state = self.game.state
+        self.game.state = STATE_REPLAY
+        self.seek(0)
+        return True
+
+    def stop_playback(self):
+        """Leave replay mode and go back to where it was started from"""
+        self.playing = False
+        self.game.state = self.return_state
+
+    def decode(self, tick):
+        """Rebuild the recorded frame of a tick from the keyframe before it - independent of the race length"""
+        interval = self.replay["header"]["keyframe_interval"]
+        keyframe = tick // interval
+        frame = self.replay["keyframes"][keyframe].astype(np.int64)
+        frame += self.replay["deltas"][keyframe * interval + 1:tick + 1].sum(axis=0, dtype=np.int64)
+        frame[:, ANGLE_FIELD] %= FULL_TURN
+        return frame
+
+    def seek(self, tick):
+        """Show the replay at a tick"""
+        last_tick = self.replay["header"]["ticks"] - 1
+        self.tick = min(max(int(tick), 0), last_tick)
+        self.alpha = 0.0
+
+        # Cars are drawn between this tick and the next one
+        scales = np.array(self.replay["header"]["scales"], dtype=float)
+        lanes = self.replay["header"].get("lanes", LANES)
+        previous = (self.decode(self.tick) / scales).tolist()
+        current = (self.decode(min(self.tick + 1, last_tick)) / scales).tolist()
+        for car, before, after in zip(self.cars, previous, current):
+            car.prev_x, car.prev_y, car.prev_angle = before[0], before[1], before[2]
+            car.x, car.y, car.angle, car.speed = after[0], after[1], after[2], after[3]
+            car.current_lane = lanes[int(after[4])]
+            car.current_waypoint = int(after[5])
+            car.laps = int(after[6])
+
+    def seek_lap(self, lap):
+        """Jump to the start of a lap of the leader"""
+        lap_ticks = self.replay["header"]["lap_ticks"]
+        if 1 <= lap <= len(lap_ticks):
+            self.accumulator = 0.0
+            self.seek(lap_ticks[lap - 1])
+
+    def get_lap(self):
+        """Lap of the leader at the current tick"""
+        lap_ticks = self.replay["header"]["lap_ticks"]
+        lap = 1
+        while lap < len(lap_ticks) and lap_ticks[lap] <= self.tick:
+            lap += 1
+        return min(lap, self.replay["header"]["max_laps"])
+
+    def advance(self, frame_ms):
+        """Play the replay on by a rendered frame of frame_ms milliseconds"""
+        if not self.playing:
+            return
+        tick_ms = 1000 / self.replay["header"]["fps"]
+        self.accumulator += frame_ms
+        steps = int(self.accumulator // tick_ms)
+        if steps:
+            self.accumulator -= steps * tick_ms
+            self.seek(self.tick + steps)
+        if self.tick >= self.replay["header"]["ticks"] - 1:
+            # Hold the last frame
+            self.playing = False
+            self.accumulator = 0.0
+        self.alpha = self.accumulator / tick_ms
+
+    def toggle_playing(self):
+        """Pause or resume playback, from the start again once it has ended"""
+        if not self.playing and self.tick >= self.replay["header"]["ticks"] - 1:
+            self.seek(0)
+        self.playing = not self.playing
+        self.accumulator = 0.0
+
+    def get_positions(self):
+        """Indices of the replay cars in race order at the current tick"""
+        track = self.game.track
+        progress = [car.laps * track.lap_length + track.get_lap_progress(car.x, car.y, car.current_waypoint,
+                                                                         False, car.current_lane)
+                    for car in self.cars]
+        return sorted(range(len(self.cars)), key=lambda idx: progress[idx], reverse=True)
+
+    def get_camera(self):
+        """Camera position centered on the followed car"""
+        x, y, _ = self.cars[self.follow_index].get_render_pose(self.alpha)
+        return x - SCREEN_WIDTH // 2, y - SCREEN_HEIGHT // 2
@@ -0,0 +1,107 @@
+from constants.constants import *
+
+
+class SimulationGame:
+    """Headless simulation component for running races as fast as the CPU allows"""
+
+    def __init__(self, game):
+        self.game = game
+
+    def run_race(self, max_ticks=None):
+        """Step the race simulation until the race ends and return the results"""
+        # There is no customization screen when headless, so start racing straight away
+        self.game.state = STATE_RACING
+
+        ticks = 0
+        while self.game.state == STATE_RACING:
+            # Stop runaway races (e.g. every car stuck) after the tick budget
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            self.game.update()
+            ticks += 1
+
+        return self.get_results(ticks)
+
+    def get_results(self, ticks):
+        """Collect the finishing order and lap data of the last simulated race"""
+        positions = self.game.final_positions or self.game.race_positions or list(range(len(self.game.cars)))
+
+        cars = []
+        for position, car_idx in enumerate(positions):
+            car = self.game.cars[car_idx]
+            cars.append({
+                "name": car.name,
+                "manufacturer": car.manufacturer,
+                "position": position + 1,
+                "laps": car.laps,
+                "gap_to_leader": car.gap_to_leader,
+                "laps_down": car.laps_down,
+                "best_lap": car.best_lap,
+                "lap_times": list(car.lap_times)
+            })
+
+        return {
+            "seed": self.game.random_game.seed,
+            "finished": self.game.race_finished,
+            "ticks": ticks,
+            "positions": [car["name"] for car in cars],
+            "cars": cars
+        }
+
+
+def run_headless_race(max_ticks=None, vector_engine=False, seed=None, replay_path=None, field_size=FIELD_SIZE):
+    """Build a headless game, run one full race and return its results (the same seed gives the same race,
+    on either engine - compare_engines checks that)"""
+    # Imported here to avoid a circular import with the gameplay package
+    from gameplay import Game
+    from data.replay_data import save_replay
+
+    game = Game(None, headless=True, vector_engine=vector_engine, seed=seed, record_replay=replay_path is not None,
+                field_size=field_size)
+    game.prepare_race(debug_mode=False)
+    results = game.simulate_race(max_ticks)
+
+    # Races stopped at max_ticks never reach the finish, so close the recording here
+    if replay_path is not None:
+        save_replay(game.replay_game.finish_recording(), replay_path)
+    return results
+
+
+def get_car_state(car):
+    """What a car's driving has changed after a tick, for comparing the two engines"""
+    return (car.x, car.y, car.angle, car.speed, car.current_waypoint, car.current_lane, car.laps,
+            car.crashed, car.avoidance_counter, car.take_pit_road)
+
+
+def compare_engines(max_ticks=None, seed=None, field_size=FIELD_SIZE):
+    """Run one race on the scalar and the vector engine side by side and find the first tick they differ on"""
+    # Imported here to avoid a circular import with the gameplay package
+    from gameplay import Game
+
+    scalar_game = Game(None, headless=True, seed=seed, record_replay=False, field_size=field_size)
+    vector_game = Game(None, headless=True, vector_engine=True, seed=scalar_game.random_game.seed,
+                       record_replay=False, field_size=field_size)
+    # Batch every car, so the NumPy path is checked on small fields too
+    vector_game.vector_game.min_batch = 1
+    for game in (scalar_game, vector_game):
+        game.prepare_race(debug_mode=False)
+        game.state = STATE_RACING
+
+    # Every car has to end every tick in exactly the same state on both engines
+    ticks = 0
+    different_car = None
+    while scalar_game.state == STATE_RACING and (max_ticks is None or ticks < max_ticks):
+        scalar_game.update()
+        vector_game.update()
+        ticks += 1
+        different_car = next((scalar_car.name for scalar_car, vector_car in zip(scalar_game.cars, vector_game.cars)
+                              if get_car_state(scalar_car) != get_car_state(vector_car)), None)
+        if different_car is not None or vector_game.state != scalar_game.state:
+            break
+
+    return {
+        "seed": scalar_game.random_game.seed,
+        "ticks": ticks,
+        "same": different_car is None and vector_game.state == scalar_game.state,
+        "car": different_car
+    }
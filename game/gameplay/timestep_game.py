@@ -0,0 +1,127 @@
+import time
+
+from constants.constants import FPS, MAX_TICKS_PER_FRAME, STATE_RACING, FLAG_FRAME_BUDGET_MS
+
+
+# Weight of the newest measurement in the running tick and drawing cost estimates
+COST_SMOOTHING = 0.1
+
+
+class TimestepGame:
+    """Fixed timestep component - runs the race at FPS ticks per second whatever the frame rate"""
+
+    def __init__(self, game):
+        self.game = game
+        self.tick_ms = 1000 / FPS
+        # Frame time not yet simulated
+        self.accumulator = 0.0
+        # Where the drawn frame sits between the previous tick (0) and the latest one (1)
+        self.alpha = 1.0
+        
+        # Time acceleration, and running the race to the flag as fast as possible
+        self.time_scale = 1
+        self.to_flag = False
+        # Measured cost of a tick and of drawing the track, waypoints and overlay, in milliseconds
+        self.tick_cost_ms = 1.0
+        self.layers_ms = 0.0
+        # Whether this frame has no time left to draw the track, waypoints and overlay
+        self.skip_layers = False
+
+    def reset(self):
+        """Drop any pending frame time and draw the cars where they are"""
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.to_flag = False
+        self.skip_layers = False
+        self.save_poses()
+
+    def set_time_scale(self, time_scale):
+        """Run the race at a multiple of real time"""
+        self.time_scale = time_scale
+        self.to_flag = False
+
+    def toggle_to_flag(self):
+        """Start or stop simulating the rest of the race as fast as possible"""
+        self.to_flag = not self.to_flag
+        self.accumulator = 0.0
+        return self.to_flag
+
+    def advance(self, frame_ms):
+        """Run the ticks the elapsed frame time covers at the current time scale (possibly none) and return the count"""
+        if self.to_flag:
+            # As many ticks as fit in a frame, only the cars and the HUD are drawn
+            self.skip_layers = True
+            ticks = self.run_ticks(self.fit_ticks(FLAG_FRAME_BUDGET_MS))
+        else:
+            self.accumulator += frame_ms * self.time_scale
+            wanted = int(self.accumulator // self.tick_ms)
+            limit = MAX_TICKS_PER_FRAME * self.time_scale
+            if self.time_scale > 1:
+                # Drop the track, waypoints and overlay from frames where the ticks don't fit next to them
+                self.skip_layers = wanted * self.tick_cost_ms > self.tick_ms - self.layers_ms
+                budget = self.tick_ms if self.skip_layers else self.tick_ms - self.layers_ms
+                limit = min(limit, self.fit_ticks(budget))
+            else:
+                self.skip_layers = False
+            if wanted > limit:
+                # Too far behind (a stall, a slow machine or more speed than the budget allows) - drop the backlog
+                self.accumulator = self.accumulator % self.tick_ms + limit * self.tick_ms
+                wanted = limit
+            ticks = self.run_ticks(wanted)
+            self.accumulator -= ticks * self.tick_ms
+
+        # Messages last the same real time at any race speed, message_timer counts 60 Hz frames
+        if self.game.message_timer > 0:
+            self.game.message_timer = max(self.game.message_timer - frame_ms / self.tick_ms, 0)
+
+        # Nothing carries over into a pause or the end of the race
+        if self.game.state != STATE_RACING:
+            self.accumulator = 0.0
+            self.alpha = 1.0
+            self.to_flag = False
+            self.skip_layers = False
+        elif self.to_flag:
+            self.alpha = 1.0
+        else:
+            self.alpha = self.accumulator / self.tick_ms
+        return ticks
+
+    def fit_ticks(self, budget_ms):
+        """How many ticks fit in a time budget at the measured tick cost (always at least one)"""
+        return max(1, int(budget_ms / self.tick_cost_ms))
+
+    def run_ticks(self, count):
+        """Run up to count ticks while the race lasts and measure what a tick costs"""
+        start = time.perf_counter()
+        ticks = 0
+        while ticks < count and self.game.state == STATE_RACING:
+            # Only the last tick of the frame is interpolated
+            if ticks == count - 1:
+                self.save_poses()
+            self.game.update()
+            ticks += 1
+        
+        if ticks:
+            cost = (time.perf_counter() - start) * 1000 / ticks
+            self.tick_cost_ms += (cost - self.tick_cost_ms) * COST_SMOOTHING
+        return ticks
+
+    def record_layers_time(self, layers_ms):
+        """Measured time of drawing the track, waypoints and position overlay in a frame"""
+        self.layers_ms += (layers_ms - self.layers_ms) * COST_SMOOTHING
+
+    def save_poses(self):
+        """Remember where every car and the camera were before the tick, to draw in between"""
+        for car in self.game.cars:
+            car.prev_x = car.x
+            car.prev_y = car.y
+            car.prev_angle = car.angle
+        self.game.prev_camera_x = self.game.camera_x
+        self.game.prev_camera_y = self.game.camera_y
+
+    def get_camera(self):
+        """Return the camera position interpolated between the last two ticks"""
+        alpha = self.alpha
+        camera_x = self.game.prev_camera_x + (self.game.camera_x - self.game.prev_camera_x) * alpha
+        camera_y = self.game.prev_camera_y + (self.game.camera_y - self.game.prev_camera_y) * alpha
+        return camera_x, camera_y
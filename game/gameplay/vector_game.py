@@ -0,0 +1,299 @@
+import math
+
+import numpy as np
+
+from cars.position_car import NEARBY_DISTANCE
+from tracks.constants import CURRENT_TURN_FACTORS, NEXT_TURN_FACTORS, WALL_FIELD_CELL
+
+# Packing fewer cars than this into arrays costs more than driving them one at a time
+MIN_VECTOR_BATCH = 32
+# Slack in pixels for rounding, when predicting where a car gets to
+ROUNDING = 1e-6
+
+
+def select_turn_factors(turn_angles, turn_factors):
+    """Batched get_turn_factor - the corner speed factor for each turn angle"""
+    return np.select([turn_angles > threshold for threshold, factor in turn_factors],
+                     [factor for threshold, factor in turn_factors], 1.0)
+
+
+def atan2_degrees(y, x):
+    """Batched math.degrees(math.atan2(y, x)) - np.arctan2 can round the last bit differently from math.atan2,
+    and a race is chaotic enough for that to change its result"""
+    return np.degrees(np.array(list(map(math.atan2, y.tolist(), x.tolist())), dtype=float))
+
+
+class VectorGame:
+    """Vectorized race engine component - drives the field in batches on NumPy arrays"""
+
+    def __init__(self, game):
+        self.game = game
+        self.cars = None
+        # Smallest batch driven on arrays - comparing the engines lowers it to check the NumPy path on small fields
+        self.min_batch = MIN_VECTOR_BATCH
+
+    def load(self):
+        """Pack the setup-derived car factors into arrays"""
+        self.cars = list(self.game.cars)
+
+        # Setup values only change between races, so derive every per-car factor once
+        setup = {key: np.array([car.setup[key] for car in self.cars], dtype=float)
+                 for key in ("Engine", "Tires", "Aerodynamics", "Handling", "Brakes")}
+        engineer = np.array([car.is_engineer_car for car in self.cars], dtype=bool)
+        skill = np.array([car.skill_level for car in self.cars], dtype=float)
+        aggression = np.array([car.aggression for car in self.cars], dtype=float)
+        detection = np.array([car.waypoint_detection_multiplier for car in self.cars], dtype=float)
+        turn_speed = np.array([car.turn_speed for car in self.cars], dtype=float)
+
+        # Same formulas as PositionCar.update
+        handling_effect = 0.8 + (setup["Handling"] / 10) * 0.4
+        tire_effect = 0.8 + (setup["Tires"] / 10) * 0.4
+        steering_factor = skill * ((handling_effect * 0.6) + (tire_effect * 0.4))
+        steering_factor = np.where(engineer, steering_factor * 1.1, steering_factor)
+        self.max_turn = turn_speed * steering_factor
+
+        waypoint_threshold = 45 * detection * (1.1 - (handling_effect - 0.8) * 0.5)
+        self.waypoint_threshold = np.where(engineer, waypoint_threshold * 0.9, waypoint_threshold)
+
+        tire_corner_bonus = (setup["Tires"] - 5) * 0.015
+        handling_corner_bonus = (setup["Handling"] - 5) * 0.01
+        self.aero_corner_bonus = (setup["Aerodynamics"] - 5) * 0.008
+        self.corner_bonus = tire_corner_bonus + handling_corner_bonus
+        self.next_corner_bonus = tire_corner_bonus * 0.5 + handling_corner_bonus * 0.5
+
+        # How far past its move a car's wall sweeps reach
+        self.collision_reach = np.array([car.collision_car.get_collision_reach() for car in self.cars], dtype=float)
+
+        self.max_speed = np.array([car.max_speed for car in self.cars], dtype=float)
+        self.acceleration = np.array([car.acceleration for car in self.cars], dtype=float)
+        self.aggression_factor = np.where(engineer, aggression + 0.1, aggression)
+        self.push_boost = 1.35 + (setup["Engine"] - 5) * 0.01
+
+        engine_accel_bonus = (setup["Engine"] - 5) * 0.04
+        engineer_bonus = np.where(engineer, 1.1, 1.0)
+        self.accel_factor = (1.0 + engine_accel_bonus) * engineer_bonus
+        self.push_accel_factor = (1.8 + engine_accel_bonus) * engineer_bonus
+        self.brake_factor = (2.0 + (setup["Brakes"] - 5) * 0.08) * engineer_bonus
+
+        # Bounds on a tick for the scalar lane choice pass: how much a car can speed up, slow down and turn,
+        # and how close it gets to its waypoint before moving on
+        self.speed_gain = (self.acceleration * np.maximum(self.accel_factor, self.push_accel_factor)).tolist()
+        self.speed_loss = (self.acceleration * self.brake_factor).tolist()
+        self.turn_limit = np.radians(self.max_turn).tolist()
+        self.sweep_reach = self.collision_reach.tolist()
+        self.advance_distance = self.waypoint_threshold.tolist()
+
+    def predict_move(self, car, row, dt):
+        """Where a car will be after this tick, and how far from there it can end up"""
+        speed_low = max(car.speed - self.speed_loss[row] * dt, 0)
+        speed_high = car.speed + self.speed_gain[row] * dt
+
+        # A crash stops the car anywhere along its way, so next to a wall all that is known is how far it gets
+        clearance = self.game.track.get_wall_field(car.x, car.y)[0]
+        if clearance <= speed_high * dt + self.sweep_reach[row] + WALL_FIELD_CELL:
+            return car.x, car.y, speed_high * dt + ROUNDING
+
+        # Otherwise it goes straight ahead at the middle speed, give or take the speed range and the turn
+        radians = math.radians(car.angle)
+        distance = (speed_low + speed_high) / 2 * dt
+        error = (speed_high - speed_low) / 2 * dt + speed_high * dt * self.turn_limit[row] * dt + ROUNDING
+        return car.x + math.cos(radians) * distance, car.y + math.sin(radians) * distance, error
+
+    def drive_seen_cars(self, car, waiting, dt):
+        """Drive the waiting cars whose move could change what a car's lane choice sees, before it looks"""
+        for bucket in self.game.spatial_hash.buckets(car.x, car.y, NEARBY_DISTANCE):
+            for index, other in bucket:
+                entry = waiting.get(index)
+                if entry is None:
+                    continue
+                # Lane choice looks at which cars are nearby and at their waypoints - a waiting car that
+                # stays out of range, or stays in range on the same waypoint, looks the same after its move
+                route, end_x, end_y, error, advancing = entry
+                nearby_now = ((other.x - car.x)**2 + (other.y - car.y)**2)**0.5 < NEARBY_DISTANCE
+                distance = math.hypot(end_x - car.x, end_y - car.y)
+                if distance + error < NEARBY_DISTANCE:
+                    if nearby_now and not advancing:
+                        continue
+                elif distance - error >= NEARBY_DISTANCE:
+                    if not nearby_now:
+                        continue
+                del waiting[index]
+                other.position_car.drive(dt, route)
+
+    def check_obstacles(self, cars):
+        """Batched PositionCar.check_obstacles - one wall field lookup for every car due a check"""
+        current_time = self.game.clock_game.get_time()
+        due = [car for car in cars if current_time - car.last_obstacle_check > car.obstacle_check_interval]
+        if not due:
+            return
+
+        # Look further ahead when moving faster
+        speed = np.array([car.speed for car in due], dtype=float)
+        radians = np.radians(np.array([car.angle for car in due], dtype=float))
+        look_ahead_distance = 20 + speed * 5
+        look_x = np.array([car.x for car in due], dtype=float) + np.cos(radians) * look_ahead_distance
+        look_y = np.array([car.y for car in due], dtype=float) + np.sin(radians) * look_ahead_distance
+
+        clearance, escape_x, escape_y = self.game.track.get_wall_field_batch(look_x, look_y)
+        for car, car_clearance, car_escape_x, car_escape_y in zip(
+                due, clearance.tolist(), escape_x.tolist(), escape_y.tolist()):
+            car.last_obstacle_check = current_time
+            car.position_car.avoid_walls(car_clearance, car_escape_x, car_escape_y)
+
+    def check_collisions(self, cars, rows, prev_x, prev_y, x, y, dt):
+        """Batched CollisionCar.check_collision - only cars that could reach a wall this tick sweep their move"""
+        # Cars in their grace period after a crash skip the check
+        grace = np.array([car.recovery_grace_period > 0 for car in cars], dtype=bool)
+        for row in np.flatnonzero(grace):
+            cars[row].recovery_grace_period -= dt
+
+        # The sweeps run from the previous position to the new one and a little past it
+        reach = np.hypot(x - prev_x, y - prev_y) + self.collision_reach[rows]
+
+        # A car with more clearance than its reach can't hit anything (one field cell covers the sampling error),
+        # CollisionCar.check_collision skips the same cars
+        clearance, _, _ = self.game.track.get_wall_field_batch(prev_x, prev_y)
+        near = ~grace & (clearance <= reach + WALL_FIELD_CELL + ROUNDING)
+        for row, start_x, start_y in zip(np.flatnonzero(near).tolist(), prev_x[near].tolist(), prev_y[near].tolist()):
+            cars[row].check_collision((start_x, start_y), dt)
+
+    def update(self, dt):
+        """Advance every car by one tick, in the same order and with the same results as the per-car path"""
+        # Rebuild the factor arrays at the start of each race (setups may have changed in the garage)
+        if self.cars is None or self.game.clock_game.ticks <= 1 or len(self.cars) != len(self.game.cars):
+            self.load()
+
+        # Branchy per-car bookkeeping stays scalar and runs in car order: timers, recovery, pit road and lanes.
+        # Driving only depends on the car itself, so the cars wait to be driven together at the end - unless a
+        # later car's lane choice could see one move, then that car is driven first, as the per-car path does
+        waiting = {}
+        for row, car in enumerate(self.cars):
+            if not car.position_car.update_state(dt, choose_lane=False):
+                continue
+            if car.lane_switch_cooldown <= 0 and waiting:
+                self.drive_seen_cars(car, waiting, dt)
+            car.position_car.choose_lane()
+
+            # The pit road flag is shared by the field, so the route is taken now, as the per-car path does
+            route = self.game.track.get_route(car.take_pit_road, car.current_lane)
+
+            # Where the car will get to this tick, and whether it will move on to its next waypoint
+            end_x, end_y, error = self.predict_move(car, row, dt)
+            target_x, target_y = self.game.track.waypoint_routes[route][car.current_waypoint]
+            advancing = (car.waypoint_cooldown <= 0 and
+                         math.hypot(target_x - car.x, target_y - car.y) < self.advance_distance[row] + ROUNDING)
+            waiting[row] = (route, end_x, end_y, error, advancing)
+
+        if waiting:
+            rows = list(waiting)
+            self.move([self.cars[row] for row in rows], rows, [waiting[row][0] for row in rows], dt)
+
+    def move(self, cars, rows, routes, dt):
+        """Steer, accelerate and move a batch of cars whose state is up to date"""
+        # Small batches are driven one car at a time
+        if len(cars) < self.min_batch:
+            for car, route in zip(cars, routes):
+                car.position_car.drive(dt, route)
+            return
+
+        rows = np.array(rows)
+        route = np.array(routes)
+
+        # Improved obstacle detection and avoidance
+        self.check_obstacles(cars)
+
+        # Gather the dynamic state of the cars that are driving
+        x = np.array([car.x for car in cars], dtype=float)
+        y = np.array([car.y for car in cars], dtype=float)
+        angle = np.array([car.angle for car in cars], dtype=float)
+        speed = np.array([car.speed for car in cars], dtype=float)
+        waypoint = np.array([car.current_waypoint for car in cars], dtype=int)
+        push = np.array([car.push_mode for car in cars], dtype=bool)
+        avoidance_counter = np.array([car.avoidance_counter for car in cars])
+        avoidance_angle = np.array([car.avoidance_angle for car in cars], dtype=float)
+        cooldown = np.array([car.waypoint_cooldown for car in cars])
+
+        # Steer towards the target waypoint, or away from an obstacle while avoiding
+        waypoint_table = self.game.track.waypoint_table
+        target = waypoint_table[route, waypoint]
+        dx = target[:, 0] - x
+        dy = target[:, 1] - y
+        target_angle = atan2_degrees(dy, dx)
+
+        avoiding = avoidance_counter > 0
+        target_angle = np.where(avoiding, (angle + avoidance_angle) % 360, target_angle)
+        avoidance_counter = avoidance_counter - avoiding * dt
+
+        angle_diff = (target_angle - angle) % 360
+        angle_diff = np.where(angle_diff > 180, angle_diff - 360, angle_diff)
+        turn_amount = np.minimum(np.abs(angle_diff), self.max_turn[rows] * dt) * np.where(angle_diff > 0, 1.0, -1.0)
+        angle = (angle + turn_amount) % 360
+
+        # Waypoint transitions (and lap timing) are rare, so hand them back to the cars
+        distance_to_waypoint = np.sqrt(dx**2 + dy**2)
+        reached = (distance_to_waypoint < self.waypoint_threshold[rows]) & (cooldown <= 0)
+        for row in np.flatnonzero(reached):
+            cars[row].position_car.advance_waypoint()
+            waypoint[row] = cars[row].current_waypoint
+
+        # Look ahead with the precomputed corner profile of each car's route
+        total_waypoints = waypoint_table.shape[1]
+        corner = self.game.track.corner_table[route, waypoint]
+        next_angle = corner[:, 0]
+        next_turn_angle = corner[:, 1]
+        next_turn_factor = corner[:, 2]
+
+        # Cars that just moved on: the coming leg starts from the waypoint they were targeting
+        moved = np.flatnonzero(reached)
+        if len(moved):
+            following = (waypoint[moved] + 1) % total_waypoints
+            next_wp = waypoint_table[route[moved], following]
+            next_angle[moved] = atan2_degrees(next_wp[:, 1] - target[moved, 1], next_wp[:, 0] - target[moved, 0])
+            next2_angle = self.game.track.corner_table[route[moved], following, 0]
+            next_turn_angle[moved] = np.abs((next2_angle - next_angle[moved] + 180) % 360 - 180)
+            next_turn_factor[moved] = select_turn_factors(next_turn_angle[moved], NEXT_TURN_FACTORS)
+
+        turn_angle = np.abs((next_angle - target_angle + 180) % 360 - 180)
+        current_turn_factor = select_turn_factors(turn_angle, CURRENT_TURN_FACTORS)
+
+        # Setup bonuses in real corners, aero only at high speed
+        fast = speed > self.max_speed[rows] * 0.7
+        cornering = turn_angle > 30
+        next_cornering = next_turn_angle > 30
+        current_turn_factor = current_turn_factor + np.where(cornering, self.corner_bonus[rows], 0.0)
+        current_turn_factor = current_turn_factor + np.where(cornering & fast, self.aero_corner_bonus[rows], 0.0)
+        next_turn_factor = next_turn_factor + np.where(next_cornering, self.next_corner_bonus[rows], 0.0)
+        next_turn_factor = next_turn_factor + np.where(next_cornering & fast, self.aero_corner_bonus[rows] * 0.5, 0.0)
+
+        current_turn_factor = np.clip(current_turn_factor, 0.3, 1.0)
+        next_turn_factor = np.clip(next_turn_factor, 0.5, 1.0)
+        combined_turn_factor = np.minimum(current_turn_factor, next_turn_factor * 1.2)
+
+        target_speed = self.max_speed[rows] * (combined_turn_factor * self.aggression_factor[rows])
+        target_speed = np.where(push, target_speed * self.push_boost[rows], target_speed)
+
+        # Accelerate or brake towards the target speed
+        acceleration = self.acceleration[rows]
+        accel_factor = np.where(push, self.push_accel_factor[rows], self.accel_factor[rows])
+        accelerated = np.minimum(speed + acceleration * accel_factor * dt, target_speed)
+        braked = np.maximum(speed - acceleration * self.brake_factor[rows] * dt, target_speed)
+        speed = np.where(speed < target_speed, accelerated, braked)
+
+        # Move
+        prev_x = x.copy()
+        prev_y = y.copy()
+        radians = np.radians(angle)
+        x += np.cos(radians) * speed * dt
+        y += np.sin(radians) * speed * dt
+
+        # Scatter the state back to the cars
+        for car, car_x, car_y, car_angle, car_speed, counter in zip(
+                cars, x.tolist(), y.tolist(), angle.tolist(), speed.tolist(), avoidance_counter.tolist()):
+            car.x = car_x
+            car.y = car_y
+            car.angle = car_angle
+            car.speed = car_speed
+            car.avoidance_counter = counter
+
+        # Check for collision with walls along the way
+        self.check_collisions(cars, rows, prev_x, prev_y, x, y, dt)
@@ -1,15 +1,82 @@
+import argparse
 import pygame
 import sys
-import math
+import time
 from constants.constants import *
 from gameplay import Game
 from ui import UI  # This now uses our controller UI class
+from data.replay_data import load_replay
 from animation.animation import Animation
 
 # Global UI instance that will be accessible to other modules
 global_ui = None
 
+def draw_race(screen, game):
+    """Render the current race state - the simulation itself never draws"""
+    # Draw in between the last two simulation ticks so motion stays smooth at any frame rate
+    timestep_game = game.timestep_game
+    profile_game = game.profile_game
+    alpha = timestep_game.alpha
+    camera_x, camera_y = timestep_game.get_camera()
+    
+    # At high race speeds the track, waypoints and overlay are left out of frames that have no time for them
+    skip_layers = timestep_game.skip_layers
+    layers_ms = 0.0
+    
+    if not skip_layers:
+        # Draw the track
+        start = time.perf_counter()
+        game.track.draw(screen, camera_x, camera_y)
+        layers_ms += profile_game.record("track", start)
+        
+        # Draw waypoints if enabled
+        if game.show_waypoints:
+            start = time.perf_counter()
+            game.track.draw_waypoints(screen, camera_x, camera_y)
+            layers_ms += profile_game.record("waypoints", start)
+    
+    # Draw all cars
+    start = time.perf_counter()
+    for car in game.cars:
+        car.draw(screen, camera_x, camera_y, alpha)
+    profile_game.record("cars", start)
+    
+    # Draw UI components
+    start = time.perf_counter()
+    global_ui.draw_ui(game)
+    profile_game.record("ui", start)
+    if not skip_layers:
+        start = time.perf_counter()
+        global_ui.draw_position_overlay(game)
+        layers_ms += profile_game.record("overlay", start)
+        timestep_game.record_layers_time(layers_ms)
+    
+    # The frame time overlay goes on top of everything and is left out of its own timings
+    if profile_game.show:
+        global_ui.draw_profiler(game)
+
+def draw_replay(screen, game):
+    """Render a recorded race with the same track and car drawing as a live race"""
+    replay_game = game.replay_game
+    camera_x, camera_y = replay_game.get_camera()
+    
+    game.track.draw(screen, camera_x, camera_y)
+    if game.show_waypoints:
+        game.track.draw_waypoints(screen, camera_x, camera_y)
+    for car in replay_game.cars:
+        car.draw(screen, camera_x, camera_y, replay_game.alpha)
+    
+    global_ui.draw_replay(game)
+
 def main():
+    parser = argparse.ArgumentParser(description="TopRacer - Racing Management Game")
+    parser.add_argument("replay", nargs="?", default=None, help="replay file to open straight into playback")
+    parser.add_argument("--cars", type=int, default=FIELD_SIZE,
+                        help=f"cars in a race, {MIN_FIELD_SIZE} to {MAX_FIELD_SIZE}")
+    args = parser.parse_args()
+    if not MIN_FIELD_SIZE <= args.cars <= MAX_FIELD_SIZE:
+        parser.error(f"--cars must be between {MIN_FIELD_SIZE} and {MAX_FIELD_SIZE}")
+    
     # Initialize pygame
     pygame.init()
     
@@ -28,7 +95,7 @@ def main():
     clock = pygame.time.Clock()
     
     # Initialize game components
-    game = Game(screen)
+    game = Game(screen, field_size=args.cars)
     
     # Initialize global UI
     global global_ui
@@ -50,68 +117,8 @@ def main():
     # Enable debug visualization for the track
     game.track.debug_collisions = []
     
-    # Configure car parameters to be more forgiving
-    for car in game.cars:
-        car.game = game
-        # Make waypoint detection more forgiving
-        car.waypoint_detection_multiplier = 1.5  # Larger radius to detect waypoints
-        car.stuck_threshold = 40  # More sensitive stuck detection (was 60)
-        # Enable debug logging for this car
-        car.debug_mode = True
-        # Add recovery grace period
-        car.recovery_grace_period = 0
-        # Make the car smaller for collision detection
-        car.width = 12  # Reduced from 14
-        car.height = 6  # Reduced from 7
-        
-        # Update car performance to reflect loaded upgrade levels
-        if car.is_engineer_car and hasattr(game, 'engine_upgrade_level'):
-            car.update_performance_from_setup()
-    
-    # Reset race positions and make cars start at the beginning
-    game.reset_race()
-    
-    # Ensure cars start at spawn points with enough space between them
-    spacing = 30  # Increased from 20 to give more room
-    for i, car in enumerate(game.cars):
-        # Get the start position from the track
-        start_x, start_y = game.track.get_start_position()
-        
-        # Set cars to start at the spawn position
-        car.x, car.y = start_x, start_y
-        
-        # Add offset based on car index to avoid collision at start
-        offset_angle = (i * 45) % 360  # Spread cars in different directions
-        offset_distance = spacing * ((i // 4) + 1)  # Increase distance for more cars
-        
-        # Calculate offset position
-        radians = math.radians(offset_angle)
-        car.x += math.cos(radians) * offset_distance
-        car.y += math.sin(radians) * offset_distance
-        
-        # Set current waypoint to 0 and face toward it
-        car.current_waypoint = 0
-        car.initialize_car_direction()
-        
-        # Make sure cars start with zero speed and no avoidance behavior
-        car.speed = 0
-        if hasattr(car, 'avoidance_counter'):
-            car.avoidance_counter = 0
-            
-        # Distribute cars across different lanes to avoid overlapping at start
-        # Assign each car to a different lane based on their position in the race
-        if i % 3 == 0:
-            car.current_lane = 'center'
-            car.preferred_lane = 'center'
-        elif i % 3 == 1:
-            car.current_lane = 'left'
-            car.preferred_lane = 'left'
-        else:
-            car.current_lane = 'right'
-            car.preferred_lane = 'right'
-            
-        if car.debug_mode:
-            print(f"{car.name} assigned to {car.current_lane} lane")
+    # Configure the cars and place them on the starting grid
+    game.prepare_race()
     
     # Always enable waypoint visualization to see the lane system
     game.show_waypoints = True
@@ -119,10 +126,19 @@ def main():
     # Add keybinding for toggling collision debug visualization
     collision_debug = False
     
+    # A replay file on the command line opens straight into playback
+    if args.replay is not None:
+        try:
+            game.start_replay(load_replay(args.replay))
+        except (OSError, ValueError) as e:
+            print(f"Error loading replay: {e}")
+    
     try:
         # Main game loop
+        frame_ms = 0
         while game.running:
             # Collect all events once
+            start = time.perf_counter()
             events = pygame.event.get()
             
             # Process events locally first for direct controls
@@ -135,18 +151,28 @@ def main():
                         collision_debug = not collision_debug
                         game.track.debug_collisions = [] if collision_debug else None
                     
-                    # Handle other keys that need to be processed immediately
-                    if event.key == pygame.K_ESCAPE:
+                    # Handle other keys that need to be processed immediately - in a replay ESC leaves the replay
+                    if event.key == pygame.K_ESCAPE and game.state != STATE_REPLAY:
                         game.running = False
             
             # Send events to the game for handling game-specific logic
             game.process_events(events)
+            game.profile_game.record("events", start)
             
-            # Update game state based on current game state
+            # Update game state based on current game state - the race runs at a fixed FPS ticks per second
             if game.state == STATE_RACING:
-                game.update()
+                start = time.perf_counter()
+                game.advance(frame_ms)
+                game.profile_game.record("update", start)
+            elif game.state == STATE_REPLAY:
+                game.replay_game.advance(frame_ms)
+            elif game.state == STATE_CUSTOMIZATION:
+                game.update_prediction()
             elif game.state == STATE_START_SCREEN:
-                animation.update_start_screen_animation()
+                # Menu animations are tuned for 60 FPS, so they step by the frame time in 60 Hz frames
+                animation.update_start_screen_animation(frame_ms / (1000 / FPS))
+            elif game.state == STATE_MANUFACTURER_SELECTION:
+                global_ui.update_manufacturer_selection(frame_ms / (1000 / FPS))
             
             # Clear screen
             screen.fill(BLACK)
@@ -160,27 +186,19 @@ def main():
                 global_ui.draw_race_end_screen(game, animation)
             elif game.state == STATE_MANUFACTURER_SELECTION:
                 global_ui.draw_manufacturer_selection(game)
+            elif game.state == STATE_REPLAY:
+                draw_replay(screen, game)
             else:
-                # Draw the track
-                game.track.draw(screen, game.camera_x, game.camera_y)
-                
-                # Draw waypoints if enabled
-                if game.show_waypoints:
-                    game.track.draw_waypoints(screen, game.camera_x, game.camera_y)
-                
-                # Draw all cars
-                for i, car in enumerate(game.cars):
-                    car.draw(screen, game.camera_x, game.camera_y)
-                
-                # Draw UI components
-                global_ui.draw_ui(game)
-                global_ui.draw_position_overlay(game)
+                draw_race(screen, game)
             
             # Update the display
+            start = time.perf_counter()
             pygame.display.flip()
+            game.profile_game.record("flip", start)
             
-            # Cap the frame rate
-            clock.tick(FPS)
+            # Cap the frame rate and measure the frame for the next simulation step
+            frame_ms = clock.tick(RENDER_FPS)
+            game.profile_game.end_frame(frame_ms)
         
         # Save player data when exiting normally
         game.save_current_player_stats()
@@ -193,6 +211,8 @@ def main():
             game.save_current_player_stats()
         except:
             pass
+        # Don't wait for prediction races on the way out
+        game.stop_prediction()
         pygame.quit()
         sys.exit()
 
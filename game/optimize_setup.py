@@ -0,0 +1,136 @@
+import argparse
+import random
+import time
+from multiprocessing import Pool
+
+from cars import Car
+from cars.setup_car import SETUP_KEYS, enumerate_setups
+from data.player_data import update_player_garage
+from data.simulation_data import get_simulation_key, load_simulations, save_simulations
+from gameplay import Game
+from gameplay.predict_game import TRACK_PATH, init_worker, run_prediction_race
+
+# Save the simulated races every so often, so an interrupted search keeps most of its work
+SAVE_INTERVAL = 50
+
+
+def run_simulation(job):
+    """Worker side of a job - simulate the race and hand it back with its key"""
+    key, field, car_upgrades, seed, track_path = job
+    return key, run_prediction_race(field, car_upgrades, seed, track_path)
+
+
+class SetupOptimizer:
+    """Successive halving over setups of one car, every race simulated in parallel and memoized on disk"""
+
+    def __init__(self, pool, track_path, field, car_upgrades, car_index, car_name):
+        self.pool = pool
+        self.track_path = track_path
+        self.field = field
+        self.car_upgrades = car_upgrades
+        self.car_index = car_index
+        self.car_name = car_name
+        self.simulations = load_simulations()
+
+    def get_field(self, setup):
+        """The field with the optimized car on a setup"""
+        manufacturer, _, skill_level, aggression = self.field[self.car_index]
+        car = (manufacturer, tuple(zip(SETUP_KEYS, setup)), skill_level, aggression)
+        return self.field[:self.car_index] + (car,) + self.field[self.car_index + 1:]
+
+    def evaluate(self, setups, races):
+        """Average finishing position of each setup over its first races seeds, simulating only what's missing"""
+        keys = {}
+        jobs = []
+        for setup in setups:
+            field = self.get_field(setup)
+            keys[setup] = [get_simulation_key(self.track_path, field, self.car_upgrades, seed) for seed in range(races)]
+            jobs += [(key, field, self.car_upgrades, seed, self.track_path)
+                     for seed, key in enumerate(keys[setup]) if key not in self.simulations]
+
+        for done, (key, result) in enumerate(self.pool.imap_unordered(run_simulation, jobs), start=1):
+            self.simulations[key] = result
+            if done % SAVE_INTERVAL == 0:
+                save_simulations(self.simulations)
+        if jobs:
+            save_simulations(self.simulations)
+
+        scores = {}
+        for setup in setups:
+            positions = []
+            for key in keys[setup]:
+                result = self.simulations[key]
+                # A race that never finished counts as last place
+                positions.append(result["positions"].index(self.car_name) + 1 if result else len(self.field))
+            scores[setup] = sum(positions) / len(positions)
+        return scores, len(jobs)
+
+    def run(self, candidates, min_races, max_races, eta):
+        """Race the candidates, keep the best 1/eta with eta times the races, until one setup is left"""
+        races = min_races
+        while True:
+            start_time = time.perf_counter()
+            scores, simulated = self.evaluate(candidates, races)
+            # Stable sort, so ties keep the enumeration order and the search is reproducible
+            candidates = sorted(candidates, key=lambda setup: scores[setup])
+            elapsed = time.perf_counter() - start_time
+            print(f"{len(candidates)} setups x {races} races ({simulated} simulated in {elapsed:.1f}s), "
+                  f"best: {format_setup(candidates[0])} at {scores[candidates[0]]:.2f}")
+
+            if len(candidates) == 1:
+                return candidates[0], scores[candidates[0]], races
+            candidates = candidates[:max(1, len(candidates) // eta)]
+            races = min(races * eta, max_races)
+
+
+def format_setup(setup):
+    """Setup values with their names"""
+    return ", ".join(f"{key} {value}" for key, value in zip(SETUP_KEYS, setup))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the best balanced setup of a car with headless races")
+    parser.add_argument("--manufacturer", choices=Car.AVAILABLE_MANUFACTURERS, default="Ferrari")
+    parser.add_argument("--engine", type=int, default=0, help="engine upgrade level")
+    parser.add_argument("--tires", type=int, default=0, help="tires upgrade level")
+    parser.add_argument("--aero", type=int, default=0, help="aerodynamics upgrade level")
+    parser.add_argument("--track", default=TRACK_PATH, help="track CSV to race on")
+    parser.add_argument("--garage", choices=("Team Alpha", "Team Omega"), default="Team Alpha", help="car to set up")
+    parser.add_argument("--field-seed", type=int, default=0, help="seed of the game the rest of the field comes from")
+    parser.add_argument("--candidates", type=int, default=500,
+                        help="setups sampled for the first round, 0 to race all of them")
+    parser.add_argument("--min-races", type=int, default=1, help="races per setup in the first round")
+    parser.add_argument("--max-races", type=int, default=32, help="most races per setup in a round")
+    parser.add_argument("--eta", type=int, default=2, help="keep 1/eta of the setups after each round")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, by default one per CPU")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the candidate sample")
+    parser.add_argument("--player", default=None, help="save the best setup to this player's garage")
+    args = parser.parse_args()
+
+    # The field of a headless game, with the optimized car's manufacturer and upgrades
+    game = Game(None, headless=True, seed=args.field_seed, record_replay=False)
+    car_index = next(idx for idx, car in enumerate(game.cars) if car.name == args.garage)
+    game.cars[car_index].update_manufacturer(args.manufacturer)
+    game.car_upgrades = {args.garage: {"engine": args.engine, "tires": args.tires, "aero": args.aero}}
+    field, car_upgrades = game.predict_game.get_fingerprint()
+
+    candidates = enumerate_setups()
+    if 0 < args.candidates < len(candidates):
+        candidates = random.Random(args.seed).sample(candidates, args.candidates)
+    print(f"Optimizing {args.garage} ({args.manufacturer}) over {len(candidates)} setups")
+
+    start_time = time.perf_counter()
+    with Pool(args.workers, initializer=init_worker) as pool:
+        optimizer = SetupOptimizer(pool, args.track, field, car_upgrades, car_index, args.garage)
+        best, score, races = optimizer.run(candidates, args.min_races, args.max_races, args.eta)
+    print(f"Best setup: {format_setup(best)} - average position {score:.2f} over {races} races "
+          f"({time.perf_counter() - start_time:.0f}s)")
+
+    if args.player is not None:
+        update_player_garage(args.player, args.garage, manufacturer=args.manufacturer,
+                             setup=dict(zip(SETUP_KEYS, best)))
+        print(f"Saved to {args.player}'s {args.garage} garage")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from constants.constants import FIELD_SIZE, MIN_FIELD_SIZE, MAX_FIELD_SIZE
+from gameplay.simulation_game import compare_engines, run_headless_race
+
+
+def compare(args):
+    """Check that both engines run every race exactly the same, tick by tick"""
+    different = 0
+    for race in range(args.races):
+        seed = args.seed + race if args.seed is not None else None
+        result = compare_engines(args.max_ticks, seed, args.cars)
+        if result["same"]:
+            print(f"Race {race + 1} (seed {result['seed']}): same on both engines for {result['ticks']} ticks")
+        else:
+            different += 1
+            what = result["car"] or "the race state"
+            print(f"Race {race + 1} (seed {result['seed']}): {what} differs between the engines on tick {result['ticks']}")
+
+    if different:
+        print(f"{different} of {args.races} races differ between the engines")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run TopRacer races headless, without opening a window")
+    parser.add_argument("--races", type=int, default=1, help="number of races to simulate")
+    parser.add_argument("--max-ticks", type=int, default=None, help="give up on a race after this many ticks")
+    parser.add_argument("--vector", action="store_true", help="step the cars with the vectorized NumPy engine")
+    parser.add_argument("--compare", action="store_true",
+                        help="run each race on both engines side by side and fail if any car ever differs")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first race, the others follow on from it")
+    parser.add_argument("--replay-dir", type=Path, default=None, help="save a replay of every race in this directory")
+    parser.add_argument("--cars", type=int, default=FIELD_SIZE, help=f"cars in a race, {MIN_FIELD_SIZE} to {MAX_FIELD_SIZE}")
+    args = parser.parse_args()
+    if not MIN_FIELD_SIZE <= args.cars <= MAX_FIELD_SIZE:
+        parser.error(f"--cars must be between {MIN_FIELD_SIZE} and {MAX_FIELD_SIZE}")
+
+    if args.compare:
+        compare(args)
+        return
+
+    wins = {}
+    start_time = time.perf_counter()
+    if args.replay_dir is not None:
+        args.replay_dir.mkdir(parents=True, exist_ok=True)
+
+    for race in range(args.races):
+        seed = args.seed + race if args.seed is not None else None
+        replay_path = args.replay_dir / f"race_{race + 1}.trr" if args.replay_dir is not None else None
+        results = run_headless_race(args.max_ticks, args.vector, seed, replay_path, args.cars)
+        winner = results["positions"][0]
+        wins[winner] = wins.get(winner, 0) + 1
+        status = "finished" if results["finished"] else "stopped"
+        print(f"Race {race + 1} (seed {results['seed']}): {status} after {results['ticks']} ticks, winner {winner}")
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Simulated {args.races} races in {elapsed:.2f}s ({args.races / elapsed * 3600:.0f} races/hour)")
+    for name, count in sorted(wins.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name}: {count} wins")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,26 @@
-from tracks.constants import EMPTY, TRACK, WALL, PIT, TRACKSIDE, CAR_SPAWN, CAR_SPAWN_POINT
-from tracks.base_track import BaseTrack
+from tracks.constants import EMPTY, TRACK, WALL, PIT, TRACKSIDE, CAR_SPAWN, CAR_SPAWN_POINT, OUT_OF_BOUNDS, LANES, LANE_INDEX, PIT_ROUTE_OFFSET
+from tracks.constants import CURRENT_TURN_FACTORS, NEXT_TURN_FACTORS
+from tracks.base_track import BaseTrack, get_turn_factor
 from tracks.draw_track import DrawTrack
 from tracks.one_track import Track1
 
 class Track:
-    def __init__(self, csv_path='game/tracks/csv/track1_2.csv'):
+    def __init__(self, csv_path='game/tracks/csv/track1_2.csv', headless=False):
         self.tile_size = 40  # Increased from 30 to 40
+        self.csv_path = csv_path
+        # Headless tracks never touch the display, textures are loaded lazily on first draw
+        self.headless = headless
         self.base_track = BaseTrack(self)
         self.draw_track = DrawTrack(self)
         self.track1 = Track1(self)
         
-        # Pre-load textures
-        self.load_textures()
-        self.load_from_csv(csv_path)
-        self.define_waypoints()
-        # Initialize pit road waypoints
-        self.define_pit_road_waypoints()
+        # Pre-load textures (convert() needs a display mode, so skip them when headless)
+        if not self.headless:
+            self.load_textures()
         # Flag to enable/disable pit road
         self.use_pit_road = False
-        
-        # Add left and right track lanes (alternates to main waypoints)
-        self.waypoints_left = []
-        self.waypoints_right = []
-        # Create the alternate lanes
-        self.create_alternate_lanes()
+        # Loads the grid and builds everything derived from it
+        self.load_from_csv(csv_path)
     
     def create_alternate_lanes(self):
         """Create left and right lane alternatives to the main waypoints"""
@@ -77,6 +74,18 @@ class Track:
         """Define pit road waypoints that connect from waypoints"""
         self.track1.define_pit_road_waypoints()
         
+    def build_waypoint_tables(self):
+        """Precompute the world coordinates of every waypoint for each lane and pit road route"""
+        self.base_track.build_waypoint_tables()
+        
+    def build_corner_profile(self):
+        """Precompute the heading, the turn after it and its speed factor at every waypoint of every route"""
+        self.base_track.build_corner_profile()
+        
+    def build_progress_table(self):
+        """Precompute the arc length of the center line and how each leg of every route maps onto it"""
+        self.base_track.build_progress_table()
+        
     
     ## Drawing track
 
@@ -87,6 +96,30 @@ class Track:
     def load_from_csv(self, csv_path):
         """Load track data from a CSV file"""
         self.draw_track.load_from_csv(csv_path)
+        # Everything below is derived from the grid, rebuilt on every load so nothing is left on the old track
+        # Compact copy of the grid for fast tile queries, the cached chunks follow its version
+        self.build_tile_grid()
+        # Distance to the walls
+        self.build_wall_field()
+        self.define_waypoints()
+        # Initialize pit road waypoints
+        self.define_pit_road_waypoints()
+        
+        # Add left and right track lanes (alternates to main waypoints)
+        self.waypoints_left = []
+        self.waypoints_right = []
+        # Create the alternate lanes
+        self.create_alternate_lanes()
+        # World coordinate tables for all lanes and the pit road, the corner profile and the progress table
+        self.build_waypoint_tables()
+        
+    def build_tile_grid(self):
+        """Pack the track grid into a uint8 array padded with an out of bounds border"""
+        self.base_track.build_tile_grid()
+        
+    def build_wall_field(self):
+        """Precompute the signed distance to the nearest wall and its gradient over the grid"""
+        self.base_track.build_wall_field()
 
     def draw(self, surface, camera_x=0, camera_y=0):
         """Draw the track with camera offset applied"""
@@ -107,6 +140,10 @@ class Track:
         """Return all car spawn positions for multiple cars"""
         return self.base_track.get_all_spawn_positions()
         
+    def get_grid_slots(self, count):
+        """Return starting slots for the cars of a field that don't fit in the spawn area"""
+        return self.base_track.get_grid_slots(count)
+        
     def get_tile_at(self, x, y):
         """Get the tile type at the given pixel coordinates"""
         return self.base_track.get_tile_at(x, y)
@@ -119,6 +156,14 @@ class Track:
         """Return the world coordinates for a specific waypoint, with pit road option and lane selection"""
         return self.base_track.get_waypoint_position(index, use_pit_road, lane)
     
+    def get_route(self, use_pit_road=False, lane='center'):
+        """Return the index of the waypoint route for a lane, with pit road option"""
+        return self.base_track.get_route(use_pit_road, lane)
+    
+    def get_lap_progress(self, x, y, waypoint, use_pit_road=False, lane='center'):
+        """Return the distance along the center line of a car heading for a waypoint"""
+        return self.base_track.get_lap_progress(x, y, waypoint, use_pit_road, lane)
+    
     def is_wall(self, x, y):
         """Check if the given coordinates are in a wall or out of bounds"""
         return self.base_track.is_wall(x, y)
@@ -138,6 +183,33 @@ class Track:
     def is_strict_wall(self, x, y):
         """Very strict wall check - only returns True for actual wall tiles"""
         return self.base_track.is_strict_wall(x, y)
-
+    
+    def trace_segment(self, start_x, start_y, end_x, end_y):
+        """Return the first actual wall hit along a segment as (x, y, grid_x, grid_y), or None"""
+        return self.base_track.trace_segment(start_x, start_y, end_x, end_y)
+    
+    def get_wall_field(self, x, y):
+        """Return the clearance to the nearest wall and the unit direction away from it"""
+        return self.base_track.get_wall_field(x, y)
+    
+    def get_wall_field_batch(self, xs, ys):
+        """Batched get_wall_field - clearance, escape x and escape y arrays"""
+        return self.base_track.get_wall_field_batch(xs, ys)
+    
+    def is_wall_batch(self, xs, ys):
+        """Batched is_wall for arrays of pixel coordinates"""
+        return self.base_track.is_wall_batch(xs, ys)
+    
+    def is_actual_wall_batch(self, xs, ys):
+        """Batched is_actual_wall (and is_strict_wall) for arrays of pixel coordinates"""
+        return self.base_track.is_actual_wall_batch(xs, ys)
+    
+    def is_track_batch(self, xs, ys):
+        """Batched is_track for arrays of pixel coordinates"""
+        return self.base_track.is_track_batch(xs, ys)
+    
+    def get_tile_type_batch(self, xs, ys):
+        """Batched get_tile_type_at for arrays of pixel coordinates"""
+        return self.base_track.get_tile_type_batch(xs, ys)
 
 
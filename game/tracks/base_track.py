@@ -1,4 +1,67 @@
-from tracks.constants import EMPTY, TRACK, TRACKSIDE, WALL, PIT, CAR_SPAWN, CAR_SPAWN_POINT
+import math
+from bisect import bisect_right
+
+import numpy as np
+
+from tracks.constants import EMPTY, TRACK, TRACKSIDE, WALL, PIT, CAR_SPAWN, CAR_SPAWN_POINT, LANES, LANE_INDEX, PIT_ROUTE_OFFSET
+from tracks.constants import NEXT_TURN_FACTORS, OUT_OF_BOUNDS, WALL_FIELD_CELL, WALL_FIELD_RANGE
+from tracks.constants import GRID_START_OFFSET, GRID_ROW_SPACING, GRID_ROW_OFFSETS, GRID_CLEARANCE
+
+
+def chamfer_distance(sources, cell_size, max_distance):
+    """Distance from every cell to the nearest source cell, by iterative 8-neighbour chamfer relaxation"""
+    distance = np.where(sources, 0.0, np.inf)
+    diagonal = cell_size * math.sqrt(2)
+    neighbours = [(-1, 0, cell_size), (1, 0, cell_size), (0, -1, cell_size), (0, 1, cell_size),
+                  (-1, -1, diagonal), (-1, 1, diagonal), (1, -1, diagonal), (1, 1, diagonal)]
+    
+    # Each pass spreads the distances by one cell, nothing beyond max_distance is needed
+    for _ in range(int(max_distance // cell_size) + 2):
+        padded = np.pad(distance, 1, constant_values=np.inf)
+        relaxed = distance.copy()
+        for dy, dx, step in neighbours:
+            shifted = padded[1 + dy:padded.shape[0] - 1 + dy, 1 + dx:padded.shape[1] - 1 + dx]
+            np.minimum(relaxed, shifted + step, out=relaxed)
+        if np.array_equal(relaxed, distance):
+            break
+        distance = relaxed
+    
+    return np.minimum(distance, max_distance)
+
+
+def make_tile_table(tile_types):
+    """256-entry lookup table from tile type to whether it is one of the given types"""
+    table = np.zeros(256, dtype=bool)
+    table[list(tile_types)] = True
+    table.flags.writeable = False
+    return table
+
+
+# Tile predicates as lookup tables - out of bounds counts as a wall and never as track
+WALL_TABLE = make_tile_table((WALL, EMPTY, OUT_OF_BOUNDS))
+ACTUAL_WALL_TABLE = make_tile_table((WALL, OUT_OF_BOUNDS))
+TRACK_TABLE = make_tile_table((TRACK, PIT, TRACKSIDE, CAR_SPAWN, CAR_SPAWN_POINT))
+# Tile type reported outside the grid: a wall for get_tile_at, -1 for get_tile_type_at
+TILE_AT_TABLE = np.arange(256, dtype=np.int16)
+TILE_AT_TABLE[OUT_OF_BOUNDS] = WALL
+TILE_TYPE_AT_TABLE = np.arange(256, dtype=np.int16)
+TILE_TYPE_AT_TABLE[OUT_OF_BOUNDS] = -1
+
+# Tuple mirrors for scalar queries, indexing a tuple is much faster than indexing an array
+IS_WALL = tuple(WALL_TABLE.tolist())
+IS_ACTUAL_WALL = tuple(ACTUAL_WALL_TABLE.tolist())
+IS_TRACK = tuple(TRACK_TABLE.tolist())
+TILE_AT = tuple(TILE_AT_TABLE.tolist())
+TILE_TYPE_AT = tuple(TILE_TYPE_AT_TABLE.tolist())
+
+
+def get_turn_factor(turn_angle, turn_factors):
+    """Return the corner speed factor for a turn angle from a (threshold, factor) table"""
+    for threshold, factor in turn_factors:
+        if turn_angle > threshold:
+            return factor
+    return 1.0
+
 
 class BaseTrack:
     def __init__(self, track):
@@ -72,100 +135,267 @@ class BaseTrack:
         
         return spawn_positions
 
+    def get_grid_slots(self, count):
+        """Starting slots behind the spawn area as (x, y, angle, waypoint), filled row by row back along the track"""
+        center = self.track.waypoint_routes[LANE_INDEX['center']]
+        distances = self.track.centerline_distance
+        lap_length = self.track.lap_length
+        total_waypoints = len(center)
+        
+        # Where the start is along the center line - the car there heads for waypoint 0 before its first lap
+        start_x, start_y = self.get_start_position()
+        start = self.get_lap_progress(start_x, start_y, 0) % lap_length
+        
+        slots = []
+        distance = start - GRID_START_OFFSET
+        while len(slots) < count:
+            if distance <= start - lap_length:
+                raise ValueError(f"The track has no room for {count} cars behind the spawn area")
+            
+            # Point on the leg of the center line from waypoint k to the next one
+            lap_distance = distance % lap_length
+            k = bisect_right(distances, lap_distance) - 1
+            x0, y0 = center[k]
+            x1, y1 = center[(k + 1) % total_waypoints]
+            length = math.hypot(x1 - x0, y1 - y0)
+            distance -= GRID_ROW_SPACING
+            if length == 0:
+                continue
+            unit_x, unit_y = (x1 - x0) / length, (y1 - y0) / length
+            along = lap_distance - distances[k]
+            angle = math.degrees(math.atan2(unit_y, unit_x))
+            
+            # A row across the track, wherever a car fits without a wall between it and the center line
+            center_x = x0 + unit_x * along
+            center_y = y0 + unit_y * along
+            for offset in GRID_ROW_OFFSETS:
+                x = center_x - unit_y * offset
+                y = center_y + unit_x * offset
+                if (self.is_track(x, y) and self.get_wall_field(x, y)[0] >= GRID_CLEARANCE
+                        and self.trace_segment(center_x, center_y, x, y) is None):
+                    slots.append((x, y, angle, (k + 1) % total_waypoints))
+        
+        return slots[:count]
+
+    def build_tile_grid(self):
+        """Pack the track grid into a uint8 array padded with an out of bounds border"""
+        width = self.track.grid_width
+        height = self.track.grid_height
+        
+        # Missing cells of short rows are out of bounds too
+        tile_grid = np.full((height + 2, width + 2), OUT_OF_BOUNDS, dtype=np.uint8)
+        for y, row in enumerate(self.track.grid[:height]):
+            row = row[:width]
+            tile_grid[y + 1, 1:len(row) + 1] = row
+        tile_grid.flags.writeable = False
+        
+        self.track.tile_grid = tile_grid
+        # Row bytes mirror for scalar queries
+        self.track.tile_rows = tuple(bytes(row) for row in tile_grid)
+        
+        # Let caches built from the grid know it has changed
+        self.track.tile_grid_version = getattr(self.track, 'tile_grid_version', 0) + 1
+    
+    def build_wall_field(self):
+        """Precompute the signed distance to the nearest wall and its gradient over the padded grid"""
+        cells_per_tile = self.track.tile_size // WALL_FIELD_CELL
+        
+        # Anything that is_wall reports (walls, empty tiles and out of bounds) blocks the cars
+        walls = WALL_TABLE[self.track.tile_grid]
+        walls = np.repeat(np.repeat(walls, cells_per_tile, axis=0), cells_per_tile, axis=1)
+        
+        # Clearance is positive on the track and negative inside walls, measured to the boundary between them
+        clearance = chamfer_distance(walls, WALL_FIELD_CELL, WALL_FIELD_RANGE) - WALL_FIELD_CELL / 2
+        depth = chamfer_distance(~walls, WALL_FIELD_CELL, WALL_FIELD_RANGE) - WALL_FIELD_CELL / 2
+        field = np.where(walls, -depth, clearance)
+        
+        # The gradient points away from the nearest wall, normalised to a unit escape direction
+        gradient_y, gradient_x = np.gradient(field, WALL_FIELD_CELL)
+        length = np.hypot(gradient_x, gradient_y)
+        length[length == 0] = 1
+        
+        wall_field = np.stack([field, gradient_x / length, gradient_y / length], axis=-1).astype(np.float32)
+        wall_field.flags.writeable = False
+        self.track.wall_field = wall_field
+        # Flat mirror for scalar queries, indexing a memoryview is much faster than indexing an array
+        self.track.wall_field_values = memoryview(wall_field).cast('B').cast('f')
+    
+    def get_wall_field(self, x, y):
+        """Return the clearance to the nearest wall and the unit direction away from it at pixel coordinates"""
+        track = self.track
+        field_height, field_width = track.wall_field.shape[:2]
+        
+        # The field covers the padded grid, which starts one tile before the track
+        cell_x = min(max(int((x + track.tile_size) // WALL_FIELD_CELL), 0), field_width - 1)
+        cell_y = min(max(int((y + track.tile_size) // WALL_FIELD_CELL), 0), field_height - 1)
+        
+        index = (cell_y * field_width + cell_x) * 3
+        values = track.wall_field_values
+        return values[index], values[index + 1], values[index + 2]
+    
+    def get_wall_field_batch(self, xs, ys):
+        """Batched get_wall_field - clearance, escape x and escape y arrays for arrays of pixel coordinates"""
+        field_height, field_width = self.track.wall_field.shape[:2]
+        cell_x = np.clip(np.floor_divide(xs + self.track.tile_size, WALL_FIELD_CELL), 0, field_width - 1).astype(np.intp)
+        cell_y = np.clip(np.floor_divide(ys + self.track.tile_size, WALL_FIELD_CELL), 0, field_height - 1).astype(np.intp)
+        values = self.track.wall_field[cell_y, cell_x]
+        return values[:, 0], values[:, 1], values[:, 2]
+    
+    def get_tile_code(self, x, y):
+        """Get the tile type at the given pixel coordinates, OUT_OF_BOUNDS outside the grid"""
+        track = self.track
+        grid_x = int(x // track.tile_size)
+        grid_y = int(y // track.tile_size)
+        
+        # The padded grid has a border of OUT_OF_BOUNDS tiles one tile outside the track
+        if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+            return track.tile_rows[grid_y + 1][grid_x + 1]
+        return OUT_OF_BOUNDS
+    
+    def trace_segment(self, start_x, start_y, end_x, end_y):
+        """Walk the tiles crossed by a segment (DDA) and return the first actual wall hit as (x, y, grid_x, grid_y)"""
+        track = self.track
+        tile_size = track.tile_size
+        grid_x = int(start_x // tile_size)
+        grid_y = int(start_y // tile_size)
+        end_grid_x = int(end_x // tile_size)
+        end_grid_y = int(end_y // tile_size)
+        dx = end_x - start_x
+        dy = end_y - start_y
+        
+        # Fraction of the segment to the first tile border on each axis, and from one border to the next
+        if dx > 0:
+            step_x, next_x, delta_x = 1, ((grid_x + 1) * tile_size - start_x) / dx, tile_size / dx
+        elif dx < 0:
+            step_x, next_x, delta_x = -1, (grid_x * tile_size - start_x) / dx, -tile_size / dx
+        else:
+            step_x, next_x, delta_x = 0, math.inf, math.inf
+        if dy > 0:
+            step_y, next_y, delta_y = 1, ((grid_y + 1) * tile_size - start_y) / dy, tile_size / dy
+        elif dy < 0:
+            step_y, next_y, delta_y = -1, (grid_y * tile_size - start_y) / dy, -tile_size / dy
+        else:
+            step_y, next_y, delta_y = 0, math.inf, math.inf
+        
+        t = 0.0
+        while t <= 1:
+            # Only actual walls (and out of bounds) stop a car
+            if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+                tile = track.tile_rows[grid_y + 1][grid_x + 1]
+            else:
+                tile = OUT_OF_BOUNDS
+            if IS_ACTUAL_WALL[tile]:
+                return start_x + dx * t, start_y + dy * t, grid_x, grid_y
+            
+            if grid_x == end_grid_x and grid_y == end_grid_y:
+                break
+            
+            # Step into the next tile through whichever border comes first
+            if next_x < next_y:
+                t = next_x
+                grid_x += step_x
+                next_x += delta_x
+            else:
+                t = next_y
+                grid_y += step_y
+                next_y += delta_y
+        
+        return None
+    
+    def get_tile_codes(self, xs, ys):
+        """Batched get_tile_code for arrays of pixel coordinates"""
+        # Anything beyond the grid lands on the out of bounds border
+        grid_x = np.clip(np.floor_divide(xs, self.track.tile_size) + 1, 0, self.track.grid_width + 1).astype(np.intp)
+        grid_y = np.clip(np.floor_divide(ys, self.track.tile_size) + 1, 0, self.track.grid_height + 1).astype(np.intp)
+        return self.track.tile_grid[grid_y, grid_x]
+
     def is_wall(self, x, y):
         """Check if the given tile is a wall"""
         # Convert world coordinates to grid coordinates
-        grid_x = int(x // self.track.tile_size)
-        grid_y = int(y // self.track.tile_size)
-        
-        # Check bounds
-        if grid_x < 0 or grid_x >= self.track.grid_width or grid_y < 0 or grid_y >= self.track.grid_height:
-            return True  # Out of bounds is considered a wall
-        
-        # Check if the tile is a wall
-        # Explicitly exclude CAR_SPAWN (9) and CAR_SPAWN_POINT (10) from being walls
-        try:
-            tile_type = self.track.grid[grid_y][grid_x]
-            return (tile_type == WALL or tile_type == EMPTY) and tile_type != CAR_SPAWN and tile_type != CAR_SPAWN_POINT
-        except IndexError:
-            # If we're out of bounds in the grid, consider it a wall
-            return True
-            
+        track = self.track
+        grid_x = int(x // track.tile_size)
+        grid_y = int(y // track.tile_size)
+        
+        # Out of bounds is considered a wall, CAR_SPAWN (9) and CAR_SPAWN_POINT (10) never are
+        if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+            return IS_WALL[track.tile_rows[grid_y + 1][grid_x + 1]]
+        return True
+        
     def is_actual_wall(self, x, y):
         """Stricter check that only returns True for actual walls, not track boundaries"""
         # Convert world coordinates to grid coordinates
-        grid_x = int(x // self.track.tile_size)
-        grid_y = int(y // self.track.tile_size)
+        track = self.track
+        grid_x = int(x // track.tile_size)
+        grid_y = int(y // track.tile_size)
         
-        # Check bounds
-        if grid_x < 0 or grid_x >= self.track.grid_width or grid_y < 0 or grid_y >= self.track.grid_height:
-            return True  # Out of bounds is considered a wall
+        # ONLY consider actual WALL tiles as walls, not empty or track sides
+        if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+            return IS_ACTUAL_WALL[track.tile_rows[grid_y + 1][grid_x + 1]]
+        return True
         
-        try:
-            tile_type = self.track.grid[grid_y][grid_x]
-            # ONLY consider actual WALL tiles as walls, not empty or track sides
-            return tile_type == WALL
-        except IndexError:
-            # If we're out of bounds in the grid, consider it a wall
-            return True
-
     def is_strict_wall(self, x, y):
         """Very strict wall check - only returns True for actual wall tiles"""
-        grid_x = int(x // self.track.tile_size)
-        grid_y = int(y // self.track.tile_size)
-        
-        # Check bounds with margin
-        if grid_x < 0 or grid_x >= self.track.grid_width or grid_y < 0 or grid_y >= self.track.grid_height:
-            return True  # Out of bounds is wall
-        
-        try:
-            # Only WALL (0) is considered a wall, with an exact match
-            return self.track.grid[grid_y][grid_x] == WALL
-        except IndexError:
-            return True
-            
+        # Convert world coordinates to grid coordinates
+        track = self.track
+        grid_x = int(x // track.tile_size)
+        grid_y = int(y // track.tile_size)
+        
+        # Only WALL (0) is considered a wall, with an exact match
+        if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+            return IS_ACTUAL_WALL[track.tile_rows[grid_y + 1][grid_x + 1]]
+        return True
+        
     def is_track(self, x, y):
         """Check if the given tile is part of the track"""
         # Convert world coordinates to grid coordinates
-        grid_x = int(x // self.track.tile_size)
-        grid_y = int(y // self.track.tile_size)
-        
-        # Check bounds
-        if grid_x < 0 or grid_x >= self.track.grid_width or grid_y < 0 or grid_y >= self.track.grid_height:
-            return False  # Out of bounds is not track
+        track = self.track
+        grid_x = int(x // track.tile_size)
+        grid_y = int(y // track.tile_size)
         
-        # Check if the tile is track or finish line
         # Also consider CAR_SPAWN and CAR_SPAWN_POINT as part of the track
-        tile_type = self.track.grid[grid_y][grid_x]
-        return (tile_type == TRACK or 
-                tile_type == PIT or
-                tile_type == TRACKSIDE or
-                tile_type == CAR_SPAWN or
-                tile_type == CAR_SPAWN_POINT)
-                
+        if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+            return IS_TRACK[track.tile_rows[grid_y + 1][grid_x + 1]]
+        return False
+        
     def get_tile_at(self, x, y):
         """Get the tile type at the given pixel coordinates"""
-        # Ensure coordinates are integers when used as grid indices
-        grid_x = int(x // self.track.tile_size)
-        grid_y = int(y // self.track.tile_size)
+        # Convert world coordinates to grid coordinates
+        track = self.track
+        grid_x = int(x // track.tile_size)
+        grid_y = int(y // track.tile_size)
         
-        if 0 <= grid_x < self.track.grid_width and 0 <= grid_y < self.track.grid_height:
-            return self.track.grid[grid_y][grid_x]
-        return WALL  # Return wall for out of bounds
+        # Return wall for out of bounds
+        if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+            return TILE_AT[track.tile_rows[grid_y + 1][grid_x + 1]]
+        return WALL
         
     def get_tile_type_at(self, x, y):
         """Get the type of tile at given coordinates"""
-        grid_x = int(x // self.track.tile_size)
-        grid_y = int(y // self.track.tile_size)
-        
-        # Check bounds
-        if grid_x < 0 or grid_x >= self.track.grid_width or grid_y < 0 or grid_y >= self.track.grid_height:
-            return -1  # Out of bounds
+        # Convert world coordinates to grid coordinates
+        track = self.track
+        grid_x = int(x // track.tile_size)
+        grid_y = int(y // track.tile_size)
         
-        try:
-            return self.track.grid[grid_y][grid_x]
-        except IndexError:
-            return -1
+        # Return -1 for out of bounds
+        if -1 <= grid_y <= track.grid_height and -1 <= grid_x <= track.grid_width:
+            return TILE_TYPE_AT[track.tile_rows[grid_y + 1][grid_x + 1]]
+        return -1
+    
+    def is_wall_batch(self, xs, ys):
+        """Batched is_wall for arrays of pixel coordinates"""
+        return WALL_TABLE[self.get_tile_codes(xs, ys)]
+    
+    def is_actual_wall_batch(self, xs, ys):
+        """Batched is_actual_wall (and is_strict_wall) for arrays of pixel coordinates"""
+        return ACTUAL_WALL_TABLE[self.get_tile_codes(xs, ys)]
+    
+    def is_track_batch(self, xs, ys):
+        """Batched is_track for arrays of pixel coordinates"""
+        return TRACK_TABLE[self.get_tile_codes(xs, ys)]
+    
+    def get_tile_type_batch(self, xs, ys):
+        """Batched get_tile_type_at for arrays of pixel coordinates"""
+        return TILE_TYPE_AT_TABLE[self.get_tile_codes(xs, ys)]
 
     def get_closest_waypoint(self, pos):
         """Get the index of the closest waypoint to a given position"""
@@ -186,55 +416,157 @@ class BaseTrack:
                 
         return closest_idx
     
-    def get_lane_waypoint_position(self, index, lane):
-        """Get the position of a waypoint in a specific lane"""
-        waypoints = {
+    def build_waypoint_tables(self):
+        """Precompute the world coordinates of every waypoint for each lane and pit road route"""
+        tile_size = self.track.tile_size
+        
+        def to_world(waypoints):
+            return tuple((waypoint[0] * tile_size + tile_size // 2, waypoint[1] * tile_size + tile_size // 2)
+                         for waypoint in waypoints)
+        
+        # One route per lane - fall back to the center lane if a lane doesn't exist
+        lanes = {
             'center': self.track.waypoints,
             'left': self.track.waypoints_left,
             'right': self.track.waypoints_right
         }
+        routes = [to_world(lanes[lane] or self.track.waypoints) for lane in LANES]
+        
+        # Pit road routes: the lane route with the pit road waypoints swapped in
+        pit_road = to_world(getattr(self.track, 'pit_road_waypoints', []))
+        pit_road_remap = getattr(self.track, 'pit_road_remap', {})
+        for lane in LANES:
+            route = list(routes[LANE_INDEX[lane]])
+            if pit_road:
+                for index, pit_index in pit_road_remap.items():
+                    if 0 <= index < len(route):
+                        route[index] = pit_road[min(pit_index, len(pit_road) - 1)]
+            routes.append(tuple(route))
+        
+        # Tuples for scalar lookups, a read-only array of shape (routes, waypoints, 2) for batched ones
+        self.track.waypoint_routes = tuple(routes)
+        self.track.waypoint_table = np.array(routes, dtype=float).reshape(len(routes), len(self.track.waypoints), 2)
+        self.track.waypoint_table.flags.writeable = False
+        
+        self.build_corner_profile()
+        self.build_progress_table()
+        
+        # Let caches built from the waypoints know they have changed
+        self.track.waypoint_version = getattr(self.track, 'waypoint_version', 0) + 1
+    
+    def build_progress_table(self):
+        """Precompute the arc length of the center line and how each leg of every route maps onto it"""
+        center = self.track.waypoint_routes[LANE_INDEX['center']]
+        total_waypoints = len(center)
         
-        # Make sure we have valid waypoints for the requested lane
-        if lane not in waypoints or not waypoints[lane]:
-            # Fall back to center lane if requested lane doesn't exist
-            lane = 'center'
+        # Distance along the center line from waypoint 0 to each waypoint, and around the whole lap
+        distances = [0.0]
+        for i in range(1, total_waypoints):
+            distances.append(distances[-1] + math.dist(center[i - 1], center[i]))
+        lap_length = distances[-1] + math.dist(center[-1], center[0])
+        
+        # Leg k runs from waypoint k-1 to waypoint k, the leg a car heading for waypoint k is on.
+        # Leg 0 closes the lap, the lap is counted as soon as a car heads for waypoint 0, so it starts before the line
+        starts = [distances[-1] - lap_length] + distances[:-1]
+        ends = [0.0] + distances[1:]
+        
+        windows = []
+        for positions in self.track.waypoint_routes:
+            # Each leg as its start point, direction, length, where it starts on the center line and how
+            # much center line a pixel along it is worth (lanes and the pit road span the same stretch)
+            legs = []
+            for k in range(total_waypoints):
+                x0, y0 = positions[k - 1]
+                dx = positions[k][0] - x0
+                dy = positions[k][1] - y0
+                length = math.hypot(dx, dy)
+                if length > 0:
+                    legs.append((x0, y0, dx / length, dy / length, length, starts[k], (ends[k] - starts[k]) / length))
+                else:
+                    legs.append((x0, y0, 0.0, 0.0, 0.0, starts[k], 0.0))
+            
+            # A car heading for waypoint k may still be on the leg before (it moved on early) or already past
+            # the waypoint on the next one - legs across the line are shifted by a lap to stay continuous
+            route_windows = []
+            for k in range(total_waypoints):
+                before = legs[k - 1]
+                if k == 0:
+                    before = before[:5] + (before[5] - lap_length, before[6])
+                after = legs[(k + 1) % total_waypoints]
+                if k == total_waypoints - 1:
+                    after = after[:5] + (after[5] + lap_length, after[6])
+                route_windows.append((before, legs[k], after))
+            windows.append(tuple(route_windows))
+        
+        self.track.centerline_distance = tuple(distances)
+        self.track.lap_length = lap_length
+        self.track.progress_windows = tuple(windows)
+    
+    def get_lap_progress(self, x, y, waypoint, use_pit_road=False, lane='center'):
+        """Distance along the center line of a car heading for a waypoint, from the nearest leg around it"""
+        best_distance = math.inf
+        progress = 0.0
+        for x0, y0, unit_x, unit_y, length, start, scale in self.track.progress_windows[self.get_route(use_pit_road, lane)][waypoint]:
+            # Project onto the leg, then keep the projection of the leg the car is closest to
+            along = min(max((x - x0) * unit_x + (y - y0) * unit_y, 0.0), length)
+            off_x = x - x0 - unit_x * along
+            off_y = y - y0 - unit_y * along
+            distance = off_x**2 + off_y**2
+            if distance < best_distance:
+                best_distance = distance
+                progress = start + along * scale
+        return progress
+    
+    def build_corner_profile(self):
+        """Precompute the heading, the turn after it and its speed factor at every waypoint of every route"""
+        profile = []
+        for positions in self.track.waypoint_routes:
+            total_waypoints = len(positions)
             
+            # Heading of the leg from each waypoint to the next one
+            headings = []
+            for i in range(total_waypoints):
+                x, y = positions[i]
+                next_x, next_y = positions[(i + 1) % total_waypoints]
+                headings.append(math.degrees(math.atan2(next_y - y, next_x - x)))
+            
+            # How sharp the turn onto the following leg is, and how much it slows a car down
+            corners = []
+            for i in range(total_waypoints):
+                next_turn_angle = abs((headings[(i + 1) % total_waypoints] - headings[i] + 180) % 360 - 180)
+                corners.append((headings[i], next_turn_angle, get_turn_factor(next_turn_angle, NEXT_TURN_FACTORS)))
+            profile.append(tuple(corners))
+        
+        # Tuples for scalar lookups, a read-only array of shape (routes, waypoints, 3) for batched ones
+        self.track.corner_profile = tuple(profile)
+        self.track.corner_table = np.array(profile, dtype=float).reshape(len(profile), len(self.track.waypoints), 3)
+        self.track.corner_table.flags.writeable = False
+    
+    def get_route(self, use_pit_road=False, lane='center'):
+        """Return the index of the waypoint route for a lane, with pit road option"""
+        route = LANE_INDEX.get(lane, 0)
+        if use_pit_road and self.track.use_pit_road:
+            route += PIT_ROUTE_OFFSET
+        return route
+    
+    def get_lane_waypoint_position(self, index, lane):
+        """Get the position of a waypoint in a specific lane"""
+        positions = self.track.waypoint_routes[LANE_INDEX.get(lane, 0)]
+        
         # Ensure index is valid
-        if 0 <= index < len(waypoints[lane]):
-            waypoint = waypoints[lane][index]
-            return (waypoint[0] * self.track.tile_size + self.track.tile_size // 2, 
-                   waypoint[1] * self.track.tile_size + self.track.tile_size // 2)
+        if 0 <= index < len(positions):
+            return positions[index]
         
         # Default to the start position if the index is invalid
         return self.get_start_position()
         
     def get_waypoint_position(self, index, use_pit_road=False, lane='center'):
         """Return the world coordinates for a specific waypoint, with pit road and lane options"""
-        # Check if we're using the pit road and requesting a waypoint that would be replaced by it
-        if use_pit_road and hasattr(self.track, 'use_pit_road') and self.track.use_pit_road:
-            # If we're between waypoints 29 and 5
-            if index == 30 or index == 0 or (index >= 1 and index <= 5):
-                # Calculate the corresponding pit road waypoint
-                if index == 30:
-                    pit_index = 0  # Start of pit road
-                elif index == 0:
-                    pit_index = 2  # Middle of pit entrance  
-                elif index >= 1 and index <= 4:
-                    # Distribute the remaining waypoints along the pit road
-                    pit_index = 3 + index
-                else:  # index == 5
-                    pit_index = len(self.track.pit_road_waypoints) - 1  # End of pit road
-                
-                # Make sure the pit index is valid
-                pit_index = min(pit_index, len(self.track.pit_road_waypoints) - 1)
-                
-                waypoint = self.track.pit_road_waypoints[pit_index]
-                return (waypoint[0] * self.track.tile_size + self.track.tile_size // 2,
-                        waypoint[1] * self.track.tile_size + self.track.tile_size // 2)
+        positions = self.track.waypoint_routes[self.get_route(use_pit_road, lane)]
         
-        # If not using pit road or not a pit road waypoint, use the specified lane
-        return self.get_lane_waypoint_position(index, lane)
-
-
-
-
+        # Ensure index is valid
+        if 0 <= index < len(positions):
+            return positions[index]
+        
+        # Default to the start position if the index is invalid
+        return self.get_start_position()
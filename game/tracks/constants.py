@@ -5,4 +5,32 @@ WALL = 0
 PIT = 12
 TRACKSIDE = 14
 CAR_SPAWN = 9  # This is the same as finish line in the map
-CAR_SPAWN_POINT = 10  # New constant for actual car spawn points
\ No newline at end of file
+CAR_SPAWN_POINT = 10  # New constant for actual car spawn points
+OUT_OF_BOUNDS = 255  # Stored around the grid in the padded tile grid, never in a track file
+
+# Driving lanes, in the order of the routes in the waypoint tables
+LANES = ('center', 'left', 'right')
+LANE_INDEX = {lane: i for i, lane in enumerate(LANES)}
+# The pit road route of a lane comes right after the three lane routes (route = lane + PIT_ROUTE_OFFSET)
+PIT_ROUTE_OFFSET = len(LANES)
+
+# Corner speed factors as (turn angle above which it applies, speed factor), sharpest turn first
+CURRENT_TURN_FACTORS = ((70, 0.35), (50, 0.5), (30, 0.7), (15, 0.85))
+# The turn after that has less impact than the current turn
+NEXT_TURN_FACTORS = ((70, 0.6), (50, 0.75), (30, 0.85))
+
+# Distance-to-wall field resolution and the clearance (in pixels) beyond which distances are capped
+WALL_FIELD_CELL = 10
+WALL_FIELD_RANGE = 200
+
+# The spawn area around the start holds this many cars, a bigger field lines up behind it in rows every
+# GRID_ROW_SPACING pixels back along the center line, one car at each offset across it that is on the track
+# with GRID_CLEARANCE pixels to the walls
+SPAWN_AREA_CARS = 10
+GRID_START_OFFSET = 120
+GRID_ROW_SPACING = 30
+GRID_ROW_OFFSETS = (-80, -40, 0, 40, 80)
+GRID_CLEARANCE = 15
+
+# The track is drawn from pre-rendered square chunks of this many pixels
+TRACK_CHUNK_SIZE = 1024
@@ -2,7 +2,9 @@ import csv
 import pygame
 import os
 
-from tracks.constants import CAR_SPAWN, CAR_SPAWN_POINT, EMPTY, PIT, TRACK, TRACKSIDE, WALL
+from data.asset_data import get_scaled_image
+from tracks.constants import CAR_SPAWN, CAR_SPAWN_POINT, EMPTY, PIT, TRACK, TRACKSIDE, WALL, TRACK_CHUNK_SIZE
+from ui.font_cache import font_cache
 
 
 class DrawTrack:
@@ -10,20 +12,30 @@ class DrawTrack:
         # Store a reference to the parent Track object
         self.track = track
         self.textures = None
+        # Tile size the textures were scaled to when loaded
+        self.texture_size = None
+        # Pre-rendered track chunks by (chunk x, chunk y), built from the grid and tile size in chunk_key
+        self.chunks = {}
+        self.chunk_key = None
+        # Pre-rendered waypoint overlay chunks, built from the waypoints and tile size in waypoint_chunk_key
+        self.waypoint_chunks = {}
+        self.waypoint_chunk_key = None
 
     def load_textures(self):
         """Load and prepare all textures used for the track tiles"""
         # Dictionary to store tile textures
         self.textures = {}
 
-        # Load basic textures
+        # Shared textures, scaled once to the tile size instead of on every draw
+        tile_size = (self.track.tile_size, self.track.tile_size)
         self.textures[EMPTY] = None
-        self.textures[WALL] = pygame.image.load("game/assets/tirewall.png").convert_alpha()
-        self.textures[TRACK] = pygame.image.load("game/assets/asphalt.png").convert()
-        self.textures[TRACKSIDE] = pygame.image.load("game/assets/asphalt.png").convert()
-        self.textures[PIT] = pygame.image.load("game/assets/tirewall.png").convert()
+        self.textures[WALL] = get_scaled_image("tirewall.png", tile_size)
+        self.textures[TRACK] = get_scaled_image("asphalt.png", tile_size, alpha=False)
+        self.textures[TRACKSIDE] = get_scaled_image("asphalt.png", tile_size, alpha=False)
+        self.textures[PIT] = get_scaled_image("tirewall.png", tile_size, alpha=False)
         self.textures[CAR_SPAWN] = self.textures[TRACK]  # Use track texture for car spawn points
-        self.textures[CAR_SPAWN_POINT] = pygame.image.load("game/assets/finishline.png").convert()  # Use track texture for car spawn points
+        self.textures[CAR_SPAWN_POINT] = get_scaled_image("finishline.png", tile_size, alpha=False)  # Use track texture for car spawn points
+        self.texture_size = self.track.tile_size
 
     def load_from_csv(self, csv_path):
         """Load track data from a CSV file"""
@@ -70,41 +82,67 @@ class DrawTrack:
             self.track.grid_height = 10
             self.track.grid = [[WALL for _ in range(self.track.grid_width)] for _ in range(self.track.grid_height)]
 
-    def draw(self, surface, camera_x=0, camera_y=0):
-        """Draw the track with camera offset applied"""
-        if not self.textures:
+    def get_chunk(self, chunk_x, chunk_y):
+        """Pre-rendered track chunk, rebuilt only after the grid or the tile size has changed"""
+        chunk_key = (getattr(self.track, 'tile_grid_version', 0), self.track.tile_size)
+        if chunk_key != self.chunk_key:
+            self.chunks = {}
+            self.chunk_key = chunk_key
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self.build_chunk(chunk_x, chunk_y)
+            self.chunks[(chunk_x, chunk_y)] = chunk
+        return chunk
+
+    def build_chunk(self, chunk_x, chunk_y):
+        """Render the tiles that overlap one chunk, empty tiles are left black like the cleared screen"""
+        if not self.textures or self.texture_size != self.track.tile_size:
             self.load_textures()
+        tile_size = self.track.tile_size
+        left = chunk_x * TRACK_CHUNK_SIZE
+        top = chunk_y * TRACK_CHUNK_SIZE
+        chunk = pygame.Surface((TRACK_CHUNK_SIZE, TRACK_CHUNK_SIZE)).convert()
+        chunk.fill((0, 0, 0))
+
+        # Tiles on the edge of the chunk are clipped, the neighbouring chunk draws the rest of them
+        first_x = left // tile_size
+        first_y = top // tile_size
+        last_x = min(self.track.grid_width, (left + TRACK_CHUNK_SIZE - 1) // tile_size + 1)
+        last_y = min(self.track.grid_height, (top + TRACK_CHUNK_SIZE - 1) // tile_size + 1)
+        for y in range(first_y, last_y):
+            # Drawn from the padded tile grid the chunk key follows, short rows are padded out of bounds
+            row = self.track.tile_rows[y + 1]
+            for x in range(first_x, last_x):
+                tile = row[x + 1]
+                if tile == EMPTY or tile not in self.textures:
+                    continue  # Skip empty tiles, unknown tile types and out of bounds
+
+                chunk_pos = (x * tile_size - left, y * tile_size - top)
+                texture = self.textures[tile]
+                if texture:
+                    chunk.blit(texture, chunk_pos)
+                else:
+                    # Draw a colored rectangle for tiles without a texture
+                    pygame.draw.rect(chunk, (128, 128, 128), pygame.Rect(chunk_pos, (tile_size, tile_size)))
+        return chunk
 
-        # Calculate visible area in grid coordinates
-        visible_left = max(0, int(camera_x / self.track.tile_size))
-        visible_top = max(0, int(camera_y / self.track.tile_size))
+    def get_visible_chunks(self, surface, camera_x, camera_y):
+        """Chunk coordinates of the part of the track in view"""
         screen_width, screen_height = surface.get_size()
-        visible_right = min(self.track.grid_width, int((camera_x + screen_width) / self.track.tile_size) + 1)
-        visible_bottom = min(self.track.grid_height, int((camera_y + screen_height) / self.track.tile_size) + 1)
+        chunks_wide = -(-self.track.grid_width * self.track.tile_size // TRACK_CHUNK_SIZE)
+        chunks_high = -(-self.track.grid_height * self.track.tile_size // TRACK_CHUNK_SIZE)
+        first_x = max(0, int(camera_x // TRACK_CHUNK_SIZE))
+        first_y = max(0, int(camera_y // TRACK_CHUNK_SIZE))
+        last_x = min(chunks_wide, int((camera_x + screen_width) // TRACK_CHUNK_SIZE) + 1)
+        last_y = min(chunks_high, int((camera_y + screen_height) // TRACK_CHUNK_SIZE) + 1)
+        return [(chunk_x, chunk_y) for chunk_y in range(first_y, last_y) for chunk_x in range(first_x, last_x)]
 
-        # Draw visible tiles
-        for y in range(visible_top, visible_bottom):
-            for x in range(visible_left, visible_right):
-                if 0 <= y < self.track.grid_height and 0 <= x < self.track.grid_width:
-                    tile = self.track.grid[y][x]
-                    if tile == EMPTY or tile not in self.textures:
-                        continue  # Skip empty tiles or unknown tile types
-                    
-                    # Calculate screen coordinates with camera offset
-                    screen_x = x * self.track.tile_size - camera_x
-                    screen_y = y * self.track.tile_size - camera_y
-                    
-                    # Draw the tile
-                    texture = self.textures[tile]
-                    if texture:
-                        # Scale the texture if needed
-                        if texture.get_width() != self.track.tile_size or texture.get_height() != self.track.tile_size:
-                            texture = pygame.transform.scale(texture, (self.track.tile_size, self.track.tile_size))
-                        surface.blit(texture, (screen_x, screen_y))
-                    else:
-                        # Draw a colored rectangle for tiles without a texture
-                        color = (0, 0, 0) if tile == EMPTY else (128, 128, 128)
-                        pygame.draw.rect(surface, color, pygame.Rect(screen_x, screen_y, self.track.tile_size, self.track.tile_size))
+    def draw(self, surface, camera_x=0, camera_y=0):
+        """Draw the track with camera offset applied"""
+        # Only the chunks in view are drawn
+        for chunk_x, chunk_y in self.get_visible_chunks(surface, camera_x, camera_y):
+            surface.blit(self.get_chunk(chunk_x, chunk_y),
+                         (chunk_x * TRACK_CHUNK_SIZE - camera_x, chunk_y * TRACK_CHUNK_SIZE - camera_y))
 
         # Draw collision debug visualization if enabled
         if hasattr(self.track, 'debug_collisions') and self.track.debug_collisions:
@@ -119,6 +157,33 @@ class DrawTrack:
 
     def draw_waypoints(self, surface, camera_x=0, camera_y=0):
         """Draw the waypoints on the track for debugging/visualization"""
+        # The overlay never moves on the track, so it is drawn from chunks like the track itself
+        for chunk_x, chunk_y in self.get_visible_chunks(surface, camera_x, camera_y):
+            surface.blit(self.get_waypoint_chunk(chunk_x, chunk_y),
+                         (chunk_x * TRACK_CHUNK_SIZE - camera_x, chunk_y * TRACK_CHUNK_SIZE - camera_y))
+
+    def get_waypoint_chunk(self, chunk_x, chunk_y):
+        """Pre-rendered waypoint overlay chunk, rebuilt only after the waypoints or the tile size have changed"""
+        waypoint_chunk_key = (getattr(self.track, 'waypoint_version', 0), self.track.tile_size)
+        if waypoint_chunk_key != self.waypoint_chunk_key:
+            self.waypoint_chunks = {}
+            self.waypoint_chunk_key = waypoint_chunk_key
+        chunk = self.waypoint_chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            # Transparent where there is no overlay, so the track shows through
+            chunk = pygame.Surface((TRACK_CHUNK_SIZE, TRACK_CHUNK_SIZE), pygame.SRCALPHA)
+            self.render_waypoints(chunk, chunk_x * TRACK_CHUNK_SIZE, chunk_y * TRACK_CHUNK_SIZE)
+            # Run length encoded, blits skip the transparent runs instead of blending every pixel
+            chunk = chunk.convert_alpha()
+            chunk.set_alpha(255, pygame.RLEACCEL)
+            self.waypoint_chunks[(chunk_x, chunk_y)] = chunk
+        return chunk
+
+    def render_waypoints(self, surface, camera_x=0, camera_y=0):
+        """Render the waypoint, lane and pit road overlay with camera offset applied"""
+        waypoint_font = font_cache.get_font(20)
+        pit_waypoint_font = font_cache.get_font(18)
+
         # Colors to use for waypoints
         waypoint_color = (255, 255, 0)  # Yellow for center lane
         left_waypoint_color = (255, 100, 100)  # Reddish for left lane
@@ -184,8 +249,6 @@ class DrawTrack:
             # Draw waypoint circle
             pygame.draw.circle(surface, waypoint_color, (screen_x, screen_y), 6)
             
-            # Create a local font object here instead of using the global one
-            waypoint_font = pygame.font.Font(None, 20)
             number_text = waypoint_font.render(str(i), True, (0, 0, 0))
             number_rect = number_text.get_rect(center=(screen_x, screen_y))
             surface.blit(number_text, number_rect)
@@ -236,8 +299,7 @@ class DrawTrack:
                 pygame.draw.circle(surface, pit_waypoint_color, (screen_x, screen_y), 5)
                 
                 # Draw pit waypoint number
-                waypoint_font = pygame.font.Font(None, 18)
-                number_text = waypoint_font.render(f"P{i}", True, (0, 0, 0))
+                number_text = pit_waypoint_font.render(f"P{i}", True, (0, 0, 0))
                 number_rect = number_text.get_rect(center=(screen_x, screen_y))
                 surface.blit(number_text, number_rect)
             
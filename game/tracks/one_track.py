@@ -119,4 +119,15 @@ class Track1:
             (start_x + 27, start_y + 9),  # End at waypoint 5
         ]
         
+        # Main waypoints that are replaced by the pit road, and the pit road waypoint used instead
+        self.track.pit_road_remap = {
+            30: 0,  # Start of pit road
+            0: 2,   # Middle of pit entrance
+            1: 4,   # Distribute the remaining waypoints along the pit road
+            2: 5,
+            3: 6,
+            4: 7,
+            5: len(self.track.pit_road_waypoints) - 1,  # End of pit road
+        }
+        
         print(f"Defined {len(self.track.pit_road_waypoints)} pit road waypoints")
@@ -3,6 +3,8 @@ from ui.race_ui import RaceUI
 from ui.race_end_ui import RaceEndUI
 from ui.start_screen_ui import StartScreenUI
 from ui.manufacturer_ui import ManufacturerUI
+from ui.replay_ui import ReplayUI
+from ui.profiler_ui import ProfilerUI
 
 class UI:
     """Controller class that delegates to specialized UI components"""
@@ -15,6 +17,8 @@ class UI:
         self.customization_ui = CustomizationUI(screen)
         self.race_end_ui = RaceEndUI(screen)
         self.manufacturer_ui = ManufacturerUI(screen)
+        self.replay_ui = ReplayUI(screen)
+        self.profiler_ui = ProfilerUI(screen)
     
     def draw_start_screen(self, game, animation):
         """Draw the start screen - delegated to start screen UI"""
@@ -28,6 +32,10 @@ class UI:
         """Draw the manufacturer selection screen - delegated to manufacturer UI"""
         self.manufacturer_ui.draw_manufacturer_selection(game)
     
+    def update_manufacturer_selection(self, dt):
+        """Animate the manufacturer carousel - delegated to manufacturer UI"""
+        self.manufacturer_ui.update_carousel(dt)
+    
     def draw_race_end_screen(self, game, animation):
         """Draw the race end screen - delegated to race end UI"""
         self.race_end_ui.draw_race_end_screen(game, animation)
@@ -39,3 +47,11 @@ class UI:
     def draw_position_overlay(self, game):
         """Draw the position overlay - delegated to race UI"""
         self.race_ui.draw_position_overlay(game)
+    
+    def draw_replay(self, game):
+        """Draw the replay controls and standings - delegated to replay UI"""
+        self.replay_ui.draw_replay(game)
+    
+    def draw_profiler(self, game):
+        """Draw the frame time overlay - delegated to profiler UI"""
+        self.profiler_ui.draw_profiler(game)
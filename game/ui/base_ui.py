@@ -1,5 +1,5 @@
-import pygame
 from constants.constants import *
+from ui.font_cache import font_cache
 
 class BaseUI:
     """Base UI class with shared functionality for all UI components"""
@@ -7,7 +7,28 @@ class BaseUI:
     def __init__(self, screen):
         self.screen = screen
         
-        # Initialize local font objects that won't be affected by module import issues
-        self.font = pygame.font.Font(None, 24)
-        self.title_font = pygame.font.Font(None, 72)
-        self.subtitle_font = pygame.font.Font(None, 36)
\ No newline at end of file
+        # Fonts come from the shared cache, so every screen uses the same font objects
+        self.font = self.get_font(24)
+        self.title_font = self.get_font(72)
+        self.subtitle_font = self.get_font(36)
+    
+    def get_font(self, size):
+        """Default font at a size, shared by every screen"""
+        return font_cache.get_font(size)
+    
+    def render_text(self, font, text, color):
+        """Antialiased text, rendered once while the same text keeps being drawn"""
+        return font_cache.render(font, text, color)
+    
+    def get_standings_rows(self, positions, focus_idx, rows):
+        """Places of a standings list to show in rows - the leaders, then the focused car and its neighbours"""
+        if len(positions) <= rows:
+            return list(range(len(positions)))
+        
+        place = positions.index(focus_idx) if focus_idx in positions else 0
+        if place < rows:
+            return list(range(rows))
+        
+        # The car ahead, the focused car and the car behind take the last rows
+        around = min(place - 1, len(positions) - 3)
+        return list(range(rows - 3)) + list(range(around, around + 3))
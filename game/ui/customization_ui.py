@@ -2,6 +2,8 @@ import pygame
 import math
 from constants.constants import *
 from ui.base_ui import BaseUI
+from cars.sprite_cache import sprite_cache
+from data.asset_data import get_scaled_image
 
 class CustomizationUI(BaseUI):
     """UI component for the car customization screen"""
@@ -27,15 +29,14 @@ class CustomizationUI(BaseUI):
         # Draw profile section (left side of header)
         # Profile picture
 
-        profile_image = pygame.image.load("game/assets/helmet.png")
-        profile_image = pygame.transform.scale(profile_image, (60, 60))
+        profile_image = get_scaled_image("helmet.png", (60, 60))
         self.screen.blit(profile_image, (20, 10))
         
         # Username and race wins
         username = game.player_username  # Now using game's player_username
         race_wins = game.player_races_won  # Now using game's player_races_won
-        username_text = self.subtitle_font.render(username, True, WHITE)
-        wins_text = self.font.render(f"Races won: {race_wins}", True, (200, 200, 200))
+        username_text = self.render_text(self.subtitle_font, username, WHITE)
+        wins_text = self.render_text(self.font, f"Races won: {race_wins}", (200, 200, 200))
         self.screen.blit(username_text, (100, 15))
         self.screen.blit(wins_text, (100, 50))
 
@@ -44,7 +45,7 @@ class CustomizationUI(BaseUI):
         # Team manufacturer - display the current manufacturer from the selected car
         current_car = game.cars[game.selected_car_index]
         team_manufacturer = current_car.manufacturer
-        team_manufacturer_text = self.font.render(f"Manufacturer: {team_manufacturer}", True, (200, 200, 200))
+        team_manufacturer_text = self.render_text(self.font, f"Manufacturer: {team_manufacturer}", (200, 200, 200))
         self.screen.blit(team_manufacturer_text, (width//2 - team_manufacturer_text.get_width() + 50, 15))
 
         #current garage
@@ -52,20 +53,20 @@ class CustomizationUI(BaseUI):
             current_garage = 1
         else:
             current_garage = 2
-        current_garage_text = self.font.render(f"Garage: {current_garage}", True, (200, 200, 200))
+        current_garage_text = self.render_text(self.font, f"Garage: {current_garage}", (200, 200, 200))
         self.screen.blit(current_garage_text, (width//2 - current_garage_text.get_width(), 50))
         
         # Points and team rating (right side of header)
         points = game.player_points  # Now using game's player_points
         team_rating = game.player_team_rating  # Now using game's player_team_rating
-        points_text = self.subtitle_font.render(f"Points: {points}", True, YELLOW)
-        rating_text = self.font.render(f"Team Rating: {team_rating}", True, (200, 200, 200))
+        points_text = self.render_text(self.subtitle_font, f"Points: {points}", YELLOW)
+        rating_text = self.render_text(self.font, f"Team Rating: {team_rating}", (200, 200, 200))
         self.screen.blit(points_text, (width - points_text.get_width() - 20, 15))
         self.screen.blit(rating_text, (width - rating_text.get_width() - 20, 50))
         
         # Draw title
         title = "CAR CUSTOMIZATION"
-        title_surface = self.title_font.render(title, True, WHITE)
+        title_surface = self.render_text(self.title_font, title, WHITE)
         self.screen.blit(title_surface, (width//2 - title_surface.get_width()//2, 100))
         
         # Draw car preview section
@@ -91,14 +92,15 @@ class CustomizationUI(BaseUI):
         # Removed default rectangle car representation
         # Removed wheel drawing
         if car.sprite:
-            # Draw the sprite instead of the rectangle
-            scaled_sprite = pygame.transform.scale(car.sprite, (car_rect_width, car_rect_height))
+            # Draw the sprite instead of the rectangle, scaled once for the preview
+            scaled_sprite = get_scaled_image(sprite_cache.get_sprite_file(car.manufacturer),
+                                             (car_rect_width, car_rect_height))
             rect = scaled_sprite.get_rect(center=car_rect.center)
             self.screen.blit(scaled_sprite, rect)
         
         # Draw car stats in the preview area
         stats_y = preview_rect.y + 30
-        stats_font = pygame.font.Font(None, 28)
+        stats_font = self.get_font(28)
         
         # Calculate and display derived stats
         max_speed_text = f"Top Speed: {car.max_speed:.1f}"
@@ -109,9 +111,23 @@ class CustomizationUI(BaseUI):
         stats_texts = [max_speed_text, accel_text, turn_text, braking_text]
         
         for stat_text in stats_texts:
-            text_surface = stats_font.render(stat_text, True, (200, 200, 255))
+            text_surface = self.render_text(stats_font, stat_text, (200, 200, 255))
             self.screen.blit(text_surface, (preview_rect.x + 20, stats_y))
             stats_y += 30
+        
+        # Predicted lap time from the lap time table, against the default 5/5/5/5/5 setup
+        lap_time = game.get_lap_time(car)
+        baseline = game.get_lap_time(car, setup={key: 5 for key in car.setup})
+        if lap_time is not None:
+            lap_surface = self.render_text(stats_font, f"Lap Time: {lap_time[0]:.2f}s ±{lap_time[1]:.2f}", (200, 200, 255))
+            self.screen.blit(lap_surface, (preview_rect.x + 20, stats_y))
+            stats_y += 30
+        if lap_time is not None and baseline is not None:
+            delta = lap_time[0] - baseline[0]
+            delta_color = (100, 255, 100) if delta < -0.005 else (255, 120, 120) if delta > 0.005 else (200, 200, 255)
+            delta_surface = self.render_text(stats_font, f"vs 5/5/5/5/5: {delta:+.2f}s", delta_color)
+            self.screen.blit(delta_surface, (preview_rect.x + 20, stats_y))
+            stats_y += 30
             
         # Draw garage selection arrows
         arrow_y = preview_rect.y + preview_rect.height + 40
@@ -135,7 +151,7 @@ class CustomizationUI(BaseUI):
         
         # Garage selection text
         garage_text = "SELECT GARAGE"
-        garage_surface = self.font.render(garage_text, True, WHITE)
+        garage_surface = self.render_text(self.font, garage_text, WHITE)
         self.screen.blit(garage_surface, (preview_rect.centerx - garage_surface.get_width() // 2, arrow_y - 15))
         
         # Store active regions for arrow hit detection
@@ -158,7 +174,7 @@ class CustomizationUI(BaseUI):
         pygame.draw.rect(self.screen, (100, 100, 200), setup_panel_rect, 2)
         
         # Setup options title
-        setup_title = self.subtitle_font.render("CAR SETUP", True, WHITE)
+        setup_title = self.render_text(self.subtitle_font, "CAR SETUP", WHITE)
         self.screen.blit(setup_title, (setup_panel_rect.centerx - setup_title.get_width()//2, setup_panel_rect.y + 20))
         
         # Get mouse position and state for interaction
@@ -181,7 +197,7 @@ class CustomizationUI(BaseUI):
         
         # Draw balance indicator with highlighting if not balanced
         balance_text = f"Setup Balance: {total_balance}/25"
-        balance_text_surface = self.font.render(balance_text, True, balance_color)
+        balance_text_surface = self.render_text(self.font, balance_text, balance_color)
         self.screen.blit(balance_text_surface, (setup_panel_rect.centerx - balance_text_surface.get_width()//2, setup_panel_rect.y + 50))
         
         # Check if we're in an active race (sliders should be disabled)
@@ -193,7 +209,7 @@ class CustomizationUI(BaseUI):
         
         for key, value in options:
             # Option name
-            name_text = self.font.render(key, True, (200, 200, 255) if not in_active_race else (150, 150, 180))
+            name_text = self.render_text(self.font, key, (200, 200, 255) if not in_active_race else (150, 150, 180))
             self.screen.blit(name_text, (setup_panel_rect.x + 20, y_offset))
             
             # Value bar
@@ -266,7 +282,7 @@ class CustomizationUI(BaseUI):
             pygame.draw.rect(self.screen, border_color, (bar_x, bar_y, bar_width, bar_height), 2)
             
             # Draw value text
-            value_text = self.font.render(f"{value}/10", True, WHITE if not in_active_race else (180, 180, 180))
+            value_text = self.render_text(self.font, f"{value}/10", WHITE if not in_active_race else (180, 180, 180))
             self.screen.blit(value_text, (bar_x + bar_width + 20, bar_y))
             
             # Draw property description
@@ -282,7 +298,7 @@ class CustomizationUI(BaseUI):
             elif key == "Brakes":
                 description = "Affects braking efficiency"
                 
-            desc_text = pygame.font.Font(None, 20).render(description, True, (170, 170, 200) if not in_active_race else (130, 130, 160))
+            desc_text = self.render_text(self.get_font(20), description, (170, 170, 200) if not in_active_race else (130, 130, 160))
             self.screen.blit(desc_text, (bar_x, bar_y + 25))
             
             y_offset += option_height + 20
@@ -299,6 +315,10 @@ class CustomizationUI(BaseUI):
         # Draw manufacturer selector button
         self._draw_manufacturer_button(game, width, height)
         
+        # Draw race prediction button and the prediction of the selected car
+        self._draw_predict_button(game, width, height, all_cars_balanced, in_active_race)
+        self._draw_prediction(game, width, height)
+        
         # Draw instruction text or warning
         self._draw_instructions(game, width, height, all_cars_balanced, in_active_race)
         
@@ -315,12 +335,12 @@ class CustomizationUI(BaseUI):
         pygame.draw.rect(self.screen, (100, 100, 200), upgrade_panel_rect, 2)
         
         # Upgrades title
-        upgrade_title = self.subtitle_font.render("UPGRADES", True, WHITE)
+        upgrade_title = self.render_text(self.subtitle_font, "UPGRADES", WHITE)
         self.screen.blit(upgrade_title, (upgrade_panel_rect.centerx - upgrade_title.get_width()//2, upgrade_panel_rect.y + 20))
         
         # Draw permanent upgrades section
         upgrade_description = "Permanent upgrades boost performance"
-        upgrade_desc_text = self.font.render(upgrade_description, True, (220, 220, 255))
+        upgrade_desc_text = self.render_text(self.font, upgrade_description, (220, 220, 255))
         self.screen.blit(upgrade_desc_text, (upgrade_panel_rect.x + 20, upgrade_panel_rect.y + 60))
         
         # Get the current selected car (for showing its specific upgrades)
@@ -365,10 +385,10 @@ class CustomizationUI(BaseUI):
         # Fixed loop syntax - use enumerate if you need an index, or just iterate through the list
         for upgrade in permanent_upgrades:
             # Upgrade name and current level
-            name_text = self.font.render(f"{upgrade['name']}", True, WHITE)
+            name_text = self.render_text(self.font, f"{upgrade['name']}", WHITE)
             self.screen.blit(name_text, (upgrade_panel_rect.x + 20, y_offset))
             
-            level_text = self.font.render(f"Level {upgrade['level']}/10", True, (220, 220, 255))
+            level_text = self.render_text(self.font, f"Level {upgrade['level']}/10", (220, 220, 255))
             self.screen.blit(level_text, (upgrade_panel_rect.x + upgrade_panel_width - level_text.get_width() - 20, y_offset))
             
             # Draw level bar background
@@ -385,7 +405,7 @@ class CustomizationUI(BaseUI):
             pygame.draw.rect(self.screen, (100, 100, 180), (bar_x, bar_y, level_bar_width, level_bar_height), 1)
             
             # Draw upgrade description
-            desc_text = pygame.font.Font(None, 20).render(upgrade['description'], True, (170, 170, 200))
+            desc_text = self.render_text(self.get_font(20), upgrade['description'], (170, 170, 200))
             self.screen.blit(desc_text, (bar_x, bar_y + 20))
             
             # Calculate cost of next upgrade level
@@ -425,7 +445,7 @@ class CustomizationUI(BaseUI):
                 
                 # Button text
                 cost_text = f"Upgrade: {cost}"
-                cost_surface = pygame.font.Font(None, 22).render(cost_text, True, text_color)
+                cost_surface = self.render_text(self.get_font(22), cost_text, text_color)
                 cost_pos = (button_rect.centerx - cost_surface.get_width()//2,
                             button_rect.centery - cost_surface.get_height()//2)
                 self.screen.blit(cost_surface, cost_pos)
@@ -464,7 +484,7 @@ class CustomizationUI(BaseUI):
         
         y_offset += 15
         for line in balance_explanation:
-            text = self.font.render(line, True, (180, 180, 255))
+            text = self.render_text(self.font, line, (180, 180, 255))
             self.screen.blit(text, (upgrade_panel_rect.x + 20, y_offset))
             y_offset += 25
 
@@ -492,7 +512,7 @@ class CustomizationUI(BaseUI):
         pygame.draw.rect(self.screen, button_border_color, game.manufacturer_button_rect, 3, border_radius=10)
         # Button text
         button_text = "SELECT MANUFACTURER"
-        button_surface = pygame.font.Font(None, 17).render(button_text, True, button_text_color)
+        button_surface = self.render_text(self.get_font(17), button_text, button_text_color)
         button_text_pos = (
             game.manufacturer_button_rect.centerx - button_surface.get_width()//2,
             game.manufacturer_button_rect.centery - button_surface.get_height()//2
@@ -500,6 +520,61 @@ class CustomizationUI(BaseUI):
         
         self.screen.blit(button_surface, button_text_pos)
 
+    def _draw_predict_button(self, game, width, height, all_cars_balanced, in_active_race):
+        """Draw the race prediction button, mirroring the manufacturer button"""
+        button_width = 155
+        button_height = 45
+        game.predict_button_rect = pygame.Rect(
+            width//2 - width//7.5 - button_width//2,
+            height - 320,
+            button_width,
+            button_height
+        )
+        # Get mouse position
+        mouse_pos = pygame.mouse.get_pos()
+        # Only balanced setups outside a race can be predicted
+        game.predict_button_enabled = all_cars_balanced and not in_active_race
+        button_hovered = game.predict_button_rect.collidepoint(mouse_pos) and game.predict_button_enabled
+        if game.predict_button_enabled:
+            button_bg_color = (0, 90, 60) if button_hovered else (0, 60, 40)
+            button_border_color = GREEN if not button_hovered else (0, 240, 0)
+            button_text_color = WHITE
+        else:
+            button_bg_color = (60, 60, 80)
+            button_border_color = (80, 80, 110)
+            button_text_color = (180, 180, 180)
+        pygame.draw.rect(self.screen, button_bg_color, game.predict_button_rect, border_radius=10)
+        pygame.draw.rect(self.screen, button_border_color, game.predict_button_rect, 3, border_radius=10)
+        # Button text
+        button_surface = self.render_text(self.get_font(17), "PREDICT RACE", button_text_color)
+        button_text_pos = (
+            game.predict_button_rect.centerx - button_surface.get_width()//2,
+            game.predict_button_rect.centery - button_surface.get_height()//2
+        )
+        self.screen.blit(button_surface, button_text_pos)
+
+    def _draw_prediction(self, game, width, height):
+        """Draw the predicted outcome of the selected car's setup as the simulated races come in"""
+        car = game.cars[game.selected_car_index]
+        prediction = game.predict_game.get_prediction(car)
+        if prediction is None:
+            return
+
+        if prediction["races"]:
+            text = (f"{car.name}: Win {prediction['win_probability'] * 100:.0f}%  |  "
+                    f"Avg. position {prediction['expected_position']:.1f}  |  "
+                    f"Team points {prediction['expected_points']:.0f}")
+        else:
+            text = f"{car.name}: waiting for the first races..."
+        status = f"{prediction['races']} races simulated"
+        if prediction["running"]:
+            status += f", {prediction['running']} to go"
+
+        text_surface = self.render_text(self.font, text, (200, 255, 200))
+        self.screen.blit(text_surface, (width//2 - text_surface.get_width()//2, height - 250))
+        status_surface = self.render_text(self.font, status, (150, 180, 150))
+        self.screen.blit(status_surface, (width//2 - status_surface.get_width()//2, height - 225))
+
     def _draw_menu_button(self, game, width, height, in_active_race):
         """Draw the menu button at the bottom of the screen"""
         # Square button dimensions
@@ -539,7 +614,7 @@ class CustomizationUI(BaseUI):
         
         # Button text
         button_text = "MENU"
-        button_surface = self.subtitle_font.render(button_text, True, button_text_color)
+        button_surface = self.render_text(self.subtitle_font, button_text, button_text_color)
         button_text_pos = (
             game.menu_button_rect.centerx - button_surface.get_width()//2,
             game.menu_button_rect.centery - button_surface.get_height()//2
@@ -586,7 +661,7 @@ class CustomizationUI(BaseUI):
         if in_active_race:
             button_text = "RACE IN PROGRESS"
             
-        button_surface = self.subtitle_font.render(button_text, True, button_text_color)
+        button_surface = self.render_text(self.subtitle_font, button_text, button_text_color)
         button_text_pos = (
             game.start_race_button_rect.centerx - button_surface.get_width()//2,
             game.start_race_button_rect.centery - button_surface.get_height()//2
@@ -598,11 +673,11 @@ class CustomizationUI(BaseUI):
         # Draw race status message if we're in a race
         if in_active_race:
             status_text = "Race in progress - Setup changes locked"
-            status_surface = self.font.render(status_text, True, (255, 200, 100))
+            status_surface = self.render_text(self.font, status_text, (255, 200, 100))
             self.screen.blit(status_surface, (width//2 - status_surface.get_width()//2, height - 200))
             
             status_text2 = "Press ESC to end race and return to this menu"
-            status_surface2 = self.font.render(status_text2, True, (200, 200, 200))
+            status_surface2 = self.render_text(self.font, status_text2, (200, 200, 200))
             self.screen.blit(status_surface2, (width//2 - status_surface2.get_width()//2, height - 180))
         
         # Draw instruction text or warning
@@ -616,5 +691,5 @@ class CustomizationUI(BaseUI):
             instruction = "Drag sliders to adjust car setup. Different setups perform better in different conditions."
             instruction_color = (180, 180, 255)
             
-        instruction_surface = self.font.render(instruction, True, instruction_color)
+        instruction_surface = self.render_text(self.font, instruction, instruction_color)
         self.screen.blit(instruction_surface, (width//2 - instruction_surface.get_width()//2, height - 160))
\ No newline at end of file
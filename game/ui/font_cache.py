@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+import pygame
+
+# Rendered texts kept for reuse, the least recently drawn ones are dropped past this
+TEXT_CACHE_SIZE = 512
+
+
+class FontCache:
+    """Fonts shared by every screen, made once per face and size, and the texts recently rendered with them"""
+
+    def __init__(self, max_texts=TEXT_CACHE_SIZE):
+        self.max_texts = max_texts
+        # Fonts by (face, size) - face None is pygame's default font, which SysFont(None, size) gives as well
+        self.fonts = {}
+        # Rendered text surfaces by (font, text, color, antialias), least recently used first
+        self.texts = OrderedDict()
+
+    def get_font(self, size, face=None):
+        """Font of a face and size, made on first use"""
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, color, antialias=True):
+        """Text rendered with a font, reused while it keeps being drawn - callers must not change the surface"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            return surface
+
+        surface = font.render(text, antialias, color)
+        self.texts[key] = surface
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+        return surface
+
+
+# One cache for all screens and the track overlay
+font_cache = FontCache()
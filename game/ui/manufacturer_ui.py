@@ -2,6 +2,7 @@ import pygame
 import math
 from constants.constants import *
 from ui.base_ui import BaseUI
+from data.asset_data import get_scaled_image, load_image
 
 class ManufacturerUI(BaseUI):
     """UI component for the manufacturer selection screen with carousel display"""
@@ -19,9 +20,9 @@ class ManufacturerUI(BaseUI):
             {"name": "Porsche", "image": "porsche.png"},
             {"name": "Renault", "image": "renault.png"}
         ]
-        # Load manufacturer images
+        # Manufacturer images, the same surfaces the cars are drawn from
         for manufacturer in self.manufacturers:
-            manufacturer["sprite"] = pygame.image.load(f"game/assets/{manufacturer['image']}").convert_alpha()
+            manufacturer["sprite"] = load_image(manufacturer['image'])
         
         # Carousel properties
         self.current_index = 0
@@ -30,6 +31,12 @@ class ManufacturerUI(BaseUI):
         self.rotation_speed = 0.1
         self.carousel_radius = 400
     
+    def update_carousel(self, dt=1.0):
+        """Ease the carousel towards the selected manufacturer, dt in 60 Hz frames"""
+        # rotation_speed is the share of the way covered per 60 Hz frame, whatever the frame rate
+        share = 1 - (1 - self.rotation_speed) ** dt
+        self.current_rotation += (self.target_rotation - self.current_rotation) * share
+    
     def draw_manufacturer_selection(self, game):
         """Draw the manufacturer selection screen with a carousel of car manufacturers"""
         width, height = self.screen.get_size()
@@ -50,31 +57,27 @@ class ManufacturerUI(BaseUI):
         
         # Draw profile section (left side of header)
         # Profile picture
-        profile_image = pygame.image.load("game/assets/helmet.png")
-        profile_image = pygame.transform.scale(profile_image, (60, 60))
+        profile_image = get_scaled_image("helmet.png", (60, 60))
         self.screen.blit(profile_image, (20, 10))
         
         # Username and race wins
         username = game.player_username
         race_wins = game.player_races_won
-        username_text = self.subtitle_font.render(username, True, WHITE)
-        wins_text = self.font.render(f"Races won: {race_wins}", True, (200, 200, 200))
+        username_text = self.render_text(self.subtitle_font, username, WHITE)
+        wins_text = self.render_text(self.font, f"Races won: {race_wins}", (200, 200, 200))
         self.screen.blit(username_text, (100, 15))
         self.screen.blit(wins_text, (100, 50))
         
         # Draw title
         title = "SELECT MANUFACTURER"
-        title_surface = self.title_font.render(title, True, WHITE)
+        title_surface = self.render_text(self.title_font, title, WHITE)
         self.screen.blit(title_surface, (width//2 - title_surface.get_width()//2, 100))
         
         # Current manufacturer name
         current_manufacturer = self.manufacturers[self.current_index]
-        manufacturer_text = self.subtitle_font.render(current_manufacturer["name"], True, (255, 215, 0))
+        manufacturer_text = self.render_text(self.subtitle_font, current_manufacturer["name"], (255, 215, 0))
         self.screen.blit(manufacturer_text, (width//2 - manufacturer_text.get_width()//2, 180))
         
-        # Update rotation animation
-        self.current_rotation += (self.target_rotation - self.current_rotation) * self.rotation_speed
-        
         # Draw carousel of manufacturers
         center_x, center_y = width // 2, height // 2 + 50
         
@@ -97,8 +100,15 @@ class ManufacturerUI(BaseUI):
             "Use arrow keys to rotate carousel"
         ]
         
+        # Predicted lap time with the selected car's setup, against its current manufacturer
+        car = game.cars[game.selected_car_index]
+        lap_time = game.get_lap_time(car, manufacturer=current_manufacturer["name"])
+        current_lap_time = game.get_lap_time(car)
+        if lap_time is not None and current_lap_time is not None:
+            info_text.append(f"Lap time: {lap_time[0]:.2f}s ({lap_time[0] - current_lap_time[0]:+.2f}s vs {car.manufacturer})")
+        
         for i, text in enumerate(info_text):
-            text_surface = self.font.render(text, True, WHITE)
+            text_surface = self.render_text(self.font, text, WHITE)
             self.screen.blit(text_surface, (panel_x + 20, panel_y + 20 + i * 30))
         
         # Draw "Back to Garage" button
@@ -121,7 +131,7 @@ class ManufacturerUI(BaseUI):
         
         # Button text
         button_text = "BACK TO GARAGE"
-        button_surface = self.subtitle_font.render(button_text, True, WHITE)
+        button_surface = self.render_text(self.subtitle_font, button_text, WHITE)
         button_text_pos = (
             game.back_button_rect.centerx - button_surface.get_width() // 2,
             game.back_button_rect.centery - button_surface.get_height() // 2
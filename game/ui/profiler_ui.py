@@ -0,0 +1,68 @@
+import pygame
+from constants.constants import *
+from ui.base_ui import BaseUI
+
+class ProfilerUI(BaseUI):
+    """UI component for the frame time overlay"""
+
+    def __init__(self, screen):
+        super().__init__(screen)
+        # Small fonts made once, the overlay is drawn every frame
+        self.row_font = self.get_font(20)
+        self.header_font = self.get_font(24)
+
+    def draw_profiler(self, game):
+        """Draw the frame rate, the time of each part of the frame and a graph of recent frame times"""
+        width, height = self.screen.get_size()
+        profile_game = game.profile_game
+        section_stats = profile_game.get_section_stats()
+        fps, low_ms = profile_game.get_frame_stats()
+
+        # Semi-transparent panel under the race time and speed on the top right
+        panel_width = 320
+        graph_height = 60
+        panel_height = 70 + len(section_stats) * 20 + graph_height + 20
+        panel_rect = pygame.Rect(width - panel_width - 10, 100, panel_width, panel_height)
+        s = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        s.fill((10, 10, 30, 200))
+        self.screen.blit(s, panel_rect)
+        pygame.draw.rect(self.screen, (100, 100, 200), panel_rect, 1)
+
+        # Frame rate and the 1% low frame time
+        title = self.render_text(self.header_font, "FRAME TIME", (220, 220, 255))
+        self.screen.blit(title, (panel_rect.x + 10, panel_rect.y + 8))
+        fps_text = self.render_text(self.row_font, f"{fps:.0f} FPS   1% low {low_ms:.1f} ms", WHITE)
+        self.screen.blit(fps_text, (panel_rect.right - fps_text.get_width() - 10, panel_rect.y + 10))
+        header = self.render_text(self.row_font, "avg / max ms", (150, 150, 190))
+        self.screen.blit(header, (panel_rect.right - header.get_width() - 10, panel_rect.y + 35))
+
+        # One row per section, the bar shows its average against a 60 FPS frame
+        budget_ms = 1000 / FPS
+        bar_x = panel_rect.x + 90
+        bar_width = 110
+        y_pos = panel_rect.y + 55
+        for name, average_ms, max_ms in section_stats:
+            name_text = self.render_text(self.row_font, name, (200, 200, 200))
+            self.screen.blit(name_text, (panel_rect.x + 10, y_pos))
+
+            share = min(average_ms / budget_ms, 1.0)
+            bar_color = (90, 200, 90) if share < 0.25 else (230, 200, 60) if share < 0.5 else (230, 80, 60)
+            pygame.draw.rect(self.screen, (40, 40, 70), (bar_x, y_pos + 2, bar_width, 10))
+            pygame.draw.rect(self.screen, bar_color, (bar_x, y_pos + 2, int(bar_width * share), 10))
+
+            time_text = self.render_text(self.row_font, f"{average_ms:.2f} / {max_ms:.2f}", (200, 200, 200))
+            self.screen.blit(time_text, (panel_rect.right - time_text.get_width() - 10, y_pos))
+            y_pos += 20
+
+        # Sparkline of the frame times, with the 60 FPS budget as a line
+        graph_rect = pygame.Rect(panel_rect.x + 10, y_pos + 10, panel_width - 20, graph_height)
+        pygame.draw.rect(self.screen, (30, 30, 55), graph_rect)
+        frame_times = profile_game.frame_times
+        if len(frame_times) > 1:
+            scale_ms = max(max(frame_times), budget_ms * 2)
+            step = graph_rect.width / (frame_times.maxlen - 1)
+            points = [(graph_rect.x + i * step, graph_rect.bottom - graph_rect.height * frame_ms / scale_ms)
+                      for i, frame_ms in enumerate(frame_times)]
+            budget_y = graph_rect.bottom - graph_rect.height * budget_ms / scale_ms
+            pygame.draw.line(self.screen, (120, 120, 60), (graph_rect.x, budget_y), (graph_rect.right, budget_y), 1)
+            pygame.draw.lines(self.screen, (120, 220, 255), False, points, 1)
@@ -20,12 +20,12 @@ class RaceEndUI(BaseUI):
         
         # Draw race results title
         title_text = "RACE COMPLETE!"
-        title_surface = self.title_font.render(title_text, True, WHITE)
+        title_surface = self.render_text(self.title_font, title_text, WHITE)
         self.screen.blit(title_surface, (width//2 - title_surface.get_width()//2, 50))
         
         # Draw final standings
         subtitle_text = "FINAL STANDINGS"
-        subtitle_surface = self.subtitle_font.render(subtitle_text, True, CYAN)
+        subtitle_surface = self.render_text(self.subtitle_font, subtitle_text, CYAN)
         self.screen.blit(subtitle_surface, (width//2 - subtitle_surface.get_width()//2, 130))
         
         self._draw_results_panel(game, width)
@@ -45,8 +45,8 @@ class RaceEndUI(BaseUI):
         pygame.draw.rect(self.screen, (100, 100, 220), panel_rect, 2)
         
         # Draw each position in the final results
-        position_font = pygame.font.SysFont(None, 36)
-        detail_font = pygame.font.SysFont(None, 24)
+        position_font = self.get_font(36)
+        detail_font = self.get_font(24)
         
         #for i, car_idx in enumerate(game.final_positions):
         for i in range(5):
@@ -85,12 +85,12 @@ class RaceEndUI(BaseUI):
             
             # Draw position number
             pos_text = f"{position}."
-            pos_surface = position_font.render(pos_text, True, trophy_color)
+            pos_surface = self.render_text(position_font, pos_text, trophy_color)
             self.screen.blit(pos_surface, (panel_rect.x + 30, y_pos))
             
             # Draw trophy for top 3
             if trophy:
-                trophy_surface = pygame.font.SysFont(None, 40).render(trophy, True, trophy_color)
+                trophy_surface = self.render_text(self.get_font(40), trophy, trophy_color)
                 self.screen.blit(trophy_surface, (panel_rect.x + 60, y_pos - 5))
                 name_offset = 100  # More space when trophy is present
             else:
@@ -98,13 +98,13 @@ class RaceEndUI(BaseUI):
             
             # Draw car name - make engineer cars brighter
             name_text = f"{car.name}"
-            name_surface = position_font.render(name_text, True, name_color)
+            name_surface = self.render_text(position_font, name_text, name_color)
             self.screen.blit(name_surface, (panel_rect.x + name_offset, y_pos))
             
             # Draw best lap time
             if car.best_lap is not None:
                 time_text = f"Best Lap: {car.best_lap:.2f}s"
-                time_surface = detail_font.render(time_text, True, detail_color)
+                time_surface = self.render_text(detail_font, time_text, detail_color)
                 self.screen.blit(time_surface, (panel_rect.x + name_offset, y_pos + 30))
         
         return panel_rect
@@ -135,29 +135,29 @@ class RaceEndUI(BaseUI):
             pygame.draw.rect(self.screen, YELLOW, rewards_panel_rect, 2)
             
             # Draw rewards title
-            rewards_title = self.subtitle_font.render("REWARDS EARNED", True, WHITE)
+            rewards_title = self.render_text(self.subtitle_font, "REWARDS EARNED", WHITE)
             self.screen.blit(rewards_title, (rewards_panel_rect.centerx - rewards_title.get_width()//2, 
                                            rewards_panel_rect.y + 15))
             
             # Draw points earned with icon
             points_text = f"+{game.last_race_points_earned} Points"
-            points_surface = self.font.render(points_text, True, YELLOW)
+            points_surface = self.render_text(self.font, points_text, YELLOW)
             self.screen.blit(points_surface, (rewards_panel_rect.centerx - points_surface.get_width()//2 + 10,
                                            rewards_panel_rect.y + 55))
             
             # Draw star icon for points
-            points_icon = self.subtitle_font.render("★", True, YELLOW)
+            points_icon = self.render_text(self.subtitle_font, "★", YELLOW)
             self.screen.blit(points_icon, (rewards_panel_rect.centerx - points_surface.get_width()//2 - 15,
                                          rewards_panel_rect.y + 53))
             
             # Draw XP earned with icon
             xp_text = f"+{game.last_race_xp_earned} Team Rating"
-            xp_surface = self.font.render(xp_text, True, CYAN)
+            xp_surface = self.render_text(self.font, xp_text, CYAN)
             self.screen.blit(xp_surface, (rewards_panel_rect.centerx - xp_surface.get_width()//2 + 10,
                                         rewards_panel_rect.y + 85))
             
             # Draw XP icon
-            xp_icon = self.subtitle_font.render("↑", True, CYAN)
+            xp_icon = self.render_text(self.subtitle_font, "↑", CYAN)
             self.screen.blit(xp_icon, (rewards_panel_rect.centerx - xp_surface.get_width()//2 - 15,
                                      rewards_panel_rect.y + 83))
             
@@ -182,12 +182,12 @@ class RaceEndUI(BaseUI):
         
         # Button text - changed to reflect going to customization screen
         button_text = "Customize Cars"
-        button_surface = self.subtitle_font.render(button_text, True, WHITE)
+        button_surface = self.render_text(self.subtitle_font, button_text, WHITE)
         button_text_pos = (game.menu_button_rect.centerx - button_surface.get_width()//2, 
                           game.menu_button_rect.centery - button_surface.get_height()//2)
         self.screen.blit(button_surface, button_text_pos)
         
         # Additional hint text
-        hint_text = "Adjust your cars' setup for the next race"
-        hint_surface = self.font.render(hint_text, True, (180, 180, 200))
+        hint_text = "Adjust your cars' setup for the next race - or press R to watch the replay"
+        hint_surface = self.render_text(self.font, hint_text, (180, 180, 200))
         self.screen.blit(hint_surface, (width//2 - hint_surface.get_width()//2, game.menu_button_rect.bottom + 10))
\ No newline at end of file
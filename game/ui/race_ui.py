@@ -13,24 +13,35 @@ class RaceUI(BaseUI):
         minutes = game.race_time // (60 * 60)
         seconds = (game.race_time // 60) % 60
         time_text = f"Race Time: {minutes:02d}:{seconds:02d}"
-        time_surface = self.font.render(time_text, True, WHITE)
+        time_surface = self.render_text(self.font, time_text, WHITE)
         self.screen.blit(time_surface, (width - time_surface.get_width() - 10, 10))
         
         # Show waypoint status
         waypoint_status = "Waypoints: ON" if game.show_waypoints else "Waypoints: OFF"
-        waypoint_surface = self.font.render(waypoint_status, True, YELLOW if game.show_waypoints else (120, 120, 120))
+        waypoint_surface = self.render_text(self.font, waypoint_status, YELLOW if game.show_waypoints else (120, 120, 120))
         self.screen.blit(waypoint_surface, (width - waypoint_surface.get_width() - 10, 40))
         
+        # Show the race speed, or how far simulating to the flag has got
+        timestep_game = game.timestep_game
+        if timestep_game.to_flag:
+            leader_lap = min(max(car.laps for car in game.cars) + 1, game.MAX_LAPS)
+            speed_text = f"Simulating to the flag - Lap {leader_lap}/{game.MAX_LAPS}"
+        else:
+            speed_text = f"Speed: {timestep_game.time_scale}x"
+        speed_color = YELLOW if timestep_game.to_flag or timestep_game.time_scale > 1 else (120, 120, 120)
+        speed_surface = self.render_text(self.font, speed_text, speed_color)
+        self.screen.blit(speed_surface, (width - speed_surface.get_width() - 10, 70))
+        
         # Draw current message
         if game.message_timer > 0:
-            message_surface = self.font.render(game.message, True, WHITE)
+            message_surface = self.render_text(self.font, game.message, WHITE)
             self.screen.blit(message_surface, 
                            (width//2 - message_surface.get_width()//2, 
                             height - 30))
         
         # Draw controls help with emphasis on engineer cars
-        controls = "Controls: SPACE - Pause, Arrows - Select Team, P - Push, W - Toggle Waypoints"
-        controls_surface = self.font.render(controls, True, WHITE)
+        controls = "Controls: SPACE - Pause, Arrows - Select Team, P - Push, W - Toggle Waypoints, 1-4 - Speed, F - Simulate to Flag, F3 - Frame Times"
+        controls_surface = self.render_text(self.font, controls, WHITE)
         self.screen.blit(controls_surface, 
                        (width//2 - controls_surface.get_width()//2, 
                         height - 60))
@@ -41,9 +52,12 @@ class RaceUI(BaseUI):
         if not game.race_positions:  # Initialize positions if empty
             game.race_positions = list(range(len(game.cars)))
         
+        # A big field shows the leaders and the cars around the selected one
+        places = self.get_standings_rows(game.race_positions, game.selected_car_index, OVERLAY_ROWS)
+        
         # Draw a semi-transparent background panel for the position display
         panel_width = 260
-        panel_height = len(game.cars) * 60 + 80  # Increased block height
+        panel_height = len(places) * 60 + 80  # Increased block height
         panel_rect = pygame.Rect(20, 20, panel_width, panel_height)  # Moved to top left
         
         # Create a semi-transparent surface
@@ -55,14 +69,14 @@ class RaceUI(BaseUI):
         pygame.draw.rect(self.screen, (100, 100, 200), panel_rect, 2)
         
         # Draw the "RACE POSITIONS" title
-        title_font = pygame.font.SysFont(None, 30)
-        title = title_font.render("RACE POSITIONS", True, (220, 220, 255))
+        title_font = self.get_font(30)
+        title = self.render_text(title_font, "RACE POSITIONS", (220, 220, 255))
         self.screen.blit(title, (panel_rect.centerx - title.get_width() // 2, panel_rect.y + 10))
         
         # Draw lap counter
         lap_text = f"LAP {min(max([car.laps for car in game.cars]) + 1, game.MAX_LAPS)} / {game.MAX_LAPS}"
-        lap_font = pygame.font.SysFont(None, 24)
-        lap_surface = lap_font.render(lap_text, True, (180, 180, 255))
+        lap_font = self.get_font(24)
+        lap_surface = self.render_text(lap_font, lap_text, (180, 180, 255))
         self.screen.blit(lap_surface, (panel_rect.centerx - lap_surface.get_width() // 2, panel_rect.y + 35))
         
         # Draw divider line
@@ -71,13 +85,19 @@ class RaceUI(BaseUI):
                         (panel_rect.right - 10, panel_rect.y + 55), 2)
         
         # For each car in race positions, draw its position
-        position_font = pygame.font.SysFont(None, 26)
-        for i, car_idx in enumerate(game.race_positions):
+        position_font = self.get_font(26)
+        for row, i in enumerate(places):
+            car_idx = game.race_positions[i]
             car = game.cars[car_idx]
             position = i + 1
             
             # Calculate y position for this entry
-            y_pos = panel_rect.y + 65 + i * 60  # Adjusted y position
+            y_pos = panel_rect.y + 65 + row * 60  # Adjusted y position
+            
+            # Mark where the standings skip ahead to the selected car
+            if row > 0 and i != places[row - 1] + 1:
+                pygame.draw.line(self.screen, (100, 100, 200),
+                                (panel_rect.left + 10, y_pos - 5), (panel_rect.right - 10, y_pos - 5), 2)
             
             # Highlight any selected car
             if car_idx == game.selected_car_index:
@@ -104,19 +124,29 @@ class RaceUI(BaseUI):
             pygame.draw.circle(self.screen, (30, 30, 30), (circle_x, circle_y), circle_radius, 1)
             
             # Draw position number
-            pos_text = position_font.render(str(position), True, (30, 30, 30))
+            pos_text = self.render_text(position_font, str(position), (30, 30, 30))
             pos_rect = pos_text.get_rect(center=(circle_x, circle_y))
             self.screen.blit(pos_text, pos_rect)
             
             # Draw car name
-            name_text = position_font.render(car.name, True, text_color)
+            name_text = self.render_text(position_font, car.name, text_color)
             self.screen.blit(name_text, (circle_x + 20, y_pos + 5))  # Adjusted y position
             
+            # Draw the gap to the leader, right aligned
+            if position == 1:
+                gap_info = "Leader"
+            elif car.laps_down > 0:
+                gap_info = f"+{car.laps_down} Lap" + ("s" if car.laps_down > 1 else "")
+            else:
+                gap_info = f"+{car.gap_to_leader:.1f}s"
+            gap_text = self.render_text(self.get_font(22), gap_info, text_color)
+            self.screen.blit(gap_text, (row_rect.right - gap_text.get_width() - 8, y_pos + 7))
+            
             # Show last lap and best lap
-            lap_info = f"Lap {car.laps + 1}"
+            lap_info = f"Lap {max(car.laps, 0) + 1}"
             if car.last_lap_time > 0:
                 lap_info += f" | Last: {car.last_lap_time:.2f}s" 
             if car.best_lap is not None:
                 lap_info += f" | Best: {car.best_lap:.2f}s"
-            lap_text = pygame.font.SysFont(None, 20).render(lap_info, True, text_color)
+            lap_text = self.render_text(self.get_font(20), lap_info, text_color)
             self.screen.blit(lap_text, (circle_x + 20, y_pos + 28))  # Adjusted y position
\ No newline at end of file
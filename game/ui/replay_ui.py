@@ -0,0 +1,85 @@
+import pygame
+from constants.constants import *
+from ui.base_ui import BaseUI
+
+class ReplayUI(BaseUI):
+    """UI component for race replay playback"""
+
+    def draw_replay(self, game):
+        """Draw the replay standings, the timeline and the playback controls"""
+        self._draw_standings(game)
+        self._draw_timeline(game)
+
+    def _draw_standings(self, game):
+        """Draw the race order at the current replay tick on the top left"""
+        replay_game = game.replay_game
+        positions = replay_game.get_positions()
+
+        # Semi-transparent panel, one compact row per car - the leaders and the cars around the followed one
+        places = self.get_standings_rows(positions, replay_game.follow_index, OVERLAY_ROWS * 2)
+        panel_width = 260
+        panel_height = len(places) * 28 + 80
+        panel_rect = pygame.Rect(20, 20, panel_width, panel_height)
+        s = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        s.fill((20, 20, 50, 180))
+        self.screen.blit(s, panel_rect)
+        pygame.draw.rect(self.screen, (100, 100, 200), panel_rect, 2)
+
+        # Title and lap of the leader
+        title = self.render_text(self.get_font(30), "REPLAY", (220, 220, 255))
+        self.screen.blit(title, (panel_rect.centerx - title.get_width() // 2, panel_rect.y + 10))
+        lap_text = f"LAP {replay_game.get_lap()} / {replay_game.replay['header']['max_laps']}"
+        lap_surface = self.render_text(self.get_font(24), lap_text, (180, 180, 255))
+        self.screen.blit(lap_surface, (panel_rect.centerx - lap_surface.get_width() // 2, panel_rect.y + 35))
+        pygame.draw.line(self.screen, (100, 100, 200),
+                        (panel_rect.left + 10, panel_rect.y + 55),
+                        (panel_rect.right - 10, panel_rect.y + 55), 2)
+
+        row_font = self.get_font(24)
+        for row, i in enumerate(places):
+            car_idx = positions[i]
+            car = replay_game.cars[car_idx]
+            y_pos = panel_rect.y + 65 + row * 28
+
+            # The followed car stands out
+            text_color = (255, 255, 0) if car_idx == replay_game.follow_index else (220, 220, 220)
+            pygame.draw.circle(self.screen, car.color, (panel_rect.x + 22, y_pos + 8), 8)
+            row_text = self.render_text(row_font, f"{i + 1}. {car.name}", text_color)
+            self.screen.blit(row_text, (panel_rect.x + 38, y_pos))
+            lap_info = self.render_text(row_font, f"Lap {min(max(car.laps, 0) + 1, replay_game.replay['header']['max_laps'])}", text_color)
+            self.screen.blit(lap_info, (panel_rect.right - lap_info.get_width() - 10, y_pos))
+
+    def _draw_timeline(self, game):
+        """Draw the scrub bar with lap markers and the playback controls at the bottom"""
+        width, height = self.screen.get_size()
+        replay_game = game.replay_game
+        header = replay_game.replay["header"]
+        total_ticks = max(header["ticks"] - 1, 1)
+
+        # Timeline bar
+        bar_rect = pygame.Rect(100, height - 90, width - 200, 14)
+        pygame.draw.rect(self.screen, (40, 40, 70), bar_rect)
+        played = int(bar_rect.width * replay_game.tick / total_ticks)
+        pygame.draw.rect(self.screen, (100, 100, 220), (bar_rect.x, bar_rect.y, played, bar_rect.height))
+        pygame.draw.rect(self.screen, (150, 150, 230), bar_rect, 1)
+
+        # Lap markers
+        marker_font = self.get_font(20)
+        for lap, lap_tick in enumerate(header["lap_ticks"][:header["max_laps"]], start=1):
+            marker_x = bar_rect.x + int(bar_rect.width * lap_tick / total_ticks)
+            pygame.draw.line(self.screen, WHITE, (marker_x, bar_rect.y - 4), (marker_x, bar_rect.bottom + 4), 2)
+            marker = self.render_text(marker_font, f"L{lap}", WHITE)
+            self.screen.blit(marker, (marker_x - marker.get_width() // 2, bar_rect.y - 20))
+
+        # Replay time out of the race time
+        fps = header["fps"]
+        current = replay_game.tick // fps
+        total = total_ticks // fps
+        status = "" if replay_game.playing else "  PAUSED"
+        time_text = f"{current // 60:02d}:{current % 60:02d} / {total // 60:02d}:{total % 60:02d}{status}"
+        time_surface = self.render_text(self.font, time_text, WHITE)
+        self.screen.blit(time_surface, (width // 2 - time_surface.get_width() // 2, bar_rect.bottom + 10))
+
+        controls = "SPACE - Play/Pause, Left/Right - 5s, Up/Down or 1-9 - Lap, TAB - Follow Car, ESC - Exit"
+        controls_surface = self.render_text(self.font, controls, (180, 180, 200))
+        self.screen.blit(controls_surface, (width // 2 - controls_surface.get_width() // 2, height - 35))
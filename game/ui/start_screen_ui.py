@@ -16,14 +16,14 @@ class StartScreenUI(BaseUI):
         extra_info = "ESC - Exit Game | START - start with selected team"
         version = "v1.2.0"
         
-        title_surface = self.title_font.render(title, True, WHITE)
-        subtitle_surface = self.subtitle_font.render(subtitle, True, CYAN)
-        info_surface = self.font.render(extra_info, True, (180, 180, 180))
-        version_surface = self.font.render(version, True, (100, 100, 100))
+        title_surface = self.render_text(self.title_font, title, WHITE)
+        subtitle_surface = self.render_text(self.subtitle_font, subtitle, CYAN)
+        info_surface = self.render_text(self.font, extra_info, (180, 180, 180))
+        version_surface = self.render_text(self.font, version, (100, 100, 100))
         
         # Draw the title with a shadow effect
         shadow_offset = 2
-        title_shadow = self.title_font.render(title, True, (40, 40, 100))
+        title_shadow = self.render_text(self.title_font, title, (40, 40, 100))
         
         self.screen.blit(title_shadow, (width//2 - title_surface.get_width()//2 + shadow_offset, 
                                       height//4 + animation.title_y_offset + shadow_offset))
@@ -61,7 +61,7 @@ class StartScreenUI(BaseUI):
         pygame.draw.rect(self.screen, (100, 100, 220), panel_rect, 2)
         
         # Panel title
-        panel_title = self.subtitle_font.render("SELECT TEAM", True, WHITE)
+        panel_title = self.render_text(self.subtitle_font, "SELECT TEAM", WHITE)
         self.screen.blit(panel_title, (panel_rect.centerx - panel_title.get_width()//2, panel_rect.y + 15))
         
         # Draw player list with selection highlighting
@@ -89,14 +89,14 @@ class StartScreenUI(BaseUI):
                 text_color = (200, 200, 200)
             
             # Player name
-            player_text = self.font.render(player_name, True, text_color)
+            player_text = self.render_text(self.font, player_name, text_color)
             self.screen.blit(player_text, (button_rect.x + 15, button_rect.centery - player_text.get_height()//2 -5))
             
             # Player stats
             if player_name in game.players:
                 stats = game.players[player_name]
                 stats_text = f"Points: {stats['points']} | Rating: {stats['team_rating']} | Wins: {stats['races_won']}"
-                stats_surface = pygame.font.Font(None, 20).render(stats_text, True, (180, 180, 220))
+                stats_surface = self.render_text(self.get_font(20), stats_text, (180, 180, 220))
                 self.screen.blit(stats_surface, (button_rect.x + 15, button_rect.centery + 7))
             
             # Delete button
@@ -105,7 +105,7 @@ class StartScreenUI(BaseUI):
             pygame.draw.rect(self.screen, (100, 40, 40), delete_rect)
             pygame.draw.rect(self.screen, (150, 60, 60), delete_rect, 1)
             
-            delete_text = self.font.render("Delete", True, (220, 200, 200))
+            delete_text = self.render_text(self.font, "Delete", (220, 200, 200))
             self.screen.blit(delete_text, (delete_rect.centerx - delete_text.get_width()//2, delete_rect.centery - delete_text.get_height()//2))
             
             player_y += player_height + button_margin
@@ -128,7 +128,7 @@ class StartScreenUI(BaseUI):
         pygame.draw.rect(self.screen, button_bg_color, game.start_button_rect)
         pygame.draw.rect(self.screen, WHITE, game.start_button_rect, 2)
         
-        start_text = self.font.render("Start Game", True, WHITE)
+        start_text = self.render_text(self.font, "Start Game", WHITE)
         self.screen.blit(start_text, (game.start_button_rect.centerx - start_text.get_width()//2, 
                                       game.start_button_rect.centery - start_text.get_height()//2))
         
@@ -147,7 +147,7 @@ class StartScreenUI(BaseUI):
         pygame.draw.rect(self.screen, button_bg_color, game.add_player_button_rect)
         pygame.draw.rect(self.screen, GREEN, game.add_player_button_rect, 2)
         
-        add_text = self.font.render("Add New Team", True, WHITE)
+        add_text = self.render_text(self.font, "Add New Team", WHITE)
         self.screen.blit(add_text, (game.add_player_button_rect.centerx - add_text.get_width()//2, 
                                     game.add_player_button_rect.centery - add_text.get_height()//2))
                                     
@@ -172,12 +172,12 @@ class StartScreenUI(BaseUI):
             
             # Input text or placeholder
             if game.new_player_name:
-                input_text = self.font.render(game.new_player_name, True, WHITE)
+                input_text = self.render_text(self.font, game.new_player_name, WHITE)
             else:
-                input_text = self.font.render("Enter team name...", True, (150, 150, 150))
+                input_text = self.render_text(self.font, "Enter team name...", (150, 150, 150))
             
             self.screen.blit(input_text, (game.input_rect.x + 10, game.input_rect.centery - input_text.get_height()//2))
             
             # Show instruction
-            help_text = self.font.render("Press ENTER to confirm", True, (180, 180, 220))
+            help_text = self.render_text(self.font, "Press ENTER to confirm", (180, 180, 220))
             self.screen.blit(help_text, (game.input_rect.centerx - help_text.get_width()//2, game.input_rect.bottom + 10))
\ No newline at end of file